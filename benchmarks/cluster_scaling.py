@@ -0,0 +1,196 @@
+"""Throughput of the multi-worker launcher as workers are added.
+
+Run from the repository root:
+
+    poetry run python -m benchmarks.cluster_scaling --workers 1 2 4 --seconds 10
+
+For each worker count the launcher serves cpu_app, a stand-in for main:app whose
+turns burn a fixed amount of CPU and count turns per correlation_id. Client threads
+each hold one session and send turns back to back, so every turn after the first
+must reach the worker that created the session. The command prints requests per
+second, the speedup over the smallest worker count and the scaling efficiency, and
+exits with status 1 when a turn lost its session or efficiency is below the limit.
+"""
+
+import argparse
+import json
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from dataclasses import asdict, dataclass
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+POLL_INTERVAL_SECONDS = 0.05
+SESSIONS_PER_WORKER = 8
+TURN_CPU_SECONDS = 0.02
+
+_turns: Counter[str] = Counter()
+
+
+async def _turn(request: Request) -> JSONResponse:
+    payload = await request.json()
+    deadline = time.process_time() + TURN_CPU_SECONDS
+    while time.process_time() < deadline:
+        pass
+    correlation_id = payload["correlation_id"]
+    _turns[correlation_id] += 1
+    return JSONResponse(
+        {"response": str(_turns[correlation_id]), "correlation_id": correlation_id}
+    )
+
+
+async def _health(request: Request) -> JSONResponse:
+    return JSONResponse({"status": "ok"})
+
+
+cpu_app = Starlette(
+    routes=[
+        Route("/health", _health),
+        Route("/api/agents/{agent_key}", _turn, methods=["POST"]),
+    ]
+)
+
+
+@dataclass
+class ScalingResult:
+    workers: int
+    requests: int
+    requests_per_second: float
+    speedup: float = 1.0
+    efficiency: float = 1.0
+    lost_sessions: int = 0
+
+
+def main() -> None:
+    args = _parse_args()
+    results = [_measure(workers, args.seconds) for workers in args.workers]
+    base = results[0]
+    for result in results:
+        result.speedup = round(result.requests_per_second / base.requests_per_second, 3)
+        result.efficiency = round(result.speedup * base.workers / result.workers, 3)
+    print(json.dumps([asdict(result) for result in results], indent=2))
+    failures = [
+        f"{r.workers} workers: {r.lost_sessions} turns lost their session"
+        for r in results
+        if r.lost_sessions
+    ] + [
+        f"{r.workers} workers: efficiency {r.efficiency} below {args.min_efficiency}"
+        for r in results
+        if args.min_efficiency and r.efficiency < args.min_efficiency
+    ]
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+def _measure(workers: int, seconds: float) -> ScalingResult:
+    port = _free_port()
+    command = [
+        sys.executable,
+        "-m",
+        "src.cluster.launcher",
+        "--workers",
+        str(workers),
+        "--port",
+        str(port),
+        "--app",
+        "benchmarks.cluster_scaling:cpu_app",
+    ]
+    launcher = subprocess.Popen(
+        command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        _wait_for_workers(url, workers)
+        stop = time.perf_counter() + seconds
+        counts: list[tuple[int, int]] = []
+        threads = [
+            threading.Thread(target=_session, args=(url, stop, counts))
+            for _ in range(workers * SESSIONS_PER_WORKER)
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+    finally:
+        launcher.terminate()
+        launcher.wait(timeout=30)
+    requests = sum(done for done, _ in counts)
+    return ScalingResult(
+        workers=workers,
+        requests=requests,
+        requests_per_second=round(requests / elapsed, 1),
+        lost_sessions=sum(lost for _, lost in counts),
+    )
+
+
+def _session(url: str, stop: float, counts: list[tuple[int, int]]) -> None:
+    """Send turns of one session until stop; count turns and lost session state."""
+    correlation_id = None
+    done = lost = 0
+    while time.perf_counter() < stop:
+        body: dict[str, object] = {
+            "query": "benchmark",
+            "correlation_id": correlation_id,
+        }
+        reply = _post(f"{url}/api/agents/bench", body)
+        correlation_id = reply["correlation_id"]
+        done += 1
+        if int(reply["response"]) != done:
+            lost += 1
+    counts.append((done, lost))
+
+
+def _post(url: str, body: dict[str, object]) -> dict[str, str]:
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(body).encode(),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(request, timeout=30) as response:
+        result: dict[str, str] = json.loads(response.read())
+        return result
+
+
+def _wait_for_workers(url: str, workers: int, timeout_seconds: float = 60.0) -> None:
+    deadline = time.perf_counter() + timeout_seconds
+    while time.perf_counter() < deadline:
+        try:
+            with urllib.request.urlopen(f"{url}/cluster/workers", timeout=1) as reply:
+                if len(json.loads(reply.read())) == workers:
+                    return
+        except (urllib.error.URLError, ConnectionError, TimeoutError):
+            pass
+        time.sleep(POLL_INTERVAL_SECONDS)
+    raise TimeoutError(f"{workers} workers did not join within {timeout_seconds}s")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port: int = sock.getsockname()[1]
+        return port
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Multi-worker scaling benchmark")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--min-efficiency", type=float, default=None)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,426 @@
+"""Micro-benchmarks of agent hot paths, with JSON baselines and a regression check.
+
+Run from the repository root:
+
+    poetry run python -m benchmarks.hot_paths run --output benchmarks/baselines/local.json
+    poetry run python -m benchmarks.hot_paths compare --baseline benchmarks/baselines/local.json
+
+run times every case and prints the results, or writes them as a baseline with
+--output. compare times the cases again (or reads --current) and exits with status 1
+when a case's median time per call is more than --threshold slower than in the
+baseline. Cases cover ConversationMemory at growing history sizes, prompt building,
+agent settings, tool schema conversion on large catalogs and the session store at
+10k+ sessions; --filter selects cases by substring. Timings depend on the machine,
+so record the baseline on the machine that runs compare.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from src.agents_library import build_agent_settings
+from src.agents_library.memory import (
+    ConversationMemory,
+    cleanup_expired_memory,
+    get_or_create_memory,
+    memory_store,
+)
+from src.agents_library.messages import ChatMessage, ToolCall
+from src.config.settings import settings
+
+HISTORY_SIZES = (100, 1_000, 10_000)
+CATALOG_SIZES = (100, 1_000)
+SESSION_COUNTS = (10_000, 50_000)
+PROMPT_SECTIONS = (10, 100)
+TOPICS = ("billing", "latency", "cache", "deploy", "quota", "schema", "alerts")
+MAX_FRESH_CALLS = 50
+
+Timed = Callable[[], Any]
+
+
+@dataclass
+class Case:
+    """setup returns the timed callable; fresh cases call setup before every call."""
+
+    name: str
+    setup: Callable[[], Timed]
+    fresh: bool = False
+
+
+@dataclass
+class CaseResult:
+    median_us: float
+    min_us: float
+    calls_per_repeat: int
+    repeats: int
+
+
+@dataclass
+class Comparison:
+    name: str
+    baseline_us: float | None
+    current_us: float | None
+    change_percent: float | None
+    status: str
+
+
+def main() -> None:
+    args = _parse_args()
+    with tempfile.TemporaryDirectory(prefix="hot-paths-") as folder:
+        cases = [c for c in _cases(Path(folder)) if args.filter in c.name]
+        if args.command == "run":
+            report = _run(cases, args.repeats, args.min_seconds)
+            _write_or_print(report, args.output)
+            return
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        if args.current:
+            current = json.loads(Path(args.current).read_text(encoding="utf-8"))
+        else:
+            names = set(baseline["results"])
+            cases = [c for c in cases if c.name in names]
+            current = _run(cases, args.repeats, args.min_seconds)
+    comparisons = _compare(baseline["results"], current["results"], args.threshold)
+    print(json.dumps([asdict(c) for c in comparisons], indent=2))
+    regressions = [c for c in comparisons if c.status == "regression"]
+    for c in regressions:
+        print(
+            f"{c.name}: {c.change_percent}% slower than the baseline", file=sys.stderr
+        )
+    sys.exit(1 if regressions else 0)
+
+
+def _run(cases: list[Case], repeats: int, min_seconds: float) -> dict[str, Any]:
+    results = {}
+    for case in cases:
+        results[case.name] = asdict(_measure(case, repeats, min_seconds))
+        print(f"{case.name}: {results[case.name]['median_us']} us", file=sys.stderr)
+    return {
+        "created_at": datetime.now(UTC).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def _measure(case: Case, repeats: int, min_seconds: float) -> CaseResult:
+    """Time case, doubling the calls per repeat until a repeat takes min_seconds.
+
+    A first untimed call keeps lazy imports and first-use caches out of the numbers.
+    """
+    fn = None if case.fresh else case.setup()
+    if fn is not None:
+        _time_once(fn)
+    calls = 1
+    while True:
+        elapsed = _time_calls(case, fn, calls)
+        if elapsed >= min_seconds or (case.fresh and calls >= MAX_FRESH_CALLS):
+            break
+        calls *= 2
+    per_call = [elapsed / calls]
+    per_call += [_time_calls(case, fn, calls) / calls for _ in range(repeats - 1)]
+    return CaseResult(
+        median_us=round(statistics.median(per_call) * 1e6, 3),
+        min_us=round(min(per_call) * 1e6, 3),
+        calls_per_repeat=calls,
+        repeats=repeats,
+    )
+
+
+def _time_calls(case: Case, fn: Timed | None, calls: int) -> float:
+    if fn is None:
+        return sum(_time_once(case.setup()) for _ in range(calls))
+    if asyncio.iscoroutinefunction(fn):
+        return asyncio.run(_time_async(fn, calls))
+    started = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return time.perf_counter() - started
+
+
+def _time_once(fn: Timed) -> float:
+    if asyncio.iscoroutinefunction(fn):
+        return asyncio.run(_time_async(fn, 1))
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+async def _time_async(fn: Timed, calls: int) -> float:
+    started = time.perf_counter()
+    for _ in range(calls):
+        await fn()
+    return time.perf_counter() - started
+
+
+def _compare(
+    baseline: dict[str, Any], current: dict[str, Any], threshold: float
+) -> list[Comparison]:
+    comparisons = []
+    for name in sorted(baseline.keys() | current.keys()):
+        before = baseline.get(name, {}).get("median_us")
+        after = current.get(name, {}).get("median_us")
+        if before is None or after is None:
+            status = "new" if before is None else "missing"
+            comparisons.append(Comparison(name, before, after, None, status))
+            continue
+        change = (after - before) / before
+        status = "ok"
+        if change > threshold:
+            status = "regression"
+        elif change < -threshold:
+            status = "improvement"
+        comparisons.append(
+            Comparison(name, before, after, round(change * 100, 1), status)
+        )
+    return comparisons
+
+
+def _cases(folder: Path) -> list[Case]:
+    cases = []
+    for size in HISTORY_SIZES:
+        cases += [
+            Case(f"memory.add_user[history={size}]", partial(_add_user, size)),
+            Case(
+                f"memory.shrink_messages_to_fit_token_limit[history={size}]",
+                partial(_shrink, size),
+                fresh=True,
+            ),
+            Case(f"memory.build_messages[history={size}]", partial(_build, size)),
+        ]
+    for size in CATALOG_SIZES:
+        cases += [
+            Case(
+                f"agent.get_system_prompt[tools={size}]",
+                partial(_system_prompt, folder, size),
+            ),
+            Case(f"tools_as_openai_tools[tools={size}]", partial(_convert, size)),
+        ]
+    for size in PROMPT_SECTIONS:
+        cases.append(
+            Case(
+                f"agent.get_initial_action_prompts[sections={size}]",
+                partial(_initial_prompts, folder, size),
+            )
+        )
+    cases.append(Case("build_agent_settings", partial(_agent_settings, folder)))
+    for count in SESSION_COUNTS:
+        cases += [
+            Case(
+                f"memory_store.get_or_create_memory[sessions={count}]",
+                partial(_get_or_create, count),
+            ),
+            Case(
+                f"memory_store.cleanup_expired_memory[sessions={count}]",
+                partial(_cleanup, count),
+            ),
+        ]
+    return cases
+
+
+def _memory(history: int, hard_limit_tokens: int = 10**9) -> ConversationMemory:
+    """A memory holding history messages: user, tool call, tool result, answer turns."""
+    memory = ConversationMemory(hard_limit_tokens=hard_limit_tokens)
+    for turn in range(history // 4):
+        topic = TOPICS[turn % len(TOPICS)]
+        call_id = f"call_{turn}"
+        memory.messages += [
+            ChatMessage(role="user", content=f"question {turn} about {topic} limits"),
+            ChatMessage(
+                role="assistant",
+                content=None,
+                tool_calls=(ToolCall(id=call_id, name="search", arguments="{}"),),
+            ),
+            ChatMessage(
+                role="tool",
+                content=f"{topic} report {turn}: " + "value " * 40,
+                tool_call_id=call_id,
+            ),
+            ChatMessage(role="assistant", content=f"answer {turn} on {topic} " * 5),
+        ]
+    return memory
+
+
+def _add_user(history: int) -> Timed:
+    memory = _memory(history)
+
+    def call() -> None:
+        memory.add_user("next question about cache limits")
+        memory.messages.pop()
+
+    return call
+
+
+def _shrink(history: int) -> Timed:
+    memory = _memory(history)
+    memory.hard_limit_tokens = memory._count_tokens() // 2
+    return lambda: memory.shrink_messages_to_fit_token_limit(False)
+
+
+def _build(history: int) -> Timed:
+    memory = _memory(history)
+    for message in _memory(history).messages:
+        memory.archive.add(message.role, message.content)
+    return lambda: memory.build_messages("You are a helpful assistant.")
+
+
+def _agent_folder(folder: Path, sections: int = 10) -> Path:
+    agent_dir = folder / f"agent_{sections}"
+    if agent_dir.exists():
+        return agent_dir
+    agent_dir.mkdir(parents=True)
+    (agent_dir / "agent_config.yaml").write_text(
+        "name: Bench Agent\n"
+        "description: Benchmark agent\n"
+        "model: openai/gpt-4o\n"
+        "my_mcp_tools: [search, lookup, summarize]\n"
+        "replace_variables:\n"
+        "  bot_user_name: Alice\n"
+        "  team: Platform\n",
+        encoding="utf-8",
+    )
+    prompt = "## ROLE:\nYou help {bot_user_name} of team {team}.\n" * 20
+    (agent_dir / "system_prompt.md").write_text(
+        prompt + "\n## AVAILABLE TOOLS:\nUse tools when needed.\n", encoding="utf-8"
+    )
+    (agent_dir / "initial_action_prompts.md").write_text(
+        "".join(
+            f"# Action {i} for {{bot_user_name}}\n"
+            f"Ask about {TOPICS[i % len(TOPICS)]}.\nInclude the last week.\n"
+            for i in range(sections)
+        ),
+        encoding="utf-8",
+    )
+    return agent_dir
+
+
+def _agent(agent_dir: Path) -> Any:
+    # Imported here so --filter memory does not load the LLM client libraries.
+    from src.agents_library.base import BaseAgent, ChatSessionConfig
+
+    return BaseAgent(
+        settings=settings,
+        session_config=ChatSessionConfig(
+            bot_user_name="Alice", session_id="bench", topic_id="bench"
+        ),
+        memory=ConversationMemory(),
+        agent_folder_path=agent_dir,
+    )
+
+
+def _openai_tools(count: int) -> list[dict[str, Any]]:
+    return [
+        {
+            "type": "function",
+            "function": {
+                "name": f"tool_{i}",
+                "description": f"Look up {TOPICS[i % len(TOPICS)]} data\nDetails.",
+                "parameters": {"type": "object", "properties": {}},
+            },
+        }
+        for i in range(count)
+    ]
+
+
+def _system_prompt(folder: Path, tools: int) -> Timed:
+    agent = _agent(_agent_folder(folder))
+    schemas = _openai_tools(tools)
+
+    async def call() -> None:
+        await agent.get_system_prompt(schemas)
+
+    return call
+
+
+def _initial_prompts(folder: Path, sections: int) -> Timed:
+    agent = _agent(_agent_folder(folder, sections))
+
+    async def call() -> None:
+        agent.get_initial_action_prompts.cache_clear()
+        await agent.get_initial_action_prompts()
+
+    return call
+
+
+def _agent_settings(folder: Path) -> Timed:
+    config_path = _agent_folder(folder) / "agent_config.yaml"
+    return lambda: build_agent_settings(settings, config_path)
+
+
+def _convert(count: int) -> Timed:
+    from mcp.types import Tool
+
+    from src.mcp_client.client import tools_as_openai_tools
+
+    tools = [
+        Tool(
+            name=f"tool_{i}",
+            description=f"Look up {TOPICS[i % len(TOPICS)]} data",
+            inputSchema={
+                "type": "object",
+                "properties": {"query": {"type": "string"}},
+                "required": ["query"],
+            },
+        )
+        for i in range(count)
+    ]
+    return lambda: tools_as_openai_tools(tools)
+
+
+def _fill_store(sessions: int) -> list[str]:
+    memory_store.clear()
+    now = time.time()
+    ids = [f"session-{i}" for i in range(sessions)]
+    memory_store["bench"] = {cid: (ConversationMemory(), now) for cid in ids}
+    return ids
+
+
+def _get_or_create(sessions: int) -> Timed:
+    ids = itertools.cycle(_fill_store(sessions)[:: max(sessions // 1_000, 1)])
+    return lambda: get_or_create_memory("bench", next(ids))
+
+
+def _cleanup(sessions: int) -> Timed:
+    _fill_store(sessions)
+    return cleanup_expired_memory
+
+
+def _write_or_print(report: dict[str, Any], output: str | None) -> None:
+    text = json.dumps(report, indent=2) + "\n"
+    if output is None:
+        print(text, end="")
+        return
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    Path(output).write_text(text, encoding="utf-8")
+    print(f"Wrote {len(report['results'])} results to {output}", file=sys.stderr)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Agent hot path micro-benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="Time the cases")
+    run.add_argument("--output", default=None, help="Write the results here")
+    compare = commands.add_parser("compare", help="Check the cases against a baseline")
+    compare.add_argument("--baseline", required=True)
+    compare.add_argument("--current", default=None, help="Compare these results")
+    compare.add_argument("--threshold", type=float, default=0.25)
+    for command in (run, compare):
+        command.add_argument("--filter", default="")
+        command.add_argument("--repeats", type=int, default=5)
+        command.add_argument("--min-seconds", type=float, default=0.1)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Bytes per live session for ConversationMemory, before and after slotted messages.
+
+Run from the repository root:
+
+    poetry run python -m benchmarks.memory_footprint --sessions 1000 10000 --turns 10
+
+"before" rebuilds the previous layout, one plain dict per message, and "after" uses
+ConversationMemory with ChatMessage records. Both hold identical message text, so the
+difference is the per-message container overhead measured with tracemalloc.
+"""
+
+import argparse
+import gc
+import json
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from src.agents_library.memory import ConversationMemory
+from src.agents_library.messages import ChatMessage, ToolCall
+
+Turn = tuple[str, str, str, str]
+
+
+def main() -> None:
+    args = _parse_args()
+    report = []
+    for session_count in args.sessions:
+        turns = [_session_turns(i, args.turns) for i in range(session_count)]
+        before = _bytes_per_session(turns, _build_dict_session)
+        after = _bytes_per_session(turns, _build_slotted_session)
+        report.append(
+            {
+                "sessions": session_count,
+                "turns_per_session": args.turns,
+                "before_bytes_per_session": round(before),
+                "after_bytes_per_session": round(after),
+                "reduction_percent": round(100 * (before - after) / before, 1),
+            }
+        )
+    print(json.dumps(report, indent=2))
+
+
+def _bytes_per_session(
+    turns: list[list[Turn]], build_session: Callable[[list[Turn]], Any]
+) -> float:
+    gc.collect()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    sessions = [build_session(session_turns) for session_turns in turns]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del sessions
+    return (current - baseline) / len(turns)
+
+
+def _build_dict_session(turns: list[Turn]) -> list[dict[str, Any]]:
+    messages: list[dict[str, Any]] = []
+    for call_id, question, tool_result, answer in turns:
+        messages.append({"role": "user", "content": question})
+        messages.append(
+            {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [
+                    {
+                        "id": call_id,
+                        "type": "function",
+                        "function": {"name": "search_engine", "arguments": "{}"},
+                    }
+                ],
+            }
+        )
+        messages.append(
+            {"role": "tool", "content": tool_result, "tool_call_id": call_id}
+        )
+        messages.append({"role": "assistant", "content": answer})
+    return messages
+
+
+def _build_slotted_session(turns: list[Turn]) -> ConversationMemory:
+    memory = ConversationMemory(hard_limit_tokens=10**9)
+    for call_id, question, tool_result, answer in turns:
+        memory.add_user(question)
+        memory.add_assistant(
+            ChatMessage(
+                role="assistant",
+                content=None,
+                tool_calls=(
+                    ToolCall(id=call_id, name="search_engine", arguments="{}"),
+                ),
+            )
+        )
+        memory.add_tool_result(call_id, result=tool_result)
+        memory.add_assistant(ChatMessage(role="assistant", content=answer))
+    return memory
+
+
+def _session_turns(session_index: int, turn_count: int) -> list[Turn]:
+    return [
+        (
+            f"call_{session_index}_{turn}",
+            f"question {turn} of session {session_index}",
+            f"tool result {turn} for session {session_index}",
+            f"answer {turn} for session {session_index}",
+        )
+        for turn in range(turn_count)
+    ]
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="ConversationMemory footprint")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--turns", type=int, default=10)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Ingestion speed and memory of the search_pdf tool on a multi-hundred-page PDF.
+
+Run from the repository root:
+
+    poetry run python -m benchmarks.pdf_ingestion --pages 400 --workers 1 4
+
+The command writes a PDF of the given number of text-filled pages to a temporary
+folder (or uses --pdf) and, for each worker count, extracts it into an empty cache
+and then answers a query from the cache. It prints pages per second of the cold
+extraction, the latency of the cached query and the peak resident memory of the
+server process and of its worker processes.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from mcp_server.tool_executor import ToolExecutor
+from mcp_server.tools.pdf import PdfSearch
+from src.config.settings import PdfToolConfig, ToolExecutorConfig
+
+WORDS = (
+    "agent tool query model token latency cache page document chunk index search "
+    "memory process worker stream score result server client request response"
+).split()
+LINES_PER_PAGE = 45
+WORDS_PER_LINE = 12
+
+
+@dataclass
+class IngestionResult:
+    workers: int
+    pages: int
+    cold_seconds: float
+    pages_per_second: float
+    cached_query_seconds: float
+    peak_rss_mib: float
+    peak_worker_rss_mib: float
+
+
+def main() -> None:
+    args = _parse_args()
+    folder = Path(tempfile.mkdtemp(prefix="pdf-bench-"))
+    try:
+        pdf = (
+            Path(args.pdf) if args.pdf else _write_pdf(folder / "bench.pdf", args.pages)
+        )
+        results = [
+            asyncio.run(_measure(pdf, workers, folder / f"cache-{workers}"))
+            for workers in args.workers
+        ]
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+    print(json.dumps([asdict(result) for result in results], indent=2))
+    if args.min_pages_per_second and any(
+        r.pages_per_second < args.min_pages_per_second for r in results
+    ):
+        print(f"Below {args.min_pages_per_second} pages/s", file=sys.stderr)
+        sys.exit(1)
+
+
+async def _measure(pdf: Path, workers: int, cache_dir: Path) -> IngestionResult:
+    config = PdfToolConfig(
+        pdf_document_root=str(pdf.parent),
+        pdf_cache_dir=str(cache_dir),
+        pdf_max_workers=workers,
+    )
+    executor = ToolExecutor(ToolExecutorConfig())
+    search = PdfSearch(config, executor)
+    try:
+        await executor.warm_up()
+        started = time.perf_counter()
+        document = await search.load(pdf)
+        cold_seconds = time.perf_counter() - started
+        cached = PdfSearch(config, executor)
+        started = time.perf_counter()
+        await cached.search(pdf.name, "cache chunk index")
+        cached_query_seconds = time.perf_counter() - started
+    finally:
+        _stop(executor)
+    pages = document.pages
+    return IngestionResult(
+        workers=workers,
+        pages=pages,
+        cold_seconds=round(cold_seconds, 3),
+        pages_per_second=round(pages / cold_seconds, 1),
+        cached_query_seconds=round(cached_query_seconds, 3),
+        peak_rss_mib=_peak_rss_mib(resource.RUSAGE_SELF),
+        peak_worker_rss_mib=_peak_rss_mib(resource.RUSAGE_CHILDREN),
+    )
+
+
+def _stop(executor: ToolExecutor) -> None:
+    """Shut the pools down and reap their processes so RUSAGE_CHILDREN counts them."""
+    processes = [
+        process
+        for pool in executor._pools.values()
+        for process in (pool._processes or {}).values()
+    ]
+    executor.shutdown()
+    for process in processes:
+        process.join()
+
+
+def _write_pdf(path: Path, pages: int) -> Path:
+    import pymupdf
+
+    rng = random.Random(0)
+    document = pymupdf.open()
+    for _ in range(pages):
+        lines = (
+            " ".join(rng.choices(WORDS, k=WORDS_PER_LINE))
+            for _ in range(LINES_PER_PAGE)
+        )
+        document.new_page().insert_text((36, 36), "\n".join(lines), fontsize=9)
+    document.save(path)
+    document.close()
+    return path
+
+
+def _peak_rss_mib(who: int) -> float:
+    """Peak resident memory; ru_maxrss is KiB on Linux and bytes on macOS."""
+    peak = resource.getrusage(who).ru_maxrss
+    return round(peak / (1 << 20 if sys.platform == "darwin" else 1 << 10), 1)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="PDF ingestion benchmark")
+    parser.add_argument("--pages", type=int, default=400)
+    parser.add_argument("--pdf", default=None, help="Benchmark this PDF instead")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--min-pages-per-second", type=float, default=None)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main()
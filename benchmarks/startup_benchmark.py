@@ -0,0 +1,174 @@
+"""Import-time and cold-start benchmark for main.py and the MCP server.
+
+Run from the repository root:
+
+    poetry run python -m benchmarks.startup_benchmark --runs 5 --max-import-seconds 1.5
+
+Each run spawns a fresh interpreter, so numbers include module import and bytecode
+loading but not agent discovery, which happens in the application lifespan. The cold
+start measurement launches uvicorn and polls /health and /ready. The command exits
+with status 1 when a median exceeds one of the given limits.
+"""
+
+import argparse
+import json
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from dataclasses import asdict, dataclass
+
+IMPORT_SNIPPET = (
+    "import time; started = time.perf_counter(); import {module}; "
+    "print(time.perf_counter() - started)"
+)
+POLL_INTERVAL_SECONDS = 0.02
+
+
+@dataclass
+class StartupTarget:
+    name: str
+    module: str
+    asgi_app: str
+    factory: bool
+
+
+@dataclass
+class StartupResult:
+    name: str
+    import_seconds: float
+    health_seconds: float | None
+    ready_seconds: float | None
+
+
+TARGETS = [
+    StartupTarget(name="main", module="main", asgi_app="main:app", factory=False),
+    StartupTarget(
+        name="mcp_server",
+        module="mcp_server.server",
+        asgi_app="mcp_server.server:mcp_app.http_app",
+        factory=True,
+    ),
+]
+
+
+def main() -> None:
+    args = _parse_args()
+    results = [
+        _benchmark_target(target, args.runs, args.skip_cold_start)
+        for target in TARGETS
+        if target.name in args.targets
+    ]
+    print(json.dumps([asdict(result) for result in results], indent=2))
+    failures = _find_failures(results, args.max_import_seconds, args.max_ready_seconds)
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+def _benchmark_target(
+    target: StartupTarget, runs: int, skip_cold_start: bool
+) -> StartupResult:
+    import_seconds = statistics.median(
+        _measure_import(target.module) for _ in range(runs)
+    )
+    if skip_cold_start:
+        return StartupResult(target.name, import_seconds, None, None)
+    cold_starts = [_measure_cold_start(target) for _ in range(runs)]
+    return StartupResult(
+        name=target.name,
+        import_seconds=import_seconds,
+        health_seconds=statistics.median(health for health, _ in cold_starts),
+        ready_seconds=statistics.median(ready for _, ready in cold_starts),
+    )
+
+
+def _measure_import(module: str) -> float:
+    completed = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET.format(module=module)],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return float(completed.stdout.strip().splitlines()[-1])
+
+
+def _measure_cold_start(target: StartupTarget) -> tuple[float, float]:
+    """Return seconds until /health and /ready first answer 200."""
+    port = _free_port()
+    command = [sys.executable, "-m", "uvicorn", target.asgi_app, "--port", str(port)]
+    if target.factory:
+        command.append("--factory")
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        health_seconds = _wait_for_ok(f"http://127.0.0.1:{port}/health", started)
+        ready_seconds = _wait_for_ok(f"http://127.0.0.1:{port}/ready", started)
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+    return health_seconds, ready_seconds
+
+
+def _wait_for_ok(url: str, started: float, timeout_seconds: float = 120.0) -> float:
+    while time.perf_counter() - started < timeout_seconds:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return time.perf_counter() - started
+        except (urllib.error.URLError, ConnectionError, TimeoutError):
+            pass
+        time.sleep(POLL_INTERVAL_SECONDS)
+    raise TimeoutError(f"{url} did not become ready within {timeout_seconds}s")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port: int = sock.getsockname()[1]
+        return port
+
+
+def _find_failures(
+    results: list[StartupResult],
+    max_import_seconds: float | None,
+    max_ready_seconds: float | None,
+) -> list[str]:
+    failures: list[str] = []
+    for result in results:
+        if max_import_seconds and result.import_seconds > max_import_seconds:
+            failures.append(
+                f"{result.name}: import took {result.import_seconds:.3f}s "
+                f"(limit {max_import_seconds}s)"
+            )
+        if (
+            max_ready_seconds
+            and result.ready_seconds is not None
+            and result.ready_seconds > max_ready_seconds
+        ):
+            failures.append(
+                f"{result.name}: ready after {result.ready_seconds:.3f}s "
+                f"(limit {max_ready_seconds}s)"
+            )
+    return failures
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Import-time and cold-start benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--targets", nargs="+", default=[target.name for target in TARGETS]
+    )
+    parser.add_argument("--skip-cold-start", action="store_true")
+    parser.add_argument("--max-import-seconds", type=float, default=None)
+    parser.add_argument("--max-ready-seconds", type=float, default=None)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main()
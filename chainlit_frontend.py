@@ -1,14 +1,17 @@
 import asyncio
-from pathlib import Path
+from logging import getLogger
 from urllib.parse import parse_qs, urlparse
 
 import chainlit as cl
 
-from src.agents_library.base import BaseAgent, ChatSessionConfig
+from src.agents_library.base import BaseAgent, ChatSessionConfig, ToolEvent
+from src.agents_library.deadline import DeadlineExceededError, request_deadline
 from src.agents_library.memory import ConversationMemory
+from src.agents_library.registry import AgentEntry, agent_registry
 from src.config.settings import settings
+from src.observability.metrics import metrics
 
-AGENT_FOLDER_BASE_PATH = Path("src/agents_library/agents")
+logger = getLogger(__name__)
 
 
 @cl.on_chat_start
@@ -22,9 +25,13 @@ async def on_chat_start() -> None:
             "No agent specified. Please provide an agent query parameter in the URL."
         ).send()  # type: ignore[no-untyped-call]
         return
+    entry = await resolve_agent(agent_name)
+    if entry is None:
+        await cl.Message(f"Unknown agent '{agent_name}'.").send()  # type: ignore[no-untyped-call]
+        return
     session = ChatSessionConfig(
         bot_user_name="Assistant",
-        session_id="session",
+        session_id=cl.context.session.id,
         topic_id="default",
     )
     memory = ConversationMemory()
@@ -32,9 +39,13 @@ async def on_chat_start() -> None:
         settings=settings,
         session_config=session,
         memory=memory,
-        agent_folder_path=(AGENT_FOLDER_BASE_PATH / agent_name),
+        agent_folder_path=entry.path,
     )
+    if settings.mcp_server_config.show_tool_progress_in_chainlit:
+        agent.on_tool_event = ToolSteps().on_tool_event
     cl.user_session.set("agent", agent)  # type: ignore[no-untyped-call]
+    # Warm up while the greeting and the action prompt wait for the user.
+    cl.user_session.set("warm_up", asyncio.create_task(agent.warm_up()))  # type: ignore[no-untyped-call]
 
     _, initial_prompts = await asyncio.gather(
         cl.Message(
@@ -75,9 +86,86 @@ async def main(message: cl.Message) -> None:
     if agent is None:
         await cl.Message("Session not initialized. Please refresh the chat.").send()  # type: ignore[no-untyped-call]
         return
+    await finish_warm_up()
+
+    reply = cl.Message(content="")
+    cl.user_session.set("turn_task", asyncio.current_task())  # type: ignore[no-untyped-call]
+    try:
+        async with request_deadline(
+            "chainlit", seconds=settings.deadline_config.request_deadline_seconds
+        ):
+            async for text in agent.stream_response(message.content or ""):
+                await reply.stream_token(text)
+    except DeadlineExceededError:
+        await reply.stream_token("\n\n(The answer took too long and was stopped.)")
+    finally:
+        cl.user_session.set("turn_task", None)  # type: ignore[no-untyped-call]
+    await reply.send()  # type: ignore[no-untyped-call]
+
+
+@cl.on_stop
+async def on_stop() -> None:
+    # Chainlit cancels the running message task itself; only count it here.
+    if _running_turn() is not None:
+        metrics.inc("request_cancellations_total", reason="stop", source="chainlit")
+
+
+@cl.on_chat_end
+async def on_chat_end() -> None:
+    """Stop the running turn when the user leaves; nobody will read its answer."""
+    turn = _running_turn()
+    if turn is not None:
+        metrics.inc(
+            "request_cancellations_total", reason="disconnect", source="chainlit"
+        )
+        turn.cancel()
+
+
+def _running_turn() -> asyncio.Task[None] | None:
+    turn: asyncio.Task[None] | None = cl.user_session.get("turn_task")  # type: ignore[no-untyped-call]
+    return turn if turn is not None and not turn.done() else None
+
+
+async def resolve_agent(agent_name: str) -> AgentEntry | None:
+    """Look the agent up in the shared registry, discovering agents when run standalone."""
+    if not agent_registry.ready:
+        await asyncio.to_thread(agent_registry.discover_sync, settings)
+    return agent_registry.get(agent_name)
+
+
+async def finish_warm_up() -> None:
+    """Wait for the chat's warm-up; failures are left to surface in the real turn."""
+    warm_up: asyncio.Task[None] | None = cl.user_session.get("warm_up")  # type: ignore[no-untyped-call]
+    if warm_up is None:
+        return
+    cl.user_session.set("warm_up", None)  # type: ignore[no-untyped-call]
+    try:
+        await warm_up
+    except Exception:
+        logger.exception("Agent warm-up failed")
+
+
+class ToolSteps:
+    """Show each running tool call as a Chainlit step with its streamed progress."""
+
+    def __init__(self) -> None:
+        self._steps: dict[str, cl.Step] = {}
 
-    reply = await agent.prepare_response(message.content or "")
-    await cl.Message(content=reply).send()  # type: ignore[no-untyped-call]
+    async def on_tool_event(self, event: ToolEvent) -> None:
+        if event.status == "started":
+            step = cl.Step(name=event.tool_name, type="tool")
+            self._steps[event.tool_call_id] = step
+            await step.send()
+            return
+        step = self._steps.get(event.tool_call_id)
+        if step is None:
+            return
+        if event.status == "progress":
+            if event.message:
+                await step.stream_token(event.message)
+        else:
+            del self._steps[event.tool_call_id]
+            await step.update()
 
 
 def get_param(query_params: dict[str, list[str]], key: str) -> str | None:
@@ -1,15 +1,56 @@
+import asyncio
+import importlib
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from logging import getLogger
 
-from chainlit.utils import mount_chainlit
 from fastapi import FastAPI
-from fastapi.responses import RedirectResponse
+from fastapi.responses import JSONResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
 
 from routers.agents_router import router as agents_router
 from routers.chainlit_router import router as chainlit_router
+from routers.jobs_router import router as jobs_router
+from routers.metrics_router import router as metrics_router
+from routers.profiling_router import router as profiling_router
+from src.agents_library.jobs import job_manager
+from src.agents_library.startup import start_agents, warm_up_agents
+from src.api_client.cassette import cassette
+from src.api_client.http_pool import llm_http_pool
+from src.config.settings import settings
 
 logger = getLogger(__name__)
-app = FastAPI()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Load agents and the chat UI in the background so health checks answer at once."""
+    app.state.startup_task = asyncio.create_task(_start_app(app))
+    job_manager.start()
+    yield
+    app.state.startup_task.cancel()
+    await job_manager.stop()
+    await llm_http_pool.aclose()
+    cassette.close()
+
+
+async def _start_app(app: FastAPI) -> None:
+    try:
+        entries = await start_agents(settings)
+        chainlit_utils, _ = await asyncio.gather(
+            asyncio.to_thread(importlib.import_module, "chainlit.utils"),
+            warm_up_agents(entries),
+        )
+        chainlit_utils.mount_chainlit(
+            app=app, target="./chainlit_frontend.py", path="/chat"
+        )
+    except Exception:
+        logger.exception("Application startup failed")
+        raise
+    logger.info("Application is ready")
+
+
+app = FastAPI(lifespan=lifespan)
 
 
 @app.get("/")
@@ -18,10 +59,29 @@ def root() -> RedirectResponse:
     return RedirectResponse(url="/chat_services/welcome/")
 
 
-mount_chainlit(app=app, target="./chainlit_frontend.py", path="/chat")
+@app.get("/health")
+def health() -> dict[str, str]:
+    """Liveness probe; answers as soon as the process serves requests."""
+    return {"status": "ok"}
+
+
+@app.get("/ready")
+def ready() -> JSONResponse:
+    """Readiness probe; 200 once agents are discovered, warmed up and the chat UI is mounted."""
+    task: asyncio.Task[None] | None = getattr(app.state, "startup_task", None)
+    if task is None or not task.done():
+        return JSONResponse({"status": "starting"}, status_code=503)
+    if task.cancelled() or task.exception() is not None:
+        return JSONResponse({"status": "failed"}, status_code=503)
+    return JSONResponse({"status": "ready"})
+
+
 app.mount(
     "/chat_services/welcome", StaticFiles(directory="html", html=True), name="html"
 )
 app.include_router(chainlit_router, prefix="/chat_services")
 
 app.include_router(agents_router, prefix="/api/agents")
+app.include_router(jobs_router, prefix="/api/jobs")
+app.include_router(metrics_router)
+app.include_router(profiling_router, prefix="/api/profiles")
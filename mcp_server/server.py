@@ -1,34 +1,160 @@
-from collections.abc import Callable, Coroutine
+import asyncio
+import time
+from collections.abc import AsyncIterator, Callable, Coroutine
+from contextlib import asynccontextmanager
 from logging import getLogger
 from pathlib import Path
 from typing import Any
 
 from dotenv import load_dotenv
-from fastmcp import FastMCP
+from fastmcp import Context, FastMCP
+from fastmcp.exceptions import ToolError
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
 
-from src.agents_library import build_agent_settings
-from src.agents_library.base import BaseAgent, ChatSessionConfig
-from src.agents_library.initiator import load_agent_paths
+from mcp_server.tool_executor import tool_executor
+from mcp_server.tools.pdf import register_pdf_tool
+from mcp_server.tools.sql import register_sql_tool, sql_query
+from src.agents_library.admission import AdmissionRejectedError, admission_controller
+from src.agents_library.base import BaseAgent, ChatSessionConfig, ToolEvent
+from src.agents_library.deadline import (
+    DEADLINE_META_KEY,
+    DeadlineExceededError,
+    request_deadline,
+)
 from src.agents_library.memory import ConversationMemory
+from src.agents_library.registry import AgentEntry
 from src.agents_library.response_types import BaseChatResponse
+from src.agents_library.startup import start_agents, warm_up_agents
+from src.api_client.cassette import cassette
+from src.api_client.http_pool import llm_http_pool
 from src.config.settings import Settings, settings
+from src.observability.metrics import metrics
 
 load_dotenv()
 logger = getLogger(__name__)
 
+session_config = ChatSessionConfig(
+    bot_user_name="TestBot",
+    session_id="session_123",
+    topic_id="topic_abc",
+    priority="nested",
+)
+server_state: dict[str, asyncio.Task[None]] = {}
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """Register agent tools in the background so health checks answer at once."""
+    startup_task = asyncio.create_task(_register_agent_tools(server))
+    server_state["startup_task"] = startup_task
+    yield
+    startup_task.cancel()
+    tool_executor.shutdown()
+    sql_query.dispose()
+    await llm_http_pool.aclose()
+    cassette.close()
+
+
 mcp_app = FastMCP(
     name="my-mcp-server",
     version="0.0.1",
     instructions="access AI agents and tools for various tasks",
+    lifespan=lifespan,
 )
+register_pdf_tool(mcp_app)
+register_sql_tool(mcp_app)
 
-session_config = ChatSessionConfig(
-    bot_user_name="TestBot",
-    session_id="session_123",
-    topic_id="topic_abc",
-)
 
-agent_path_list = load_agent_paths()
+@mcp_app.custom_route("/metrics", methods=["GET"])
+async def export_metrics(request: Request) -> PlainTextResponse:
+    """Expose MCP server metrics in the Prometheus text format."""
+    llm_http_pool.publish_stats()
+    return PlainTextResponse(metrics.render_prometheus())
+
+
+@mcp_app.custom_route("/health", methods=["GET"])
+async def health(request: Request) -> JSONResponse:
+    """Liveness probe; answers as soon as the process serves requests."""
+    return JSONResponse({"status": "ok"})
+
+
+@mcp_app.custom_route("/ready", methods=["GET"])
+async def ready(request: Request) -> JSONResponse:
+    """Readiness probe; 200 once every agent tool is registered and warmed up."""
+    task = server_state.get("startup_task")
+    if task is None or not task.done():
+        return JSONResponse({"status": "starting"}, status_code=503)
+    if task.cancelled() or task.exception() is not None:
+        return JSONResponse({"status": "failed"}, status_code=503)
+    return JSONResponse({"status": "ready"})
+
+
+async def _register_agent_tools(server: FastMCP) -> None:
+    try:
+        entries = await start_agents(settings)
+    except Exception:
+        logger.exception("Agent tool registration failed")
+        raise
+    for entry in entries:
+        register_agent_tool(server, entry)
+    await asyncio.gather(warm_up_agents(entries), tool_executor.warm_up())
+
+
+def register_agent_tool(server: FastMCP, entry: AgentEntry) -> None:
+    """Expose one agent as an MCP tool named after its configured name."""
+    agent_config = entry.settings.agent_config
+    tool_name: str = agent_config.name.lower().replace(" ", "_")
+    handler = _make_tool_handler(
+        bound_agent_settings=entry.settings,
+        bound_agent_path=entry.path,
+        bound_session_config=session_config,
+    )
+    server.tool(name=tool_name, description=agent_config.description)(handler)
+
+
+class _ProgressReporter:
+    """Throttled MCP progress notifications for one nested agent run.
+
+    Streamed answer text is buffered and sent as the message of a progress
+    notification at most every interval seconds. Nested tool calls send an empty
+    notification so the caller knows the run is alive. progress counts the
+    notifications sent, which keeps it increasing as MCP requires.
+    """
+
+    def __init__(self, ctx: Context, interval: float) -> None:
+        self._ctx = ctx
+        self._interval = interval
+        self._pending: list[str] = []
+        self._sent = 0
+        self._last_sent = time.monotonic()
+
+    async def add_text(self, text: str) -> None:
+        self._pending.append(text)
+        if time.monotonic() - self._last_sent >= self._interval:
+            await self.flush()
+
+    async def on_tool_event(self, event: ToolEvent) -> None:
+        if event.status != "progress":
+            await self.flush(force=True)
+
+    async def flush(self, force: bool = False) -> None:
+        if not self._pending and not force:
+            return
+        message = "".join(self._pending) or None
+        self._pending.clear()
+        self._sent += 1
+        self._last_sent = time.monotonic()
+        await self._ctx.report_progress(progress=self._sent, message=message)
+
+
+def _caller_deadline(ctx: Context) -> float | None:
+    """Absolute deadline the calling agent sent in the MCP request metadata."""
+    request_context = ctx.request_context
+    if request_context is None or request_context.meta is None:
+        return None
+    deadline = getattr(request_context.meta, DEADLINE_META_KEY, None)
+    return float(deadline) if isinstance(deadline, int | float) else None
 
 
 # Helper to capture loop variables per tool registration
@@ -37,8 +163,26 @@ def _make_tool_handler(
     bound_agent_settings: Settings,
     bound_agent_path: Path,
     bound_session_config: ChatSessionConfig,
-) -> Callable[[str], Coroutine[Any, Any, str]]:
-    async def _handler(query: str) -> str:
+) -> Callable[[str, Context], Coroutine[Any, Any, str]]:
+    tool_key = bound_agent_path.name
+
+    async def _handler(query: str, ctx: Context) -> str:
+        try:
+            async with (
+                request_deadline(
+                    "mcp_tool",
+                    seconds=settings.deadline_config.request_deadline_seconds,
+                    at=_caller_deadline(ctx),
+                ),
+                admission_controller.admit(tool_key),
+            ):
+                return await _run_agent(query, ctx)
+        except AdmissionRejectedError as e:
+            raise ToolError(f"{e}. Retry after {e.retry_after_seconds} seconds.") from e
+        except DeadlineExceededError as e:
+            raise ToolError(str(e)) from e
+
+    async def _run_agent(query: str, ctx: Context) -> str:
         memory = ConversationMemory()
         agent = BaseAgent(
             settings=bound_agent_settings,
@@ -46,22 +190,15 @@ def _make_tool_handler(
             memory=memory,
             agent_folder_path=bound_agent_path,
         )
-        response: str = await agent.prepare_response(query, BaseChatResponse)
-        return response
+        reporter = _ProgressReporter(
+            ctx, settings.mcp_server_config.tool_progress_interval_seconds
+        )
+        agent.on_tool_event = reporter.on_tool_event
+        parts: list[str] = []
+        async for text in agent.stream_response(query, BaseChatResponse):
+            parts.append(text)
+            await reporter.add_text(text)
+        await reporter.flush()
+        return "".join(parts)
 
     return _handler
-
-
-for agent_path in agent_path_list:
-    logger.info(f"Loading agent from path: {agent_path}")
-    agent_settings = build_agent_settings(settings, agent_path / "agent_config.yaml")
-    tool_name: str = agent_settings.agent_config.name.lower().replace(" ", "_")
-    tool_desc: str = agent_settings.agent_config.description
-
-    handler = _make_tool_handler(
-        bound_agent_settings=agent_settings,
-        bound_agent_path=agent_path,
-        bound_session_config=session_config,
-    )
-
-    mcp_app.tool(name=tool_name, description=tool_desc)(handler)
@@ -0,0 +1,265 @@
+"""Run CPU-bound MCP tools in worker processes so the server's event loop stays free."""
+
+import asyncio
+import functools
+import multiprocessing
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import suppress
+from dataclasses import dataclass
+from logging import getLogger
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, ParamSpec, TypeVar, cast
+
+from fastmcp import FastMCP
+from fastmcp.exceptions import ToolError
+
+from src.agents_library.deadline import remaining_seconds, timeout_for
+from src.config.settings import ToolExecutorConfig, settings
+from src.observability.metrics import metrics
+
+logger = getLogger(__name__)
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class SharedBytes:
+    """Reference to bytes placed in a shared memory block instead of the pipe."""
+
+    name: str
+    size: int
+
+    @classmethod
+    def put(cls, data: bytes) -> "SharedBytes":
+        block = SharedMemory(create=True, size=max(len(data), 1))
+        assert block.buf is not None
+        block.buf[: len(data)] = data
+        block.close()
+        return cls(block.name, len(data))
+
+    def read(self) -> bytes:
+        block = SharedMemory(name=self.name)
+        try:
+            assert block.buf is not None
+            return bytes(block.buf[: self.size])
+        finally:
+            block.close()
+
+    def unlink(self) -> None:
+        with suppress(FileNotFoundError):
+            block = SharedMemory(name=self.name)
+            block.close()
+            block.unlink()
+
+
+@dataclass(frozen=True)
+class CpuToolSpec:
+    name: str
+    max_workers: int
+    timeout_seconds: float
+
+
+class ToolExecutor:
+    """Process pools for CPU-bound tools, one per tool.
+
+    Each tool gets its own pool of spawned processes sized by its max_workers, so a
+    heavy tool cannot take every core from the others. Calls wait for a free worker
+    of their tool, and the timeout starts once they have one. A call running past
+    its timeout (or the caller's deadline) fails with a ToolError and its pool is
+    replaced, which stops the runaway process.
+    Large bytes arguments and results travel through shared memory.
+    """
+
+    def __init__(self, config: ToolExecutorConfig) -> None:
+        self.config = config
+        self._specs: dict[str, CpuToolSpec] = {}
+        self._pools: dict[str, ProcessPoolExecutor] = {}
+        self._slots: dict[str, asyncio.Semaphore] = {}
+        self._context = multiprocessing.get_context("spawn")
+
+    def declare(
+        self,
+        name: str,
+        max_workers: int | None = None,
+        timeout_seconds: float | None = None,
+    ) -> CpuToolSpec:
+        spec = CpuToolSpec(
+            name=name,
+            max_workers=max_workers or self.config.tool_default_max_workers,
+            timeout_seconds=timeout_seconds or self.config.tool_default_timeout_seconds,
+        )
+        self._specs[name] = spec
+        self._slots[name] = asyncio.Semaphore(spec.max_workers)
+        return spec
+
+    async def run(
+        self, name: str, fn: Callable[..., T], *args: Any, **kwargs: Any
+    ) -> T:
+        """Run fn(*args, **kwargs) in the pool of tool name and return its result.
+
+        fn must be a module-level function so worker processes can import it.
+        """
+        spec = self._specs.get(name) or self.declare(name)
+        slots = self._slots[name]
+        try:
+            async with asyncio.timeout(remaining_seconds()):
+                await slots.acquire()
+        except TimeoutError as e:
+            metrics.inc("mcp_tool_executor_calls_total", tool=name, status="timeout")
+            raise ToolError(f"Tool '{name}' had no free worker in time") from e
+        try:
+            return await self._run_in_pool(spec, fn, args, kwargs)
+        finally:
+            slots.release()
+
+    async def _run_in_pool(
+        self,
+        spec: CpuToolSpec,
+        fn: Callable[..., T],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+    ) -> T:
+        name = spec.name
+        threshold = self.config.tool_shared_memory_threshold_bytes
+        shared: list[SharedBytes] = []
+        args = tuple(_share_large(arg, threshold, shared) for arg in args)
+        kwargs = {k: _share_large(v, threshold, shared) for k, v in kwargs.items()}
+        pool = self._pool(spec)
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        metrics.add_gauge("mcp_tool_executor_in_flight", 1, tool=name)
+        status = "error"
+        try:
+            async with asyncio.timeout(timeout_for(spec.timeout_seconds)):
+                result = await loop.run_in_executor(
+                    pool, functools.partial(_invoke, fn, threshold, args, kwargs)
+                )
+            status = "ok"
+        except TimeoutError as e:
+            status = "timeout"
+            self._recycle(name, pool)
+            raise ToolError(f"Tool '{name}' did not finish in time") from e
+        except BrokenProcessPool as e:
+            # Another call of this tool timed out and its pool was replaced.
+            self._drop(name, pool)
+            raise ToolError(f"Tool '{name}' was interrupted; try again") from e
+        finally:
+            metrics.add_gauge("mcp_tool_executor_in_flight", -1, tool=name)
+            metrics.inc("mcp_tool_executor_calls_total", tool=name, status=status)
+            metrics.inc(
+                "mcp_tool_executor_seconds_total",
+                time.perf_counter() - started,
+                tool=name,
+            )
+            for block in shared:
+                block.unlink()
+        if isinstance(result, SharedBytes):
+            data = result.read()
+            result.unlink()
+            return data  # type: ignore[return-value]
+        return cast(T, result)
+
+    async def warm_up(self) -> None:
+        """Start one process per declared tool so the first call skips the spawn."""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(self._pool(spec), _noop)
+                for spec in self._specs.values()
+            )
+        )
+
+    def shutdown(self) -> None:
+        pools = list(self._pools.values())
+        self._pools.clear()
+        for pool in pools:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _pool(self, spec: CpuToolSpec) -> ProcessPoolExecutor:
+        pool = self._pools.get(spec.name)
+        if pool is None:
+            pool = ProcessPoolExecutor(
+                max_workers=spec.max_workers, mp_context=self._context
+            )
+            self._pools[spec.name] = pool
+        return pool
+
+    def _drop(self, name: str, pool: ProcessPoolExecutor) -> None:
+        if self._pools.get(name) is pool:
+            del self._pools[name]
+
+    def _recycle(self, name: str, pool: ProcessPoolExecutor) -> None:
+        self._drop(name, pool)
+        # ProcessPoolExecutor cannot stop a running call; kill its processes instead.
+        processes = list((getattr(pool, "_processes", None) or {}).values())
+        pool.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.kill()
+        # Start the replacement now so the next call does not pay for the spawn.
+        self._pool(self._specs[name]).submit(_noop)
+        metrics.inc("mcp_tool_executor_pool_restarts_total", tool=name)
+        logger.warning(f"Replaced the process pool of tool '{name}' after a timeout")
+
+
+def cpu_bound_tool(
+    server: FastMCP,
+    *,
+    name: str | None = None,
+    description: str | None = None,
+    max_workers: int | None = None,
+    timeout_seconds: float | None = None,
+) -> Callable[[Callable[P, T]], Callable[P, T]]:
+    """Register a module-level sync function as an MCP tool run in worker processes.
+
+    The function keeps its signature, so FastMCP derives the tool schema from it, and
+    is returned unchanged so it stays importable by the workers.
+    """
+
+    def decorate(fn: Callable[P, T]) -> Callable[P, T]:
+        tool_name = name or fn.__name__
+        tool_executor.declare(tool_name, max_workers, timeout_seconds)
+
+        @functools.wraps(fn)
+        async def handler(*args: P.args, **kwargs: P.kwargs) -> T:
+            return await tool_executor.run(tool_name, fn, *args, **kwargs)
+
+        server.tool(name=tool_name, description=description or fn.__doc__)(handler)
+        return fn
+
+    return decorate
+
+
+def _share_large(value: Any, threshold: int, shared: list[SharedBytes]) -> Any:
+    if isinstance(value, bytes) and len(value) >= threshold:
+        block = SharedBytes.put(value)
+        shared.append(block)
+        return block
+    return value
+
+
+def _invoke(
+    fn: Callable[..., Any],
+    threshold: int,
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+) -> Any:
+    """Worker side: resolve shared arguments, call fn and share a large result."""
+    args = tuple(a.read() if isinstance(a, SharedBytes) else a for a in args)
+    kwargs = {
+        k: v.read() if isinstance(v, SharedBytes) else v for k, v in kwargs.items()
+    }
+    result = fn(*args, **kwargs)
+    if isinstance(result, bytes) and len(result) >= threshold:
+        return SharedBytes.put(result)
+    return result
+
+
+def _noop() -> None:
+    return None
+
+
+tool_executor = ToolExecutor(settings.tool_executor_config)
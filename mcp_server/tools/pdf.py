@@ -0,0 +1,205 @@
+"""search_pdf: page-parallel PDF ingestion with an on-disk chunk cache."""
+
+import asyncio
+import functools
+import gzip
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass
+from logging import getLogger
+from pathlib import Path
+
+from fastmcp import FastMCP
+from fastmcp.exceptions import ToolError
+
+from mcp_server.tool_executor import ToolExecutor, tool_executor
+from mcp_server.tools.pdf_pages import PdfChunk, extract_chunks, page_count
+from src.agents_library.bm25 import BM25Index
+from src.config.settings import PdfToolConfig, settings
+from src.observability.metrics import metrics
+
+logger = getLogger(__name__)
+
+TOOL_NAME = "search_pdf"
+HASH_BLOCK_BYTES = 1 << 20
+
+
+@dataclass
+class PdfDocument:
+    digest: str
+    pages: int
+    chunks: list[PdfChunk]
+    index: BM25Index
+
+
+class PdfSearch:
+    """Extracts PDFs once, caches their chunks by content hash and ranks them by query.
+
+    Pages are split into ranges that worker processes of the tool executor extract
+    concurrently; each worker opens the file itself, so the server never holds the
+    document. Chunks are written to pdf_cache_dir as gzip JSON lines named after the
+    file's SHA-256, so an edited file is extracted again and a renamed one is not;
+    the hash is only recomputed when the file's size or modification time changes.
+    Indexes of recently searched documents stay in memory.
+    """
+
+    def __init__(
+        self, config: PdfToolConfig, executor: ToolExecutor, max_documents: int = 8
+    ) -> None:
+        self.config = config
+        self.executor = executor
+        self.max_documents = max_documents
+        self._documents: dict[str, PdfDocument] = {}
+        self._loading: dict[str, asyncio.Future[PdfDocument]] = {}
+        executor.declare(
+            TOOL_NAME, max_workers=config.pdf_max_workers or os.cpu_count()
+        )
+
+    async def search(self, path: str, query: str, top_k: int | None = None) -> str:
+        document = await self.load(self.resolve(path))
+        hits = document.index.search(query, top_k or self.config.pdf_top_k)
+        if not hits:
+            return f"No passage of {path} ({document.pages} pages) matches the query."
+        chunks = [document.chunks[int(i)] for i, _ in hits]
+        return "\n\n".join(f"[page {c['page']}] {c['text']}" for c in chunks)
+
+    def resolve(self, path: str) -> Path:
+        """The PDF at path inside pdf_document_root; anything outside it is refused."""
+        root = Path(self.config.pdf_document_root).resolve()
+        resolved = (root / path).resolve()
+        if not resolved.is_relative_to(root) or resolved.suffix.lower() != ".pdf":
+            raise ToolError(f"'{path}' is not a PDF in the document folder")
+        if not resolved.is_file():
+            raise ToolError(f"No PDF named '{path}' in the document folder")
+        return resolved
+
+    async def load(self, path: Path) -> PdfDocument:
+        digest = await asyncio.to_thread(cached_file_digest, path)
+        document = self._documents.pop(digest, None)
+        if document is None:
+            loading = self._loading.get(digest)
+            if loading is None:
+                loading = asyncio.ensure_future(self._load(path, digest))
+                self._loading[digest] = loading
+                loading.add_done_callback(lambda _: self._loading.pop(digest, None))
+            document = await asyncio.shield(loading)
+        self._documents[digest] = document
+        while len(self._documents) > self.max_documents:
+            del self._documents[next(iter(self._documents))]
+        return document
+
+    async def _load(self, path: Path, digest: str) -> PdfDocument:
+        cache_path = Path(self.config.pdf_cache_dir) / f"{digest}.jsonl.gz"
+        cached = await asyncio.to_thread(_read_cache, cache_path)
+        if cached is not None:
+            metrics.inc("pdf_cache_requests_total", result="hit")
+            pages, chunks = cached
+        else:
+            metrics.inc("pdf_cache_requests_total", result="miss")
+            pages, chunks = await self.extract(path)
+            await asyncio.to_thread(_write_cache, cache_path, pages, chunks)
+        index = await asyncio.to_thread(_build_index, chunks)
+        return PdfDocument(digest, pages, chunks, index)
+
+    async def extract(self, path: Path) -> tuple[int, list[PdfChunk]]:
+        """Extract and chunk every page of path in parallel worker processes.
+
+        The executor runs at most pdf_max_workers ranges at a time; the others wait
+        for a worker without using up their timeout. If one range fails, the rest
+        are cancelled and its error is raised.
+        """
+        started = time.perf_counter()
+        pages = await self.executor.run(TOOL_NAME, page_count, str(path))
+        step = self.config.pdf_pages_per_task
+        try:
+            async with asyncio.TaskGroup() as group:
+                tasks = [
+                    group.create_task(
+                        self.executor.run(
+                            TOOL_NAME,
+                            extract_chunks,
+                            str(path),
+                            start,
+                            start + step,
+                            self.config.pdf_chunk_words,
+                            self.config.pdf_chunk_overlap_words,
+                        )
+                    )
+                    for start in range(0, pages, step)
+                ]
+        except ExceptionGroup as e:
+            raise e.exceptions[0] from None
+        parts = [task.result() for task in tasks]
+        elapsed = time.perf_counter() - started
+        metrics.inc("pdf_pages_extracted_total", pages)
+        metrics.inc("pdf_extraction_seconds_total", elapsed)
+        logger.info(f"Extracted {pages} pages of {path.name} in {elapsed:.2f}s")
+        return pages, [chunk for part in parts for chunk in part]
+
+
+def file_digest(path: Path) -> str:
+    """SHA-256 of the file, read in blocks so large PDFs are never loaded whole."""
+    digest = hashlib.sha256()
+    with path.open("rb") as file:
+        while block := file.read(HASH_BLOCK_BYTES):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cached_file_digest(path: Path) -> str:
+    """file_digest, reused while the file keeps its size and modification time."""
+    stat = path.stat()
+    return _file_digest(path, stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=256)
+def _file_digest(path: Path, mtime_ns: int, size: int) -> str:
+    return file_digest(path)
+
+
+def _build_index(chunks: list[PdfChunk]) -> BM25Index:
+    index = BM25Index()
+    for i, chunk in enumerate(chunks):
+        index.add(str(i), chunk["text"])
+    return index
+
+
+def _read_cache(path: Path) -> tuple[int, list[PdfChunk]] | None:
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            header = json.loads(file.readline())
+            records = [json.loads(line) for line in file]
+        chunks = [
+            PdfChunk(page=int(record["page"]), text=str(record["text"]))
+            for record in records
+        ]
+        return int(header["pages"]), chunks
+    except (OSError, EOFError, ValueError, TypeError, KeyError):
+        return None
+
+
+def _write_cache(path: Path, pages: int, chunks: list[PdfChunk]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_suffix(f".{os.getpid()}.tmp")
+    with gzip.open(partial, "wt", encoding="utf-8") as file:
+        file.write(json.dumps({"pages": pages}) + "\n")
+        for chunk in chunks:
+            file.write(json.dumps(chunk, separators=(",", ":")) + "\n")
+    partial.replace(path)
+
+
+pdf_search = PdfSearch(settings.pdf_tool_config, tool_executor)
+
+
+def register_pdf_tool(server: FastMCP) -> None:
+    async def search_pdf(path: str, query: str, top_k: int | None = None) -> str:
+        """Return the passages of a PDF in the document folder most relevant to query.
+
+        path is relative to the document folder. Each passage starts with its page
+        number. Only the top_k best passages are returned, never the whole document.
+        """
+        return await pdf_search.search(path, query, top_k)
+
+    server.tool(name=TOOL_NAME)(search_pdf)
@@ -0,0 +1,45 @@
+"""Worker-side PDF text extraction; imported by tool executor processes, keep it light."""
+
+from typing import TypedDict
+
+
+class PdfChunk(TypedDict):
+    page: int
+    text: str
+
+
+def page_count(path: str) -> int:
+    import pymupdf
+
+    with pymupdf.open(path) as document:
+        return int(document.page_count)
+
+
+def extract_chunks(
+    path: str, start: int, stop: int, chunk_words: int, overlap_words: int
+) -> list[PdfChunk]:
+    """Chunk the text of pages start..stop-1; page numbers in the result are 1-based.
+
+    The document is opened by path in the worker, so PyMuPDF reads only the parts of
+    the file these pages need and nothing is copied between processes but the text.
+    """
+    import pymupdf
+
+    chunks: list[PdfChunk] = []
+    with pymupdf.open(path) as document:
+        for number in range(start, min(stop, document.page_count)):
+            text = document.load_page(number).get_text("text")
+            chunks.extend(chunk_text(text, number + 1, chunk_words, overlap_words))
+    return chunks
+
+
+def chunk_text(
+    text: str, page: int, chunk_words: int, overlap_words: int
+) -> list[PdfChunk]:
+    words = text.split()
+    step = max(chunk_words - overlap_words, 1)
+    return [
+        PdfChunk(page=page, text=" ".join(words[start : start + chunk_words]))
+        for start in range(0, max(len(words) - overlap_words, 1), step)
+        if words[start : start + chunk_words]
+    ]
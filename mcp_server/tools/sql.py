@@ -0,0 +1,302 @@
+"""query_sql: read-only SQL over a pooled engine with streamed, capped results."""
+
+import asyncio
+import csv
+import functools
+import io
+import re
+import threading
+import time
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from logging import getLogger
+from typing import TYPE_CHECKING, Any
+
+from fastmcp import FastMCP
+from fastmcp.exceptions import ToolError
+
+from src.agents_library.deadline import timeout_for
+from src.config.settings import SqlToolConfig, settings
+from src.observability.metrics import metrics
+
+if TYPE_CHECKING:
+    from sqlalchemy import Connection, Engine, TextClause
+
+logger = getLogger(__name__)
+
+TOOL_NAME = "query_sql"
+READ_ONLY_KEYWORDS = {"select", "with", "show", "describe", "desc", "explain", "values"}
+# Run on every new connection so the database itself refuses writes. Dialects not
+# listed (e.g. Databricks) depend on sql_url's user having read-only grants.
+READ_ONLY_SESSION = {
+    "sqlite": "PRAGMA query_only = ON",
+    "postgresql": "SET SESSION CHARACTERISTICS AS TRANSACTION READ ONLY",
+    "mysql": "SET SESSION TRANSACTION READ ONLY",
+    "mariadb": "SET SESSION TRANSACTION READ ONLY",
+}
+# Quoted literals and identifiers, then comments; matched together so a comment
+# marker inside a string is not taken for a comment and vice versa.
+_QUOTED_OR_COMMENT = re.compile(
+    r"(?P<quoted>'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|`[^`]*`)|--[^\n]*|/\*.*?\*/",
+    re.DOTALL,
+)
+_WRITE_KEYWORDS = re.compile(
+    r"\b(insert|update|delete|merge|upsert|drop|alter|create|truncate|grant|"
+    r"revoke|attach|detach|copy|call|exec|execute|pragma|vacuum|optimize)\b",
+    re.IGNORECASE,
+)
+
+
+class SqlQuery:
+    """Runs read-only queries on one long-lived engine and returns CSV.
+
+    The engine, and with it the connection pool, is created on first use and kept
+    for the life of the process, so calls reuse open connections; pre-ping replaces
+    connections the database dropped. Results are read from a server-side cursor in
+    batches of sql_fetch_batch_rows and reading stops at sql_max_rows rows or
+    sql_max_bytes bytes, so a huge result never reaches memory. Statements are
+    validated once and SQLAlchemy caches their compiled form.
+
+    Connections are switched to read-only where the dialect supports it (see
+    READ_ONLY_SESSION), and each query gets a statement timeout of
+    sql_timeout_seconds, capped by the request deadline.
+    """
+
+    def __init__(self, config: SqlToolConfig) -> None:
+        self.config = config
+        self._engine: Engine | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def engine(self) -> "Engine":
+        with self._lock:
+            if self._engine is None:
+                if not self.config.sql_url:
+                    raise ToolError("No database is configured")
+                self._engine = _create_engine(self.config, self.config.sql_url)
+            return self._engine
+
+    async def query(
+        self,
+        sql: str,
+        parameters: dict[str, Any] | None = None,
+        max_rows: int | None = None,
+    ) -> str:
+        limit = min(max_rows or self.config.sql_max_rows, self.config.sql_max_rows)
+        try:
+            statement = prepare(sql)
+        except ToolError:
+            metrics.inc("sql_queries_total", status="rejected")
+            raise
+        timeout = timeout_for(self.config.sql_timeout_seconds)
+        try:
+            # The statement timeout stops the query in the database; this bounds the
+            # wait for drivers that ignore it.
+            async with asyncio.timeout(timeout):
+                return await asyncio.to_thread(
+                    self._run, statement, parameters or {}, limit, timeout
+                )
+        except TimeoutError as e:
+            metrics.inc("sql_queries_total", status="timeout")
+            raise ToolError(f"Tool '{TOOL_NAME}' did not finish in time") from e
+
+    def dispose(self) -> None:
+        with self._lock:
+            if self._engine is not None:
+                self._engine.dispose()
+                self._engine = None
+
+    def _run(
+        self,
+        statement: "TextClause",
+        parameters: dict[str, Any],
+        max_rows: int,
+        timeout: float,
+    ) -> str:
+        from sqlalchemy.exc import SQLAlchemyError
+        from sqlalchemy.pool import QueuePool
+
+        started = time.perf_counter()
+        lines: list[str] = []
+        size = rows = 0
+        truncated: str | None = None
+        try:
+            with self.engine.connect() as connection, _time_limit(connection, timeout):
+                result = connection.execution_options(
+                    stream_results=True,
+                    max_row_buffer=self.config.sql_fetch_batch_rows,
+                ).execute(statement, parameters)
+                lines.append(csv_line(list(result.keys())))
+                size = len(lines[0].encode())
+                for batch in result.partitions(self.config.sql_fetch_batch_rows):
+                    for row in batch:
+                        line = csv_line(row)
+                        if rows >= max_rows:
+                            truncated = "rows"
+                        elif size + len(line.encode()) > self.config.sql_max_bytes:
+                            truncated = "bytes"
+                        if truncated:
+                            break
+                        lines.append(line)
+                        size += len(line.encode())
+                        rows += 1
+                    if truncated:
+                        break
+                result.close()
+                if isinstance(pool := self.engine.pool, QueuePool):
+                    metrics.set_gauge("sql_pool_checked_out", pool.checkedout())
+        except SQLAlchemyError as e:
+            metrics.inc("sql_queries_total", status="error")
+            raise ToolError(f"Query failed: {str(e).splitlines()[0]}") from e
+        metrics.inc("sql_queries_total", status="ok")
+        metrics.inc("sql_rows_returned_total", rows)
+        metrics.inc("sql_query_seconds_total", time.perf_counter() - started)
+        output = "".join(lines)
+        if truncated:
+            metrics.inc("sql_results_truncated_total", limit=truncated)
+            output += (
+                f"(Stopped after {rows} rows at the {truncated} limit; "
+                "filter or aggregate to see the rest.)\n"
+            )
+        return output
+
+
+@functools.lru_cache(maxsize=1024)
+def prepare(sql: str) -> "TextClause":
+    """Validate sql as a single read-only statement and return it ready to execute.
+
+    Keywords and semicolons inside quoted literals and identifiers are ignored, so
+    WHERE action = 'delete' is accepted.
+    """
+    from sqlalchemy import text
+
+    body = _QUOTED_OR_COMMENT.sub(lambda m: m["quoted"] or " ", sql)
+    body = body.strip().rstrip(";").strip()
+    code = _QUOTED_OR_COMMENT.sub(lambda m: "''" if m["quoted"] else " ", body)
+    keyword = code.split(maxsplit=1)[0].lower() if code.strip() else ""
+    if ";" in code or keyword not in READ_ONLY_KEYWORDS:
+        raise ToolError("Only a single SELECT-style statement is allowed")
+    if match := _WRITE_KEYWORDS.search(code):
+        raise ToolError(f"Statements containing {match.group(0).upper()} are refused")
+    return text(body)
+
+
+def _create_engine(config: SqlToolConfig, sql_url: str) -> "Engine":
+    from sqlalchemy import create_engine
+    from sqlalchemy.engine import make_url
+    from sqlalchemy.engine.default import DefaultDialect
+    from sqlalchemy.exc import ArgumentError, NoSuchModuleError
+    from sqlalchemy.pool import QueuePool
+
+    try:
+        url = make_url(sql_url)
+        dialect = url.get_dialect()
+        pool_options: dict[str, Any] = {}
+        # In-memory SQLite uses a pool that takes no sizing arguments.
+        if not issubclass(dialect, DefaultDialect) or issubclass(
+            dialect.get_pool_class(url), QueuePool
+        ):
+            pool_options = {
+                "pool_size": config.sql_pool_size,
+                "max_overflow": config.sql_max_overflow,
+            }
+        engine = create_engine(
+            url,
+            pool_pre_ping=config.sql_pool_pre_ping,
+            pool_recycle=config.sql_pool_recycle_seconds,
+            query_cache_size=config.sql_statement_cache_size,
+            **pool_options,
+        )
+    except (ArgumentError, NoSuchModuleError, TypeError) as e:
+        raise ToolError(f"sql_url is not a usable database URL: {e}") from e
+    _make_read_only(engine)
+    return engine
+
+
+def _make_read_only(engine: "Engine") -> None:
+    from sqlalchemy import event
+
+    statement = READ_ONLY_SESSION.get(engine.dialect.name)
+    if statement is None:
+        logger.warning(
+            f"{engine.dialect.name} connections cannot be made read-only; "
+            "query_sql relies on the database user's grants"
+        )
+        return
+
+    @event.listens_for(engine, "connect")
+    def read_only(dbapi_connection: Any, connection_record: Any) -> None:
+        _set_read_only(dbapi_connection, statement)
+
+
+def _set_read_only(dbapi_connection: Any, statement: str) -> None:
+    """Run statement on a new DB-API connection outside of any transaction.
+
+    psycopg2 and psycopg open a transaction implicitly, and the rollback the pool
+    issues when the connection is returned would undo a PostgreSQL SET made in it,
+    so autocommit is switched on for the statement where the driver has it.
+    """
+    autocommit = getattr(dbapi_connection, "autocommit", None)
+    # sqlite3 and MySQL drivers expose autocommit as an int or a method; leave them.
+    toggle = isinstance(autocommit, bool)
+    if toggle:
+        dbapi_connection.autocommit = True
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(statement)
+    finally:
+        cursor.close()
+        if toggle:
+            dbapi_connection.autocommit = autocommit
+
+
+@contextmanager
+def _time_limit(connection: "Connection", seconds: float) -> Iterator[None]:
+    """Give the statements run on connection a timeout, where the dialect has one."""
+    dialect = connection.dialect.name
+    milliseconds = max(int(seconds * 1000), 1)
+    if dialect == "sqlite":
+        # SQLite has no statement timeout; abort from its progress handler instead.
+        deadline = time.monotonic() + seconds
+        sqlite = connection.connection.driver_connection
+        assert sqlite is not None
+        sqlite.set_progress_handler(lambda: time.monotonic() > deadline, 10_000)
+        try:
+            yield
+        finally:
+            sqlite.set_progress_handler(None, 0)
+        return
+    if dialect == "postgresql":
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {milliseconds}")
+    elif dialect in ("mysql", "mariadb"):
+        connection.exec_driver_sql(f"SET SESSION max_execution_time = {milliseconds}")
+    yield
+
+
+def csv_line(values: Sequence[Any]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerow(values)
+    return buffer.getvalue()
+
+
+sql_query = SqlQuery(settings.sql_tool_config)
+
+
+def register_sql_tool(server: FastMCP) -> None:
+    if not sql_query.config.sql_url:
+        return
+
+    async def query_sql(
+        sql: str,
+        parameters: dict[str, Any] | None = None,
+        max_rows: int | None = None,
+    ) -> str:
+        """Run one read-only SQL query on the warehouse and return the rows as CSV.
+
+        Pass values as :name placeholders in sql with their values in parameters.
+        Large results are cut off after max_rows rows; aggregate or filter instead
+        of paging through them.
+        """
+        return await sql_query.query(sql, parameters, max_rows)
+
+    server.tool(name=TOOL_NAME)(query_sql)
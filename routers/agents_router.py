@@ -1,23 +1,66 @@
-import os
-from collections.abc import Callable, Coroutine
-from pathlib import Path
-from typing import Any
+import asyncio
+import json
+import uuid
+from collections.abc import AsyncIterator
+from contextlib import suppress
+from functools import partial
+from logging import getLogger
+from typing import Annotated
 
-from fastapi import APIRouter, HTTPException
+from fastapi import (
+    APIRouter,
+    Header,
+    HTTPException,
+    Request,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 
-from src.agents_library.base import BaseAgent, ChatSessionConfig
-from src.agents_library.initiator import load_agent_paths
+from src.agents_library.admission import AdmissionRejectedError, admission_controller
+from src.agents_library.base import (
+    BaseAgent,
+    ChatSessionConfig,
+    ToolEvent,
+    ToolEventCallback,
+)
+from src.agents_library.deadline import (
+    ClientDisconnectedError,
+    DeadlineExceededError,
+    cancel_on_disconnect,
+    request_deadline,
+)
+from src.agents_library.fanout import ask_agent, build_merge_query, run_fanout
 from src.agents_library.memory import (
     cleanup_expired_memory,
     get_or_create_memory,
+    keep_memory_alive,
     memory_lock,
     memory_store,
 )
-from src.agents_library.response_types import AgentRequest, AgentResponse
+from src.agents_library.registry import AgentEntry, agent_registry
+from src.agents_library.response_types import (
+    AgentRequest,
+    AgentResponse,
+    AgentSocketRequest,
+    FanoutRequest,
+    FanoutResponse,
+    FanoutResult,
+)
+from src.api_client.scheduler import Priority
 from src.config.settings import settings
+from src.observability.metrics import metrics
+from src.observability.profiling import PROFILE_ID_HEADER, request_profiler
 
+logger = getLogger(__name__)
 router = APIRouter()
 
+SOCKET_MAX_PENDING_TURNS = 16
+# Non-standard status code for requests whose client closed the connection.
+CLIENT_CLOSED_REQUEST = 499
+
 
 @router.delete("/memory/{agent_key}/{correlation_id}")
 def delete_memory(agent_key: str, correlation_id: str) -> dict[str, str]:
@@ -28,44 +71,311 @@ def delete_memory(agent_key: str, correlation_id: str) -> dict[str, str]:
         raise HTTPException(status_code=404, detail="Memory not found")
 
 
-agent_paths = load_agent_paths()
+@router.get("/admission")
+def admission_stats() -> dict[str, dict[str, int]]:
+    """Current in-flight and queued turns per agent."""
+    return admission_controller.stats()
 
 
-def get_agent_key(path_of_agent: Path) -> str:
-    return os.path.split(path_of_agent)[1]
+@router.post("/fanout", response_model=FanoutResponse)
+async def fanout_endpoint(request: FanoutRequest) -> FanoutResponse | StreamingResponse:
+    """Ask several agents concurrently; stream NDJSON results when request.stream is set."""
+    entries = [get_agent_entry(agent_key) for agent_key in request.agent_keys]
+    merge_entry = (
+        get_agent_entry(request.merge_agent_key) if request.merge_agent_key else None
+    )
+    results = run_fanout(
+        {entry.key: partial(ask_agent, entry, request.query) for entry in entries},
+        request.deadline_seconds,
+        request.first_n,
+    )
+    if request.stream:
+        return StreamingResponse(
+            _stream_fanout(request, results, merge_entry),
+            media_type="application/x-ndjson",
+        )
+    collected = [result async for result in results]
+    return FanoutResponse(
+        results=collected,
+        merged_response=await _merge_fanout(request, collected, merge_entry),
+    )
 
 
-def _create_agent_endpoint(
-    _agent_path: Path,
-) -> Callable[[AgentRequest], Coroutine[Any, Any, AgentResponse]]:
-    _agent_key = get_agent_key(agent_path)
+async def _stream_fanout(
+    request: FanoutRequest,
+    results: AsyncIterator[FanoutResult],
+    merge_entry: AgentEntry | None,
+) -> AsyncIterator[str]:
+    collected: list[FanoutResult] = []
+    async for result in results:
+        collected.append(result)
+        yield result.model_dump_json() + "\n"
+    merged = await _merge_fanout(request, collected, merge_entry)
+    if merged is not None:
+        yield json.dumps({"merged_response": merged}) + "\n"
 
-    async def agent_endpoint(request: AgentRequest) -> AgentResponse:
-        cleanup_expired_memory()
-        memory, cid = get_or_create_memory(_agent_key, request.correlation_id)
-        session_config = ChatSessionConfig(
-            bot_user_name="TestBot",
-            session_id="session_123",
-            topic_id="topic_abc",
+
+async def _merge_fanout(
+    request: FanoutRequest,
+    results: list[FanoutResult],
+    merge_entry: AgentEntry | None,
+) -> str | None:
+    if merge_entry is None or not any(result.status == "ok" for result in results):
+        return None
+    try:
+        return await ask_agent(merge_entry, build_merge_query(request.query, results))
+    except Exception:
+        logger.exception(f"Merging fan-out results with '{merge_entry.key}' failed")
+        return None
+
+
+@router.post("/{agent_key}", response_model=AgentResponse)
+async def agent_endpoint(
+    agent_key: str,
+    request: AgentRequest,
+    http_request: Request,
+    response: Response,
+    x_profile: Annotated[str | None, Header()] = None,
+) -> AgentResponse:
+    """Run one agent turn; send X-Profile: 1 to get a profile id in X-Profile-Id.
+
+    The turn is cancelled when the client disconnects (499) or its deadline passes
+    (504).
+    """
+    entry = get_agent_entry(agent_key)
+    deadline_config = settings.deadline_config
+    try:
+        async with (
+            cancel_on_disconnect(
+                http_request.is_disconnected,
+                "rest",
+                deadline_config.disconnect_poll_interval_seconds,
+            ),
+            request_deadline("rest", seconds=_deadline_seconds(request)),
+            admission_controller.admit(agent_key),
+        ):
+            if not request_profiler.wanted(x_profile):
+                return await run_agent_turn(entry, request)
+            async with request_profiler.profile(agent_key) as profile:
+                response.headers[PROFILE_ID_HEADER] = profile.profile_id
+                return await run_agent_turn(entry, request)
+    except AdmissionRejectedError as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after_seconds)},
         )
-        agent = BaseAgent(
-            settings=settings,
-            session_config=session_config,
-            memory=memory,
-            agent_folder_path=_agent_path,
+    except DeadlineExceededError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except ClientDisconnectedError as e:
+        raise HTTPException(status_code=CLIENT_CLOSED_REQUEST, detail=str(e))
+
+
+def _deadline_seconds(request: AgentRequest) -> float:
+    configured = settings.deadline_config.request_deadline_seconds
+    return min(request.deadline_seconds or configured, configured)
+
+
+@router.websocket("/ws/{agent_key}")
+async def agent_socket(
+    websocket: WebSocket, agent_key: str, correlation_id: str | None = None
+) -> None:
+    """Bind one live agent session to a WebSocket connection.
+
+    Clients send AgentSocketRequest JSON messages and may pipeline them; turns run in
+    order. For each turn the server pushes "tool" events, "delta" events with
+    streamed text and a closing "final" or "error" event, all tagged with the turn id.
+    While agents are still being discovered the connection is closed with 1013 (try
+    again later) rather than reporting the agent as unknown.
+    """
+    if not agent_registry.ready:
+        await websocket.close(code=1013, reason="Agents are still loading")
+        return
+    entry = agent_registry.get(agent_key)
+    if entry is None:
+        await websocket.close(code=1008, reason=f"Unknown agent '{agent_key}'")
+        return
+    await websocket.accept()
+    cleanup_expired_memory()
+    memory, cid = get_or_create_memory(agent_key, correlation_id)
+    agent = BaseAgent(
+        settings=settings,
+        session_config=ChatSessionConfig(
+            bot_user_name="TestBot", session_id=cid, topic_id="topic_abc"
+        ),
+        memory=memory,
+        agent_folder_path=entry.path,
+    )
+    await websocket.send_json({"type": "session", "correlation_id": cid})
+
+    turns: asyncio.Queue[AgentSocketRequest] = asyncio.Queue(SOCKET_MAX_PENDING_TURNS)
+    receiver = asyncio.create_task(_receive_socket_turns(websocket, turns))
+    worker = asyncio.create_task(_run_socket_turns(websocket, agent, turns))
+    try:
+        await asyncio.wait({receiver, worker}, return_when=asyncio.FIRST_COMPLETED)
+        if receiver.done():
+            error = receiver.exception()
+            if not isinstance(error, WebSocketDisconnect):
+                raise error or RuntimeError("WebSocket receive loop stopped")
+            logger.info(f"WebSocket for agent '{agent_key}' ({cid}) disconnected")
+        else:
+            # The worker only stops on errors outside a turn, such as failing to
+            # open the MCP session; tell the client instead of leaving it hanging.
+            error = worker.exception()
+            logger.error(
+                f"WebSocket worker for agent '{agent_key}' ({cid}) failed",
+                exc_info=error,
+            )
+            with suppress(WebSocketDisconnect, RuntimeError):
+                await websocket.send_json(
+                    {"type": "error", "status_code": 500, "detail": str(error)}
+                )
+                await websocket.close(code=1011)
+    finally:
+        receiver.cancel()
+        worker.cancel()
+        await asyncio.gather(receiver, worker, return_exceptions=True)
+        keep_memory_alive(agent_key, cid, memory)
+
+
+async def _receive_socket_turns(
+    websocket: WebSocket, turns: asyncio.Queue[AgentSocketRequest]
+) -> None:
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            raise WebSocketDisconnect(message.get("code", 1000), message.get("reason"))
+        try:
+            # Malformed JSON fails validation too, so it is reported like any other
+            # invalid turn instead of ending the session.
+            turn = AgentSocketRequest.model_validate_json(
+                message.get("text") or message.get("bytes") or ""
+            )
+        except ValidationError as e:
+            await websocket.send_json({"type": "error", "detail": str(e)})
+            continue
+        turn.id = turn.id or str(uuid.uuid4())
+        await turns.put(turn)
+
+
+async def _run_socket_turns(
+    websocket: WebSocket,
+    agent: BaseAgent,
+    turns: asyncio.Queue[AgentSocketRequest],
+) -> None:
+    agent_key = agent.agent_folder_path.name
+    async with agent.persistent_tools():
+        while True:
+            turn = await turns.get()
+            agent.on_tool_event = _tool_event_sender(websocket, turn.id)
+            try:
+                async with (
+                    request_deadline(
+                        "websocket",
+                        seconds=settings.deadline_config.request_deadline_seconds,
+                    ),
+                    admission_controller.admit(agent_key),
+                ):
+                    await _stream_socket_turn(websocket, agent, turn)
+            except asyncio.CancelledError:
+                # The socket closed while this turn was running.
+                metrics.inc(
+                    "request_cancellations_total",
+                    reason="disconnect",
+                    source="websocket",
+                )
+                raise
+            except AdmissionRejectedError as e:
+                await websocket.send_json(
+                    {
+                        "type": "error",
+                        "id": turn.id,
+                        "status_code": e.status_code,
+                        "detail": str(e),
+                        "retry_after": e.retry_after_seconds,
+                    }
+                )
+            except DeadlineExceededError as e:
+                await websocket.send_json(
+                    {
+                        "type": "error",
+                        "id": turn.id,
+                        "status_code": 504,
+                        "detail": str(e),
+                    }
+                )
+            except Exception as e:
+                logger.exception(f"WebSocket turn {turn.id} failed")
+                await websocket.send_json(
+                    {
+                        "type": "error",
+                        "id": turn.id,
+                        "status_code": 500,
+                        "detail": str(e),
+                    }
+                )
+            keep_memory_alive(agent_key, agent.session_config.session_id, agent.memory)
+
+
+async def _stream_socket_turn(
+    websocket: WebSocket, agent: BaseAgent, turn: AgentSocketRequest
+) -> None:
+    parts: list[str] = []
+    async for text in agent.stream_response(turn.query):
+        parts.append(text)
+        await websocket.send_json({"type": "delta", "id": turn.id, "text": text})
+    await websocket.send_json(
+        {"type": "final", "id": turn.id, "response": "".join(parts)}
+    )
+
+
+def _tool_event_sender(websocket: WebSocket, turn_id: str | None) -> ToolEventCallback:
+    async def send(event: ToolEvent) -> None:
+        await websocket.send_json(
+            {
+                "type": "tool",
+                "id": turn_id,
+                "tool": event.tool_name,
+                "tool_call_id": event.tool_call_id,
+                "status": event.status,
+                "message": event.message,
+            }
         )
-        response = await agent.prepare_response(request.query)
-        return AgentResponse(response=response, correlation_id=cid)
 
-    return agent_endpoint
+    return send
 
 
-for agent_path in agent_paths:
-    agent_key = get_agent_key(agent_path)
-    route = f"/{agent_key}"
-    router.add_api_route(
-        route,
-        _create_agent_endpoint(agent_path),
-        methods=["POST"],
-        response_model=AgentResponse,
+def get_agent_entry(agent_key: str) -> AgentEntry:
+    """Resolve a registered agent or answer 503 while discovery runs, 404 if unknown."""
+    if not agent_registry.ready:
+        raise HTTPException(
+            status_code=503,
+            detail="Agents are still loading",
+            headers={"Retry-After": "1"},
+        )
+    entry = agent_registry.get(agent_key)
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"Unknown agent '{agent_key}'")
+    return entry
+
+
+async def run_agent_turn(
+    entry: AgentEntry, request: AgentRequest, priority: Priority = "interactive"
+) -> AgentResponse:
+    """Run one turn of an agent with the conversation memory of request.correlation_id."""
+    cleanup_expired_memory()
+    memory, cid = get_or_create_memory(entry.key, request.correlation_id)
+    session_config = ChatSessionConfig(
+        bot_user_name="TestBot",
+        session_id=cid,
+        topic_id="topic_abc",
+        priority=priority,
+    )
+    agent = BaseAgent(
+        settings=settings,
+        session_config=session_config,
+        memory=memory,
+        agent_folder_path=entry.path,
     )
+    response = await agent.prepare_response(request.query)
+    return AgentResponse(response=response, correlation_id=cid)
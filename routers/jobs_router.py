@@ -0,0 +1,72 @@
+import uuid
+from functools import partial
+
+from fastapi import APIRouter, HTTPException
+
+from routers.agents_router import get_agent_entry, run_agent_turn
+from src.agents_library.admission import admission_controller
+from src.agents_library.deadline import request_deadline
+from src.agents_library.jobs import (
+    Job,
+    JobCallbackNotAllowedError,
+    JobQueueFullError,
+    job_manager,
+)
+from src.agents_library.registry import AgentEntry
+from src.agents_library.response_types import AgentRequest, JobRequest, JobStatus
+from src.config.settings import settings
+
+router = APIRouter()
+
+
+@router.post("/{agent_key}", response_model=JobStatus, status_code=202)
+def submit_job(agent_key: str, request: JobRequest) -> JobStatus:
+    """Queue an agent query and return its job id without waiting for the answer."""
+    entry = get_agent_entry(agent_key)
+    correlation_id = request.correlation_id or str(uuid.uuid4())
+    agent_request = AgentRequest(query=request.query, correlation_id=correlation_id)
+    try:
+        job = job_manager.submit(
+            agent_key,
+            partial(_run_job, entry, agent_request),
+            correlation_id=correlation_id,
+            callback_url=str(request.callback_url) if request.callback_url else None,
+        )
+    except JobQueueFullError as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(settings.admission_config.retry_after_seconds)},
+        )
+    except JobCallbackNotAllowedError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return job.status()
+
+
+@router.get("/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str, wait: float = 0) -> JobStatus:
+    """Job status and result; wait > 0 long-polls until the job finishes."""
+    wait = min(max(wait, 0), settings.job_config.job_max_wait_seconds)
+    return _found(await job_manager.wait(job_id, wait)).status()
+
+
+@router.delete("/{job_id}", response_model=JobStatus)
+def cancel_job(job_id: str) -> JobStatus:
+    return _found(job_manager.cancel(job_id)).status()
+
+
+async def _run_job(entry: AgentEntry, request: AgentRequest) -> str:
+    async with (
+        request_deadline(
+            "job", seconds=settings.deadline_config.request_deadline_seconds
+        ),
+        admission_controller.admit(entry.key),
+    ):
+        response = await run_agent_turn(entry, request, priority="batch")
+    return response.response
+
+
+def _found(job: Job | None) -> Job:
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job
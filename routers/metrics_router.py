@@ -0,0 +1,14 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from src.api_client.http_pool import llm_http_pool
+from src.observability.metrics import metrics
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def export_metrics() -> str:
+    """Expose process metrics in the Prometheus text format."""
+    llm_http_pool.publish_stats()
+    return metrics.render_prometheus()
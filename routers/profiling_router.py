@@ -0,0 +1,43 @@
+import secrets
+from typing import Annotated, Any
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+
+from src.agents_library.response_types import ProfilingToggle
+from src.config.settings import settings
+from src.observability.profiling import request_profiler
+
+
+def require_admin_token(
+    x_admin_token: Annotated[str | None, Header()] = None,
+) -> None:
+    """Profiles expose stack traces and the toggle slows every turn; admins only."""
+    expected = settings.profiling_config.profiling_admin_token
+    if expected is None:
+        raise HTTPException(status_code=403, detail="Profiling endpoints are disabled")
+    if x_admin_token is None or not secrets.compare_digest(x_admin_token, expected):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+router = APIRouter(dependencies=[Depends(require_admin_token)])
+
+
+@router.put("/toggle", response_model=ProfilingToggle)
+def toggle_profiling(toggle: ProfilingToggle) -> ProfilingToggle:
+    """Profile every agent turn while enabled, not only those sending X-Profile."""
+    request_profiler.enabled = toggle.enabled
+    return ProfilingToggle(enabled=request_profiler.enabled)
+
+
+@router.get("")
+def list_profiles() -> list[str]:
+    return request_profiler.profile_ids()
+
+
+@router.get("/{profile_id}")
+def get_profile(profile_id: str) -> dict[str, Any]:
+    """Samples per stack, function and task, plus event-loop blocks with stack traces."""
+    profile = request_profiler.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return profile
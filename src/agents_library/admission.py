@@ -0,0 +1,145 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from logging import getLogger
+from typing import Literal
+
+from src.config.settings import AdmissionConfig, settings
+from src.observability.metrics import metrics
+
+logger = getLogger(__name__)
+
+RejectionReason = Literal["queue_full", "queue_timeout"]
+
+
+class AdmissionRejectedError(Exception):
+    """Raised when an agent turn cannot be admitted in time."""
+
+    def __init__(
+        self, agent_key: str, reason: RejectionReason, retry_after_seconds: int
+    ) -> None:
+        super().__init__(f"Agent '{agent_key}' is saturated ({reason})")
+        self.agent_key = agent_key
+        self.reason = reason
+        self.retry_after_seconds = retry_after_seconds
+
+    @property
+    def status_code(self) -> int:
+        """429 when the queue is full, 503 when the queue wait deadline passed."""
+        return 429 if self.reason == "queue_full" else 503
+
+
+@dataclass
+class _AgentGate:
+    limit: int
+    semaphore: asyncio.Semaphore
+    waiting: int = 0
+    in_flight: int = 0
+
+
+@dataclass
+class AdmissionController:
+    """Bounds concurrent agent turns globally and per agent with a bounded wait queue.
+
+    A request first waits for a per-agent slot and then for a global slot. Requests
+    that would wait while the queue already holds max_queue_size entries are rejected
+    right away; requests that wait longer than queue_timeout_seconds are rejected too.
+    """
+
+    config: AdmissionConfig
+    _gates: dict[str, _AgentGate] = field(default_factory=dict)
+    _global: asyncio.Semaphore | None = None
+    _waiting_total: int = 0
+
+    def configure_agent(self, agent_key: str, max_in_flight: int | None) -> None:
+        """Set the per-agent limit, falling back to the configured default."""
+        limit = max_in_flight or self.config.per_agent_max_in_flight
+        self._gates[agent_key] = _AgentGate(
+            limit=limit, semaphore=asyncio.Semaphore(limit)
+        )
+
+    @asynccontextmanager
+    async def admit(self, agent_key: str) -> AsyncIterator[None]:
+        """Hold a slot for agent_key for the duration of the context."""
+        gate = self._gate(agent_key)
+        global_semaphore = self._global_semaphore()
+        must_wait = gate.semaphore.locked() or global_semaphore.locked()
+        if must_wait and self._waiting_total >= self.config.max_queue_size:
+            raise self._reject(agent_key, "queue_full")
+
+        await self._wait_for_slot(agent_key, gate, global_semaphore)
+        gate.in_flight += 1
+        metrics.inc("agent_admission_admitted_total", agent=agent_key)
+        metrics.set_gauge("agent_admission_in_flight", gate.in_flight, agent=agent_key)
+        try:
+            yield
+        finally:
+            gate.in_flight -= 1
+            global_semaphore.release()
+            gate.semaphore.release()
+            metrics.set_gauge(
+                "agent_admission_in_flight", gate.in_flight, agent=agent_key
+            )
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Return current in-flight, queued and limit values per agent."""
+        return {
+            agent_key: {
+                "in_flight": gate.in_flight,
+                "queued": gate.waiting,
+                "limit": gate.limit,
+            }
+            for agent_key, gate in self._gates.items()
+        }
+
+    async def _wait_for_slot(
+        self,
+        agent_key: str,
+        gate: _AgentGate,
+        global_semaphore: asyncio.Semaphore,
+    ) -> None:
+        self._set_waiting(agent_key, gate, +1)
+        holds_agent_slot = False
+        try:
+            async with asyncio.timeout(self.config.queue_timeout_seconds):
+                await gate.semaphore.acquire()
+                holds_agent_slot = True
+                await global_semaphore.acquire()
+        except TimeoutError:
+            if holds_agent_slot:
+                gate.semaphore.release()
+            raise self._reject(agent_key, "queue_timeout") from None
+        except BaseException:
+            if holds_agent_slot:
+                gate.semaphore.release()
+            raise
+        finally:
+            self._set_waiting(agent_key, gate, -1)
+
+    def _set_waiting(self, agent_key: str, gate: _AgentGate, delta: int) -> None:
+        gate.waiting += delta
+        self._waiting_total += delta
+        metrics.set_gauge("agent_admission_queue_depth", gate.waiting, agent=agent_key)
+
+    def _reject(
+        self, agent_key: str, reason: RejectionReason
+    ) -> AdmissionRejectedError:
+        logger.warning(f"Rejecting request for agent '{agent_key}': {reason}")
+        metrics.inc("agent_admission_rejected_total", agent=agent_key, reason=reason)
+        return AdmissionRejectedError(
+            agent_key, reason, self.config.retry_after_seconds
+        )
+
+    def _gate(self, agent_key: str) -> _AgentGate:
+        if agent_key not in self._gates:
+            self.configure_agent(agent_key, None)
+        return self._gates[agent_key]
+
+    def _global_semaphore(self) -> asyncio.Semaphore:
+        if self._global is None:
+            self._global = asyncio.Semaphore(self.config.global_max_in_flight)
+        return self._global
+
+
+admission_controller = AdmissionController(settings.admission_config)
@@ -0,0 +1,54 @@
+from collections import OrderedDict
+
+from src.agents_library.bm25 import BM25Index
+from src.agents_library.messages import count_tokens
+
+ARCHIVE_CHUNK_TOKENS = 120
+ARCHIVE_MAX_SNIPPETS = 500
+RECALL_TOP_K = 8
+
+
+class ConversationArchive:
+    """Evicted conversation content of one session, searchable with BM25.
+
+    Turns and tool results that no longer fit the live memory are split into chunks
+    of about ARCHIVE_CHUNK_TOKENS tokens and indexed locally. recall() returns the
+    snippets most relevant to a query within a token budget. The oldest snippets are
+    dropped once ARCHIVE_MAX_SNIPPETS is reached.
+    """
+
+    def __init__(self, max_snippets: int = ARCHIVE_MAX_SNIPPETS) -> None:
+        self.max_snippets = max_snippets
+        self._index = BM25Index()
+        self._snippets: OrderedDict[str, str] = OrderedDict()
+        self._next_id = 0
+
+    def add(self, label: str, text: str | None) -> None:
+        """Archive text, prefixed with a label such as "user" or "tool search_engine"."""
+        words = (text or "").split()
+        for start in range(0, len(words), ARCHIVE_CHUNK_TOKENS):
+            snippet = f"[{label}] " + " ".join(
+                words[start : start + ARCHIVE_CHUNK_TOKENS]
+            )
+            snippet_id = str(self._next_id)
+            self._next_id += 1
+            self._snippets[snippet_id] = snippet
+            self._index.add(snippet_id, snippet)
+        while len(self._snippets) > self.max_snippets:
+            oldest_id, _ = self._snippets.popitem(last=False)
+            self._index.remove(oldest_id)
+
+    def recall(self, query: str, token_budget: int) -> list[str]:
+        """Most relevant snippets for query, in archive order, within token_budget."""
+        selected: list[str] = []
+        used = 0
+        for snippet_id, _ in self._index.search(query, top_k=RECALL_TOP_K):
+            tokens = count_tokens(self._snippets[snippet_id])
+            if used + tokens > token_budget:
+                continue
+            selected.append(snippet_id)
+            used += tokens
+        return [self._snippets[i] for i in sorted(selected, key=int)]
+
+    def __len__(self) -> int:
+        return len(self._snippets)
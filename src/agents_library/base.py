@@ -1,23 +1,43 @@
+from __future__ import annotations
+
 import asyncio
 import importlib.util
 import json
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import AsyncExitStack, asynccontextmanager
 from dataclasses import dataclass
 from logging import getLogger
 from pathlib import Path
-from typing import Any, cast
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Literal, cast
 
 from async_lru import alru_cache
-from litellm import (  # type: ignore[attr-defined]
-    BadRequestError,
-    ChatCompletionToolParam,
-)
 
 from src.agents_library import build_agent_settings
 from src.agents_library.memory import ConversationMemory
+from src.agents_library.messages import ChatMessage, ToolCall
 from src.agents_library.response_types import BaseChatResponse
+from src.agents_library.result_encoding import encode_tool_result
+from src.agents_library.streaming import (
+    StreamedMessageAssembler,
+    TextFieldStreamParser,
+)
+from src.agents_library.tool_results import (
+    READ_TOOL_RESULT_TOOL,
+    READ_TOOL_RESULT_TOOL_NAME,
+    TOOL_RESULT_PAGE_CHARS,
+)
+from src.agents_library.tool_selection import select_tools
 from src.api_client.chat_client import ChatClient
+from src.api_client.scheduler import Priority
 from src.config.settings import Settings
+from src.mcp_client.catalog import tool_catalog
 from src.mcp_client.client import MCPClient
+from src.observability.metrics import metrics
+
+if TYPE_CHECKING:
+    from litellm import ChatCompletionToolParam
+    from mcp.shared.session import ProgressFnT
 
 logger = getLogger(__name__)
 
@@ -27,6 +47,21 @@ class ChatSessionConfig:
     bot_user_name: str
     session_id: str
     topic_id: str
+    priority: Priority = "interactive"
+
+
+ToolEventStatus = Literal["started", "progress", "finished"]
+
+
+@dataclass
+class ToolEvent:
+    tool_call_id: str
+    tool_name: str
+    status: ToolEventStatus
+    message: str | None = None
+
+
+ToolEventCallback = Callable[[ToolEvent], Awaitable[None]]
 
 
 class BaseAgent:
@@ -55,23 +90,42 @@ class BaseAgent:
         self.session_config = session_config
         self.memory = memory
         self._cached_tools: list[ChatCompletionToolParam] | None = None
-        self._client = ChatClient(self.agent_settings)
+        self._client = ChatClient(
+            self.agent_settings,
+            priority=session_config.priority,
+            fairness_key=session_config.session_id,
+        )
+        self._mcp_client: MCPClient | None = None
+        self._prompt_template: str | None = None
+        self._replacement_module: ModuleType | None = None
+        self._replacement_module_loaded = False
+        self.on_tool_event: ToolEventCallback | None = None
+
+    async def warm_up(self) -> None:
+        """Pay the first-turn setup costs ahead of the first message.
+
+        Imports the LLM client library, lists the MCP tools (cached by get_tools) and
+        builds the system prompt concurrently. Meant to run as a background task while
+        a chat greets the user.
+        """
+        await asyncio.gather(self._client.warm_up(), self.get_system_prompt())
 
-    async def get_system_prompt(self) -> str:
+    async def get_system_prompt(
+        self, tools: list[ChatCompletionToolParam] | None = None
+    ) -> str:
         """Generate the system prompt for the agent by loading system_prompt.md and applying replacements.
 
         Then ensure the '## AVAILABLE TOOLS:' section contains the current tool descriptions. If the section
-        does not exist and tools are available, append it to the end of the prompt.
+        does not exist and tools are available, append it to the end of the prompt. tools defaults to all of
+        the agent's tools.
         """
+        if tools is None:
+            tools = await self.get_tools()
         tool_description_list = [
             f"* {tool["function"]["name"]}: {tool["function"]["description"].split("\n")[0]}"
-            for tool in await self.get_tools()
+            for tool in tools
         ]
-        prompt_path = self.agent_folder_path / "system_prompt.md"
-        if not prompt_path.exists():
-            raise FileNotFoundError(f"system_prompt.md not found at: {prompt_path}")
-        content = prompt_path.read_text(encoding="utf-8")
-        content = self._replace_variables_in_prompt(content)
+        content = self._replace_variables_in_prompt(self._load_prompt_template())
 
         if tool_description_list:
             section_header = "## AVAILABLE TOOLS:"
@@ -108,12 +162,8 @@ class BaseAgent:
         if self.agent_settings.agent_config.my_mcp_tools is None:
             return []
 
-        async with MCPClient() as mcp_client:
-            all_mcp_tools: list[
-                ChatCompletionToolParam
-            ] = await mcp_client.get_openai_tools()
-
         allowed = set(self.agent_settings.agent_config.my_mcp_tools or [])
+        all_mcp_tools = await tool_catalog.get(required=allowed)
         return [t for t in all_mcp_tools if t["function"]["name"] in allowed]
 
     @alru_cache
@@ -162,23 +212,143 @@ class BaseAgent:
         logger.info("Initial call to model via LiteLLM")
         await self._call_llm(tool_choice="auto", response_format=response_format)
         assistant_message = self.memory.messages[-1]
-        if assistant_message.get("tool_calls"):
+        if assistant_message.tool_calls:
             await self._add_tool_results_to_memory(assistant_message)
             logger.info("Final call to model after tool calls")
             await self._call_llm(tool_choice="none", response_format=response_format)
 
         output = response_format.model_validate_json(
-            cast(str, self.memory.messages[-1].get("content"))
+            cast(str, self.memory.messages[-1].content)
         )
         return output.text_response
 
+    async def stream_response(
+        self, message: str, response_format: type[BaseChatResponse] = BaseChatResponse
+    ) -> AsyncIterator[str]:
+        """Run a turn like prepare_response, yielding text_response as it is generated.
+
+        The structured JSON answer is parsed incrementally, so only the decoded
+        text_response characters are yielded. Each tool call is started as soon as
+        its arguments are fully streamed, while the model may still be generating
+        later tool calls. The complete answer is validated against response_format
+        once the final call has finished.
+        """
+        self.memory.add_user(message)
+        logger.info("Initial streamed call to model via LiteLLM")
+        parser = TextFieldStreamParser()
+        async with AsyncExitStack() as stack:
+            runner = _ToolCallRunner(self, stack)
+            async for text in self._stream_llm(
+                tool_choice="auto",
+                response_format=response_format,
+                parser=parser,
+                on_tool_call_ready=runner.start,
+            ):
+                yield text
+            assistant_message = self.memory.messages[-1]
+            if assistant_message.tool_calls:
+                results = await runner.results(assistant_message.tool_calls)
+                self._store_tool_results(assistant_message.tool_calls, results)
+        if assistant_message.tool_calls:
+            logger.info("Final streamed call to model after tool calls")
+            parser = TextFieldStreamParser()
+            async for text in self._stream_llm(
+                tool_choice="none",
+                response_format=response_format,
+                parser=parser,
+                on_tool_call_ready=None,
+            ):
+                yield text
+        parser.finish(response_format)
+
+    async def _stream_llm(
+        self,
+        *,
+        tool_choice: Any,
+        response_format: type[BaseChatResponse],
+        parser: TextFieldStreamParser,
+        on_tool_call_ready: Callable[[int, ToolCall], Awaitable[None]] | None,
+    ) -> AsyncIterator[str]:
+        assembler = StreamedMessageAssembler()
+        async for chunk in self._open_stream(tool_choice, response_format):
+            text = parser.feed(assembler.add(chunk))
+            if text:
+                yield text
+            if on_tool_call_ready is not None:
+                for index, tool_call in assembler.pop_ready_tool_calls():
+                    await on_tool_call_ready(index, tool_call)
+        self.memory.add_assistant(assembler.message())
+
+    async def _open_stream(
+        self, tool_choice: Any, response_format: type[BaseChatResponse]
+    ) -> AsyncIterator[Any]:
+        """Yield streamed chunks, shrinking memory and retrying once on BadRequest."""
+        from litellm import BadRequestError  # type: ignore[attr-defined]
+
+        mcp_tools = await self._relevant_tools()
+        tools = self._tools_for_call(mcp_tools)
+        system_prompt = await self.get_system_prompt(mcp_tools)
+        chunks = self._client.stream_chat(
+            self.memory.build_messages(system_prompt),
+            tools=tools,
+            tool_choice=tool_choice,
+            response_format=response_format,
+        )
+        try:
+            first_chunk = await anext(chunks)
+        except BadRequestError:
+            logger.exception("LLM call failed; shrinking memory and retrying")
+            self.memory.shrink_messages_to_fit_token_limit(True)
+            chunks = self._client.stream_chat(
+                self.memory.build_messages(system_prompt),
+                tools=tools,
+                tool_choice=tool_choice,
+                response_format=response_format,
+            )
+            first_chunk = await anext(chunks)
+        except StopAsyncIteration:
+            return
+        yield first_chunk
+        async for chunk in chunks:
+            yield chunk
+
+    async def _relevant_tools(self) -> list[ChatCompletionToolParam]:
+        """Return the agent's MCP tools, narrowed to the best matches if configured."""
+        tools = await self.get_tools()
+        agent_config = self.agent_settings.agent_config
+        if agent_config.tool_selection_top_k is None:
+            return tools
+        selected, tokens_saved = select_tools(
+            tools,
+            self.memory.messages,
+            top_k=agent_config.tool_selection_top_k,
+            pinned=agent_config.pinned_mcp_tools or (),
+        )
+        metrics.inc(
+            "agent_tool_selection_tokens_saved_total",
+            tokens_saved,
+            agent=self.agent_folder_path.name,
+        )
+        return selected
+
+    def _tools_for_call(
+        self, mcp_tools: list[ChatCompletionToolParam]
+    ) -> list[ChatCompletionToolParam]:
+        """Return the MCP tools plus local tools that apply to this session."""
+        if self.memory.tool_results:
+            return [*mcp_tools, cast("ChatCompletionToolParam", READ_TOOL_RESULT_TOOL)]
+        return mcp_tools
+
     async def _call_llm(
         self, *, tool_choice: Any, response_format: type[BaseChatResponse]
     ) -> None:
-        tools = await self.get_tools()
-        system_prompt = await self.get_system_prompt()
+        from litellm import BadRequestError  # type: ignore[attr-defined]
+
+        mcp_tools = await self._relevant_tools()
+        tools = self._tools_for_call(mcp_tools)
+        system_prompt = await self.get_system_prompt(mcp_tools)
         try:
-            response = self._client.chat(
+            response = await self._client.chat(
                 self.memory.build_messages(system_prompt),
                 tools=tools,
                 tool_choice=tool_choice,
@@ -187,7 +357,7 @@ class BaseAgent:
         except BadRequestError:
             logger.exception("LLM call failed; shrinking memory and retrying")
             self.memory.shrink_messages_to_fit_token_limit(True)
-            response = self._client.chat(
+            response = await self._client.chat(
                 self.memory.build_messages(system_prompt),
                 tools=tools,
                 tool_choice=tool_choice,
@@ -195,65 +365,127 @@ class BaseAgent:
             )
 
         msg = response.choices[0].message
-        assistant_dict: dict[str, Any] = {
-            "role": "assistant",
-            "content": getattr(msg, "content", None),
-        }
         tool_calls = getattr(msg, "tool_calls", None)
-        if tool_calls:
-            assistant_dict["tool_calls"] = []
-            for tc in tool_calls:
-                fn = getattr(tc, "function", None)
-                assistant_dict["tool_calls"].append(
-                    {
-                        "id": getattr(tc, "id", None),
-                        "type": getattr(tc, "type", "function"),
-                        "function": {
-                            "name": getattr(fn, "name", None),
-                            "arguments": getattr(fn, "arguments", None),
-                        },
-                    }
+        self.memory.add_assistant(
+            ChatMessage(
+                role="assistant",
+                content=getattr(msg, "content", None),
+                tool_calls=tuple(
+                    ToolCall(
+                        id=getattr(tc, "id", None) or "",
+                        name=getattr(tc.function, "name", None) or "",
+                        arguments=getattr(tc.function, "arguments", None) or "{}",
+                    )
+                    for tc in tool_calls
                 )
-        self.memory.add_assistant(assistant_dict)
+                if tool_calls
+                else None,
+            )
+        )
+
+    async def _add_tool_results_to_memory(self, assistant_message: ChatMessage) -> None:
+        tool_calls = assistant_message.tool_calls or ()
+        async with AsyncExitStack() as stack:
+            results = await _ToolCallRunner(self, stack).results(tool_calls)
+        self._store_tool_results(tool_calls, results)
 
-    async def _add_tool_results_to_memory(
-        self, assistant_message: dict[str, Any]
+    def _store_tool_results(
+        self, tool_calls: tuple[ToolCall, ...], results: list[str]
     ) -> None:
-        tool_calls = assistant_message.get("tool_calls") or []
-        tool_call_list = []
-        tool_call_id_list = []
-        async with MCPClient() as mcp_client:
-            for tool_call in tool_calls:
-                fn = tool_call.get("function") or {}
-                name = fn.get("name")
-                assert name
-                arguments = fn.get("arguments") or "{}"
-                try:
-                    args_dict = (
-                        json.loads(arguments)
-                        if isinstance(arguments, str)
-                        else arguments
-                    )
-                except json.JSONDecodeError:
-                    args_dict = {}
-                logger.info(f"Calling tool: {name} with args: {args_dict}")
-                tool_call_list.append(mcp_client.call(name, args=args_dict))
-                tool_call_id_list.append(tool_call.get("id"))
-
-            for result, tool_call_id in zip(
-                await asyncio.gather(*tool_call_list), tool_call_id_list
-            ):
-                # logger.info(f"Tool call result: {result}")
-                self.memory.add_tool_result(tool_call_id or "", result=str(result))
+        for result, tool_call in zip(results, tool_calls):
+            if tool_call.name == READ_TOOL_RESULT_TOOL_NAME:
+                content = result
+            else:
+                encoded = encode_tool_result(tool_call.name, str(result))
+                content = self.memory.tool_results.spill(
+                    tool_call.id, tool_call.name, encoded.text, encoded.preview
+                )
+            self.memory.add_tool_result(tool_call.id, result=content)
 
-    def _replace_variables_in_prompt(self, content: str) -> str:
-        """Replace variables in the prompt based on agent_config.replace_variables.
+    async def _run_tool(self, tool_call: ToolCall, call: Awaitable[str]) -> str:
+        """Await one tool call and report its start and end to on_tool_event."""
+        await self._emit_tool_event(tool_call, "started")
+        result = await call
+        await self._emit_tool_event(tool_call, "finished")
+        return result
 
-        Loads variables_to_replace_in_prompt from <agent_folder_path>/replacement_method.py if available.
-        If a replace_variables value is "...", substitute from variables_to_replace_in_prompt.
-        Otherwise, use the literal value from agent_config.
+    async def _emit_tool_event(
+        self, tool_call: ToolCall, status: ToolEventStatus, message: str | None = None
+    ) -> None:
+        if self.on_tool_event is not None:
+            await self.on_tool_event(
+                ToolEvent(
+                    tool_call_id=tool_call.id,
+                    tool_name=tool_call.name,
+                    status=status,
+                    message=message,
+                )
+            )
+
+    def _progress_callback(self, tool_call: ToolCall) -> ProgressFnT | None:
+        """Forward MCP progress notifications of a tool call as "progress" events."""
+        if self.on_tool_event is None:
+            return None
+
+        async def forward(
+            progress: float, total: float | None, message: str | None
+        ) -> None:
+            await self._emit_tool_event(tool_call, "progress", message)
+
+        return forward
+
+    @asynccontextmanager
+    async def persistent_tools(self) -> AsyncIterator[None]:
+        """Keep one MCP session open for all turns run inside this context.
+
+        Enter and leave it from the same task. Agents without my_mcp_tools skip it.
         """
-        dynamic_variables: dict[str, Any] = {}
+        if self.agent_settings.agent_config.my_mcp_tools is None:
+            yield
+            return
+        async with MCPClient() as mcp_client:
+            self._mcp_client = mcp_client
+            try:
+                yield
+            finally:
+                self._mcp_client = None
+
+    @asynccontextmanager
+    async def _mcp_session(self) -> AsyncIterator[MCPClient]:
+        if self._mcp_client is not None:
+            yield self._mcp_client
+            return
+        async with MCPClient() as mcp_client:
+            yield mcp_client
+
+    async def _read_stored_tool_result(self, args: dict[str, Any]) -> str:
+        # Models often send null for optional arguments; treat it as omitted.
+        offset = args.get("offset")
+        length = args.get("length")
+        try:
+            offset = 0 if offset is None else int(offset)
+            length = TOOL_RESULT_PAGE_CHARS if length is None else int(length)
+        except (TypeError, ValueError):
+            return (
+                "offset and length must be whole numbers, got "
+                f"offset={args.get('offset')!r}, length={args.get('length')!r}."
+            )
+        return self.memory.tool_results.read(
+            str(args.get("result_id", "")), offset=offset, length=length
+        )
+
+    def _load_prompt_template(self) -> str:
+        if self._prompt_template is None:
+            prompt_path = self.agent_folder_path / "system_prompt.md"
+            if not prompt_path.exists():
+                raise FileNotFoundError(f"system_prompt.md not found at: {prompt_path}")
+            self._prompt_template = prompt_path.read_text(encoding="utf-8")
+        return self._prompt_template
+
+    def _load_replacement_module(self) -> ModuleType | None:
+        """Execute replacement_method.py once per agent instead of on every prompt."""
+        if self._replacement_module_loaded:
+            return self._replacement_module
         try:
             module_name = f"agent_replacement_method_{hash(self.agent_folder_path)}"
             spec = importlib.util.spec_from_file_location(  # use explicit util
@@ -262,13 +494,25 @@ class BaseAgent:
             if spec and spec.loader:
                 module = importlib.util.module_from_spec(spec)  # use explicit util
                 spec.loader.exec_module(module)
-                variables_to_replace_in_prompt_func = getattr(
-                    module, "variables_to_replace_in_prompt", None
-                )
-                if callable(variables_to_replace_in_prompt_func):
-                    dynamic_variables = variables_to_replace_in_prompt_func(self) or {}
+                self._replacement_module = module
         except (FileNotFoundError, ImportError):
             pass
+        self._replacement_module_loaded = True
+        return self._replacement_module
+
+    def _replace_variables_in_prompt(self, content: str) -> str:
+        """Replace variables in the prompt based on agent_config.replace_variables.
+
+        Loads variables_to_replace_in_prompt from <agent_folder_path>/replacement_method.py if available.
+        If a replace_variables value is "...", substitute from variables_to_replace_in_prompt.
+        Otherwise, use the literal value from agent_config.
+        """
+        dynamic_variables: dict[str, Any] = {}
+        variables_to_replace_in_prompt_func = getattr(
+            self._load_replacement_module(), "variables_to_replace_in_prompt", None
+        )
+        if callable(variables_to_replace_in_prompt_func):
+            dynamic_variables = variables_to_replace_in_prompt_func(self) or {}
 
         replace_vars = (
             getattr(self.agent_settings.agent_config, "replace_variables", None) or {}
@@ -286,3 +530,57 @@ class BaseAgent:
             content = content.replace(f"{{{key}}}", str(final_val))
 
         return content
+
+
+class _ToolCallRunner:
+    """Start an agent's tool calls as tasks and collect their results in call order.
+
+    Calls can be started one by one while a response is still streaming; results()
+    starts whatever is left and waits for all of them. The MCP session is opened on
+    the first MCP tool call and closed with the exit stack.
+    """
+
+    def __init__(self, agent: BaseAgent, stack: AsyncExitStack) -> None:
+        self._agent = agent
+        self._stack = stack
+        self._mcp_client: MCPClient | None = None
+        self._tasks: dict[int, asyncio.Task[str]] = {}
+
+    async def start(self, index: int, tool_call: ToolCall) -> None:
+        if index in self._tasks:
+            return
+        assert tool_call.name
+        try:
+            args_dict = json.loads(tool_call.arguments)
+        except json.JSONDecodeError:
+            args_dict = {}
+        logger.info(f"Calling tool: {tool_call.name} with args: {args_dict}")
+        if tool_call.name == READ_TOOL_RESULT_TOOL_NAME:
+            call = self._agent._read_stored_tool_result(args_dict)
+        else:
+            mcp_client = await self._get_mcp_client()
+            call = mcp_client.call(
+                tool_call.name,
+                args=args_dict,
+                progress_callback=self._agent._progress_callback(tool_call),
+            )
+        self._tasks[index] = asyncio.create_task(self._agent._run_tool(tool_call, call))
+
+    async def results(self, tool_calls: tuple[ToolCall, ...]) -> list[str]:
+        for index, tool_call in enumerate(tool_calls):
+            await self.start(index, tool_call)
+        return list(
+            await asyncio.gather(*(self._tasks[i] for i in range(len(tool_calls))))
+        )
+
+    async def _get_mcp_client(self) -> MCPClient:
+        if self._mcp_client is None:
+            self._mcp_client = await self._stack.enter_async_context(
+                self._agent._mcp_session()
+            )
+            self._stack.callback(self._cancel_pending)
+        return self._mcp_client
+
+    def _cancel_pending(self) -> None:
+        for task in self._tasks.values():
+            task.cancel()
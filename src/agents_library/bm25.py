@@ -0,0 +1,76 @@
+import heapq
+import math
+import re
+from collections import Counter
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+_CAMEL_CASE_BOUNDARY = re.compile(r"([a-z0-9])([A-Z])")
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase alphanumeric terms; snake_case and camelCase identifiers are split."""
+    return _TOKEN_PATTERN.findall(_CAMEL_CASE_BOUNDARY.sub(r"\1 \2", text).lower())
+
+
+class BM25Index:
+    """Incremental in-memory inverted index ranked with Okapi BM25.
+
+    Documents can be added and removed at any time; term statistics are kept up to
+    date so a search never needs a rebuild. Meant for small local corpora such as
+    tool schemas or one conversation's archived turns.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75) -> None:
+        self.k1 = k1
+        self.b = b
+        self._postings: dict[str, dict[str, int]] = {}
+        self._doc_lengths: dict[str, int] = {}
+        self._doc_terms: dict[str, tuple[str, ...]] = {}
+        self._total_length = 0
+
+    def add(self, doc_id: str, text: str) -> None:
+        """Index text under doc_id, replacing an earlier document with the same id."""
+        if doc_id in self._doc_lengths:
+            self.remove(doc_id)
+        terms = tokenize(text)
+        frequencies = Counter(terms)
+        for term, frequency in frequencies.items():
+            self._postings.setdefault(term, {})[doc_id] = frequency
+        self._doc_lengths[doc_id] = len(terms)
+        self._doc_terms[doc_id] = tuple(frequencies)
+        self._total_length += len(terms)
+
+    def remove(self, doc_id: str) -> None:
+        length = self._doc_lengths.pop(doc_id, None)
+        if length is None:
+            return
+        self._total_length -= length
+        for term in self._doc_terms.pop(doc_id):
+            del self._postings[term][doc_id]
+            if not self._postings[term]:
+                del self._postings[term]
+
+    def search(self, query: str, top_k: int) -> list[tuple[str, float]]:
+        """Return up to top_k (doc_id, score) pairs with a positive score, best first."""
+        if not self._doc_lengths:
+            return []
+        doc_count = len(self._doc_lengths)
+        average_length = self._total_length / doc_count or 1.0
+        scores: dict[str, float] = {}
+        for term in set(tokenize(query)):
+            docs = self._postings.get(term)
+            if not docs:
+                continue
+            idf = math.log(1 + (doc_count - len(docs) + 0.5) / (len(docs) + 0.5))
+            for doc_id, frequency in docs.items():
+                norm = 1 - self.b + self.b * self._doc_lengths[doc_id] / average_length
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * (
+                    frequency * (self.k1 + 1) / (frequency + self.k1 * norm)
+                )
+        return heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+    def __contains__(self, doc_id: object) -> bool:
+        return doc_id in self._doc_lengths
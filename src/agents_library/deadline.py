@@ -0,0 +1,104 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager, suppress
+from contextvars import ContextVar
+
+from src.observability.metrics import metrics
+
+# Key of the absolute deadline (Unix time) in MCP request metadata.
+DEADLINE_META_KEY = "deadline"
+
+_deadline: ContextVar[float | None] = ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceededError(TimeoutError):
+    """Raised when a request's deadline passed before its work finished."""
+
+
+class ClientDisconnectedError(Exception):
+    """Raised in place of the cancellation of a turn whose client went away."""
+
+
+def current_deadline() -> float | None:
+    """Absolute deadline (Unix time) of the current request, if any."""
+    return _deadline.get()
+
+
+def remaining_seconds() -> float | None:
+    deadline = _deadline.get()
+    return None if deadline is None else max(deadline - time.time(), 0.0)
+
+
+def timeout_for(default: float) -> float:
+    """A downstream call's timeout: default, capped by the time the request has left."""
+    remaining = remaining_seconds()
+    return default if remaining is None else min(default, remaining)
+
+
+@asynccontextmanager
+async def request_deadline(
+    source: str, seconds: float | None = None, at: float | None = None
+) -> AsyncIterator[None]:
+    """Bound the enclosed work by a deadline that downstream calls can read.
+
+    The deadline is seconds from now or the absolute Unix time at, whichever comes
+    first, and never later than an enclosing deadline. Work still running when it
+    passes is cancelled and DeadlineExceededError is raised.
+    """
+    candidates = [d for d in (_deadline.get(), at) if d is not None]
+    if seconds is not None:
+        candidates.append(time.time() + seconds)
+    if not candidates:
+        yield
+        return
+    deadline = min(candidates)
+    token = _deadline.set(deadline)
+    timeout = asyncio.timeout(max(deadline - time.time(), 0.0))
+    try:
+        async with timeout:
+            yield
+    except TimeoutError as e:
+        if not timeout.expired() or isinstance(e, DeadlineExceededError):
+            raise
+        metrics.inc("request_cancellations_total", reason="deadline", source=source)
+        raise DeadlineExceededError(f"Deadline of the {source} request passed") from e
+    finally:
+        _deadline.reset(token)
+
+
+@asynccontextmanager
+async def cancel_on_disconnect(
+    is_disconnected: Callable[[], Awaitable[bool]],
+    source: str,
+    poll_interval_seconds: float,
+) -> AsyncIterator[None]:
+    """Cancel the enclosed work once is_disconnected() reports the client has left.
+
+    The cancellation surfaces as ClientDisconnectedError so callers can tell it from
+    a server shutdown.
+    """
+    task = asyncio.current_task()
+    assert task is not None
+    disconnected = False
+
+    async def watch() -> None:
+        nonlocal disconnected
+        while not await is_disconnected():
+            await asyncio.sleep(poll_interval_seconds)
+        disconnected = True
+        task.cancel()
+
+    watcher = asyncio.create_task(watch())
+    try:
+        yield
+    except asyncio.CancelledError:
+        if not disconnected:
+            raise
+        task.uncancel()
+        metrics.inc("request_cancellations_total", reason="disconnect", source=source)
+        raise ClientDisconnectedError(f"The {source} client disconnected") from None
+    finally:
+        watcher.cancel()
+        with suppress(asyncio.CancelledError):
+            await watcher
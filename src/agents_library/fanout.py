@@ -0,0 +1,114 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from logging import getLogger
+from typing import Literal
+
+from src.agents_library.admission import AdmissionRejectedError, admission_controller
+from src.agents_library.base import BaseAgent, ChatSessionConfig
+from src.agents_library.deadline import request_deadline
+from src.agents_library.memory import ConversationMemory
+from src.agents_library.registry import AgentEntry
+from src.agents_library.response_types import FanoutResult
+
+logger = getLogger(__name__)
+
+AgentRunner = Callable[[], Awaitable[str]]
+
+FANOUT_SESSION_CONFIG = ChatSessionConfig(
+    bot_user_name="TestBot",
+    session_id="fanout",
+    topic_id="fanout",
+    priority="batch",
+)
+
+
+async def run_fanout(
+    runners: dict[str, AgentRunner],
+    deadline_seconds: float,
+    first_n: int | None,
+) -> AsyncIterator[FanoutResult]:
+    """Run every agent concurrently and yield results in completion order.
+
+    Each runner gets its own deadline. Once first_n runners succeeded, the remaining
+    ones are cancelled and not reported.
+    """
+    tasks = [
+        asyncio.create_task(_run_with_deadline(agent_key, runner, deadline_seconds))
+        for agent_key, runner in runners.items()
+    ]
+    succeeded = 0
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            result = await next_result
+            yield result
+            succeeded += result.status == "ok"
+            if first_n is not None and succeeded >= first_n:
+                break
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def ask_agent(entry: AgentEntry, query: str) -> str:
+    """Run one stateless turn of an agent under admission control."""
+    async with admission_controller.admit(entry.key):
+        agent = BaseAgent(
+            settings=entry.settings,
+            session_config=FANOUT_SESSION_CONFIG,
+            memory=ConversationMemory(),
+            agent_folder_path=entry.path,
+        )
+        return await agent.prepare_response(query)
+
+
+def build_merge_query(query: str, results: list[FanoutResult]) -> str:
+    """Prompt asking a merge agent to combine the successful answers."""
+    answers = "\n\n".join(
+        f"### Answer from {result.agent_key}\n{result.response}"
+        for result in results
+        if result.status == "ok"
+    )
+    return (
+        "Several assistants answered the same question. Combine their answers into "
+        "one consistent answer, resolving contradictions and removing repetition.\n\n"
+        f"## Question\n{query}\n\n## Answers\n{answers}"
+    )
+
+
+async def _run_with_deadline(
+    agent_key: str, runner: AgentRunner, deadline_seconds: float
+) -> FanoutResult:
+    started = time.perf_counter()
+    try:
+        async with request_deadline("fanout", seconds=deadline_seconds):
+            response = await runner()
+    except TimeoutError:
+        return _result(
+            agent_key, started, "timeout", f"No answer within {deadline_seconds}s"
+        )
+    except AdmissionRejectedError as e:
+        return _result(agent_key, started, "rejected", str(e))
+    except Exception as e:
+        logger.exception(f"Fan-out call to agent '{agent_key}' failed")
+        return _result(agent_key, started, "error", str(e))
+    return FanoutResult(
+        agent_key=agent_key,
+        status="ok",
+        response=response,
+        elapsed_seconds=round(time.perf_counter() - started, 3),
+    )
+
+
+def _result(
+    agent_key: str,
+    started: float,
+    status: Literal["timeout", "rejected", "error"],
+    detail: str,
+) -> FanoutResult:
+    return FanoutResult(
+        agent_key=agent_key,
+        status=status,
+        detail=detail,
+        elapsed_seconds=round(time.perf_counter() - started, 3),
+    )
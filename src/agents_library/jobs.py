@@ -0,0 +1,256 @@
+import asyncio
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from logging import getLogger
+from typing import Literal
+from urllib.parse import urlsplit
+
+from src.agents_library.admission import AdmissionRejectedError
+from src.agents_library.response_types import JobStatus
+from src.config.settings import JobConfig, settings
+from src.observability.metrics import metrics
+
+logger = getLogger(__name__)
+
+JobState = Literal["queued", "running", "succeeded", "failed", "cancelled"]
+JobRunner = Callable[[], Awaitable[str]]
+
+FINISHED_STATES: frozenset[JobState] = frozenset({"succeeded", "failed", "cancelled"})
+
+
+class JobQueueFullError(Exception):
+    """Raised when max_pending jobs already wait for a worker."""
+
+
+class JobCallbackNotAllowedError(Exception):
+    """Raised when a callback URL points to a host outside the configured allowlist."""
+
+
+@dataclass
+class Job:
+    job_id: str
+    agent_key: str
+    run: JobRunner
+    correlation_id: str | None = None
+    callback_url: str | None = None
+    state: JobState = "queued"
+    response: str | None = None
+    error: str | None = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: float | None = None
+    finished: asyncio.Event = field(default_factory=asyncio.Event)
+    task: asyncio.Task[str] | None = None
+
+    def status(self) -> JobStatus:
+        return JobStatus(
+            job_id=self.job_id,
+            agent_key=self.agent_key,
+            status=self.state,
+            correlation_id=self.correlation_id,
+            response=self.response,
+            error=self.error,
+            created_at=self.created_at,
+            finished_at=self.finished_at,
+        )
+
+
+@dataclass
+class JobManager:
+    """Runs long agent queries on a bounded worker pool and keeps results for a TTL.
+
+    submit() returns immediately; start() launches config.job_workers workers that take
+    jobs from a queue bounded by config.job_max_pending. Finished jobs stay readable for
+    job_result_ttl_seconds and, when a callback URL was given, their final status is
+    POSTed to it. Callback URLs must be http(s) on a host in
+    config.job_callback_allowed_hosts so jobs cannot be used to reach internal
+    services.
+    """
+
+    config: JobConfig
+    _jobs: dict[str, Job] = field(default_factory=dict)
+    _queue: asyncio.Queue[Job] | None = None
+    _workers: list[asyncio.Task[None]] = field(default_factory=list)
+
+    def start(self) -> None:
+        """Start the worker pool; call once from the application lifespan."""
+        if self._workers:
+            return
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"job-worker-{i}")
+            for i in range(self.config.job_workers)
+        ]
+
+    async def stop(self) -> None:
+        """Cancel workers and running jobs."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def submit(
+        self,
+        agent_key: str,
+        run: JobRunner,
+        correlation_id: str | None = None,
+        callback_url: str | None = None,
+    ) -> Job:
+        """Queue a job or raise JobQueueFullError when too many jobs are pending.
+
+        Raises JobCallbackNotAllowedError if callback_url is not an allowed URL.
+        """
+        if callback_url is not None and not self.callback_allowed(callback_url):
+            raise JobCallbackNotAllowedError(
+                f"Callback host of '{callback_url}' is not allowed"
+            )
+        self.purge_expired()
+        job = Job(
+            job_id=str(uuid.uuid4()),
+            agent_key=agent_key,
+            run=run,
+            correlation_id=correlation_id,
+            callback_url=callback_url,
+        )
+        try:
+            self._job_queue().put_nowait(job)
+        except asyncio.QueueFull:
+            metrics.inc("agent_jobs_rejected_total", agent=agent_key)
+            raise JobQueueFullError(
+                f"{self.config.job_max_pending} jobs are already pending"
+            ) from None
+        self._jobs[job.job_id] = job
+        metrics.inc("agent_jobs_submitted_total", agent=agent_key)
+        metrics.set_gauge("agent_jobs_pending", self._job_queue().qsize())
+        return job
+
+    def callback_allowed(self, url: str) -> bool:
+        """True for http(s) URLs whose host is in job_callback_allowed_hosts."""
+        parts = urlsplit(url)
+        allowed = {host.lower() for host in self.config.job_callback_allowed_hosts}
+        return parts.scheme in ("http", "https") and parts.hostname in allowed
+
+    def get(self, job_id: str) -> Job | None:
+        self.purge_expired()
+        return self._jobs.get(job_id)
+
+    async def wait(self, job_id: str, timeout_seconds: float) -> Job | None:
+        """Long-poll: return once the job finished or timeout_seconds passed."""
+        job = self.get(job_id)
+        if job is None or job.state in FINISHED_STATES or timeout_seconds <= 0:
+            return job
+        try:
+            async with asyncio.timeout(timeout_seconds):
+                await job.finished.wait()
+        except TimeoutError:
+            pass
+        return job
+
+    def cancel(self, job_id: str) -> Job | None:
+        """Cancel a queued or running job; finished jobs are left untouched."""
+        job = self.get(job_id)
+        if job is None or job.state in FINISHED_STATES:
+            return job
+        if job.task is not None:
+            job.task.cancel()
+        else:
+            self._finish(job, "cancelled", error="Cancelled before start")
+        return job
+
+    def purge_expired(self) -> None:
+        """Drop finished jobs older than job_result_ttl_seconds."""
+        expires_before = time.time() - self.config.job_result_ttl_seconds
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < expires_before
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    async def _worker(self) -> None:
+        queue = self._job_queue()
+        while True:
+            job = await queue.get()
+            metrics.set_gauge("agent_jobs_pending", queue.qsize())
+            try:
+                if job.state == "queued":
+                    await self._execute(job)
+            finally:
+                queue.task_done()
+
+    async def _execute(self, job: Job) -> None:
+        job.state = "running"
+        metrics.add_gauge("agent_jobs_running", 1)
+        job.task = asyncio.create_task(
+            self._run_until_admitted(job, self.config.job_admission_max_attempts)
+        )
+        try:
+            job.response = await job.task
+            self._finish(job, "succeeded")
+        except asyncio.CancelledError:
+            self._finish(job, "cancelled", error="Cancelled")
+            worker = asyncio.current_task()
+            if worker is not None and worker.cancelling():
+                raise
+        except Exception as e:
+            logger.exception(f"Job {job.job_id} for agent '{job.agent_key}' failed")
+            self._finish(job, "failed", error=str(e))
+        finally:
+            metrics.add_gauge("agent_jobs_running", -1)
+        if job.callback_url:
+            await self._send_callback(job)
+
+    @staticmethod
+    async def _run_until_admitted(job: Job, max_attempts: int) -> str:
+        """Jobs are not latency sensitive, so saturation means retry, not failure.
+
+        After max_attempts rejections the last one is raised and the job fails.
+        """
+        attempts = 0
+        while True:
+            try:
+                return await job.run()
+            except AdmissionRejectedError as e:
+                attempts += 1
+                if attempts >= max_attempts:
+                    raise
+                logger.info(
+                    f"Job {job.job_id} waiting {e.retry_after_seconds}s for admission"
+                )
+                await asyncio.sleep(e.retry_after_seconds)
+
+    def _finish(self, job: Job, state: JobState, error: str | None = None) -> None:
+        job.state = state
+        job.error = error
+        job.finished_at = time.time()
+        job.finished.set()
+        metrics.inc("agent_jobs_finished_total", agent=job.agent_key, status=state)
+
+    async def _send_callback(self, job: Job) -> None:
+        import httpx
+
+        assert job.callback_url is not None
+        if not self.callback_allowed(job.callback_url):
+            logger.warning(f"Skipping callback for job {job.job_id}: host not allowed")
+            metrics.inc("agent_jobs_callback_failed_total", agent=job.agent_key)
+            return
+        try:
+            async with httpx.AsyncClient(
+                timeout=self.config.job_callback_timeout_seconds
+            ) as client:
+                response = await client.post(
+                    job.callback_url, content=job.status().model_dump_json()
+                )
+                response.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.warning(f"Callback for job {job.job_id} failed: {e}")
+            metrics.inc("agent_jobs_callback_failed_total", agent=job.agent_key)
+
+    def _job_queue(self) -> asyncio.Queue[Job]:
+        if self._queue is None:
+            self._queue = asyncio.Queue(self.config.job_max_pending)
+        return self._queue
+
+
+job_manager = JobManager(settings.job_config)
@@ -2,7 +2,10 @@ import threading
 import time
 import uuid
 from logging import getLogger
-from typing import Any
+
+from src.agents_library.archive import ConversationArchive
+from src.agents_library.messages import ChatMessage
+from src.agents_library.tool_results import ToolResultStore
 
 logger = getLogger(__name__)
 
@@ -13,32 +16,48 @@ MEMORY_RETENTION_SECONDS = 3600
 
 
 class ConversationMemory:
-    def __init__(self, hard_limit_tokens: int = 1_000):
+    """Live messages of one conversation plus an archive of what was evicted.
+
+    When the live messages exceed hard_limit_tokens, tool results and then whole
+    older turns are moved to a local BM25 archive. build_messages recalls the
+    archived snippets most relevant to the latest user message, up to
+    recall_token_budget tokens.
+    """
+
+    def __init__(self, hard_limit_tokens: int = 1_000, recall_token_budget: int = 250):
         self.hard_limit_tokens = hard_limit_tokens
-        self.messages: list[dict[str, Any]] = []
+        self.recall_token_budget = recall_token_budget
+        self.messages: list[ChatMessage] = []
         self.summaries: list[str] = []
+        self.tool_results = ToolResultStore()
+        self.archive = ConversationArchive()
         self.created_at: float = time.time()
 
     def add_user(self, text: str) -> None:
         self.shrink_messages_to_fit_token_limit(False)
-        self.messages.append({"role": "user", "content": text})
+        self.messages.append(ChatMessage(role="user", content=text))
 
-    def add_assistant(self, message: dict[str, Any]) -> None:
+    def add_assistant(self, message: ChatMessage) -> None:
         self.messages.append(message)
 
     def add_tool_result(self, tool_call_id: str, result: str) -> None:
         self.messages.append(
-            {
-                "role": "tool",
-                "content": result,
-                "tool_call_id": tool_call_id,
-            }
+            ChatMessage(role="tool", content=result, tool_call_id=tool_call_id)
         )
 
-    def build_messages(self, system_prompt: str) -> list[dict[str, Any]]:
-        msgs: list[dict[str, Any]] = [{"role": "system", "content": system_prompt}]
+    def build_messages(self, system_prompt: str) -> list[ChatMessage]:
+        msgs: list[ChatMessage] = [ChatMessage(role="system", content=system_prompt)]
         for s in self.summaries:
-            msgs.append({"role": "assistant", "content": f"(summary) {s}"})
+            msgs.append(ChatMessage(role="assistant", content=f"(summary) {s}"))
+        recalled = self._recall()
+        if recalled:
+            msgs.append(
+                ChatMessage(
+                    role="assistant",
+                    content="(recalled from earlier in this conversation)\n"
+                    + "\n".join(recalled),
+                )
+            )
         return msgs + self.messages
 
     def incorporate_summary(self, summary_text: str, drop_until: int) -> None:
@@ -49,11 +68,14 @@ class ConversationMemory:
     def clear(self) -> None:
         self.messages.clear()
         self.summaries.clear()
+        self.tool_results = ToolResultStore()
+        self.archive = ConversationArchive()
 
     def shrink_messages_to_fit_token_limit(self, force_shrink: bool) -> None:
         if (self._count_tokens() > self.hard_limit_tokens) or force_shrink:
             logger.info(f"Number of tokens before shrinking: {len(self.messages)}")
             self._remove_tool_calls_from_messages_until_tokens_below_limit(force_shrink)
+            self._archive_oldest_turns_until_tokens_below_limit()
             logger.info(f"Number of tokens after shrinking: {len(self.messages)}")
 
     def _remove_tool_calls_from_messages_until_tokens_below_limit(
@@ -65,19 +87,47 @@ class ConversationMemory:
         )
         while (self._count_tokens() > self.hard_limit_tokens) or force_shrink:
             for i, msg in enumerate(self.messages[:-1]):
-                if msg.get("role") == "tool":
+                if msg.role == "tool":
+                    self._archive_message(msg)
                     del self.messages[i]
                     break
             else:
                 break
 
-    def _count_tokens(self) -> int:
-        total_tokens = 0
+    def _archive_oldest_turns_until_tokens_below_limit(self) -> None:
+        """Move whole turns, oldest first, to the archive; the latest turn stays."""
+        while self._count_tokens() > self.hard_limit_tokens:
+            turn_starts = [i for i, m in enumerate(self.messages) if m.role == "user"]
+            if len(turn_starts) < 2:
+                break
+            for msg in self.messages[: turn_starts[1]]:
+                self._archive_message(msg)
+            del self.messages[: turn_starts[1]]
+
+    def _archive_message(self, msg: ChatMessage) -> None:
+        if msg.role == "tool":
+            self.tool_results.discard(msg.tool_call_id or "")
+            self.archive.add(f"tool {self._tool_name(msg.tool_call_id)}", msg.content)
+        else:
+            self.archive.add(msg.role, msg.content)
+
+    def _tool_name(self, tool_call_id: str | None) -> str:
         for msg in self.messages:
-            content = msg.get("content")
-            if isinstance(content, str) and content:
-                total_tokens += len(content.split())
-        return total_tokens
+            for tool_call in msg.tool_calls or ():
+                if tool_call.id == tool_call_id:
+                    return tool_call.name
+        return "result"
+
+    def _recall(self) -> list[str]:
+        if not len(self.archive) or self.recall_token_budget <= 0:
+            return []
+        query = next(
+            (m.content for m in reversed(self.messages) if m.role == "user"), None
+        )
+        return self.archive.recall(query or "", self.recall_token_budget)
+
+    def _count_tokens(self) -> int:
+        return sum(msg.token_count for msg in self.messages)
 
 
 def get_or_create_memory(
@@ -98,6 +148,14 @@ def get_or_create_memory(
         return memory, new_id
 
 
+def keep_memory_alive(
+    agent_key: str, correlation_id: str, memory: ConversationMemory
+) -> None:
+    """Refresh the retention timestamp of a memory held by a long-lived connection."""
+    with memory_lock:
+        memory_store.setdefault(agent_key, {})[correlation_id] = (memory, time.time())
+
+
 def cleanup_expired_memory() -> None:
     now = time.time()
     with memory_lock:
@@ -0,0 +1,54 @@
+import sys
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass(slots=True)
+class ToolCall:
+    id: str
+    name: str
+    arguments: str
+
+    def to_openai(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "type": "function",
+            "function": {"name": self.name, "arguments": self.arguments},
+        }
+
+
+@dataclass(slots=True)
+class ChatMessage:
+    """Compact chat message kept in ConversationMemory.
+
+    Uses __slots__ instead of a per-message dict, interns the role and caches the
+    token estimate. It is converted to the OpenAI dict format only when it is sent
+    to the model, see ChatClient.chat.
+    """
+
+    role: str
+    content: str | None
+    tool_call_id: str | None = None
+    tool_calls: tuple[ToolCall, ...] | None = None
+    token_count: int = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.role = sys.intern(self.role)
+        self.token_count = count_tokens(self.content)
+
+    def to_openai(self) -> dict[str, Any]:
+        message: dict[str, Any] = {"role": self.role, "content": self.content}
+        if self.tool_calls:
+            message["tool_calls"] = [call.to_openai() for call in self.tool_calls]
+        if self.tool_call_id is not None:
+            message["tool_call_id"] = self.tool_call_id
+        return message
+
+
+def count_tokens(content: str | None) -> int:
+    """Cheap whitespace token estimate used for memory limits."""
+    return len(content.split()) if content else 0
+
+
+def to_openai_messages(messages: list[ChatMessage]) -> list[dict[str, Any]]:
+    return [message.to_openai() for message in messages]
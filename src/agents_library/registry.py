@@ -0,0 +1,81 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from logging import getLogger
+from pathlib import Path
+
+from src.agents_library import build_agent_settings
+from src.agents_library.initiator import load_agent_paths
+from src.config.settings import Settings
+
+logger = getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class AgentEntry:
+    key: str
+    path: Path
+    settings: Settings
+
+
+class AgentRegistry:
+    """Agents discovered in the library, keyed by their folder name.
+
+    Discovery parses every agent_config.yaml concurrently in worker threads so it can
+    run in an application lifespan without blocking the event loop.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[str, AgentEntry] = {}
+        self._ready: bool = False
+        self.discovery_seconds: float | None = None
+
+    async def discover(
+        self, base_settings: Settings, agents_root: str | Path | None = None
+    ) -> list[AgentEntry]:
+        """Load all agents under agents_root and replace the registered entries."""
+        started = time.perf_counter()
+        paths = await asyncio.to_thread(load_agent_paths, agents_root)
+        entries = await asyncio.gather(
+            *(asyncio.to_thread(_load_entry, base_settings, path) for path in paths)
+        )
+        self._entries = {entry.key: entry for entry in entries}
+        self._ready = True
+        self.discovery_seconds = time.perf_counter() - started
+        logger.info(
+            f"Discovered {len(entries)} agents in {self.discovery_seconds:.3f}s"
+        )
+        return list(entries)
+
+    def discover_sync(
+        self, base_settings: Settings, agents_root: str | Path | None = None
+    ) -> list[AgentEntry]:
+        """Blocking discovery for processes that run without an app lifespan."""
+        entries = [
+            _load_entry(base_settings, path) for path in load_agent_paths(agents_root)
+        ]
+        self._entries = {entry.key: entry for entry in entries}
+        self._ready = True
+        return entries
+
+    def get(self, agent_key: str) -> AgentEntry | None:
+        return self._entries.get(agent_key)
+
+    def entries(self) -> list[AgentEntry]:
+        return list(self._entries.values())
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+
+def _load_entry(base_settings: Settings, path: Path) -> AgentEntry:
+    logger.info(f"Loading agent from path: {path}")
+    return AgentEntry(
+        key=path.name,
+        path=path,
+        settings=build_agent_settings(base_settings, path / "agent_config.yaml"),
+    )
+
+
+agent_registry = AgentRegistry()
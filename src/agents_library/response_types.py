@@ -1,9 +1,21 @@
-from pydantic import BaseModel
+from typing import Literal
+
+from pydantic import BaseModel, Field, HttpUrl
 
 
 class AgentRequest(BaseModel):
+    """One agent turn; deadline_seconds may shorten the configured request deadline."""
+
     query: str
     correlation_id: str | None = None
+    deadline_seconds: float | None = Field(default=None, gt=0)
+
+
+class AgentSocketRequest(BaseModel):
+    """One turn sent over the agent WebSocket; id is echoed in every reply event."""
+
+    query: str
+    id: str | None = None
 
 
 class AgentResponse(BaseModel):
@@ -11,6 +23,61 @@ class AgentResponse(BaseModel):
     correlation_id: str
 
 
+class FanoutRequest(BaseModel):
+    """Ask several agents the same query concurrently.
+
+    deadline_seconds applies to each agent separately. With first_n set, the call
+    returns once that many agents answered successfully and cancels the rest.
+    merge_agent_key names an agent that combines the successful answers.
+    """
+
+    query: str
+    agent_keys: list[str] = Field(min_length=1)
+    deadline_seconds: float = 60.0
+    first_n: int | None = Field(default=None, ge=1)
+    merge_agent_key: str | None = None
+    stream: bool = False
+
+
+class FanoutResult(BaseModel):
+    agent_key: str
+    status: Literal["ok", "timeout", "rejected", "error"]
+    response: str | None = None
+    detail: str | None = None
+    elapsed_seconds: float
+
+
+class FanoutResponse(BaseModel):
+    results: list[FanoutResult]
+    merged_response: str | None = None
+
+
+class JobRequest(BaseModel):
+    """Submit an agent query to run in the background.
+
+    callback_url, if given, receives the final JobStatus as a JSON POST.
+    """
+
+    query: str
+    correlation_id: str | None = None
+    callback_url: HttpUrl | None = None
+
+
+class JobStatus(BaseModel):
+    job_id: str
+    agent_key: str
+    status: Literal["queued", "running", "succeeded", "failed", "cancelled"]
+    correlation_id: str | None = None
+    response: str | None = None
+    error: str | None = None
+    created_at: float
+    finished_at: float | None = None
+
+
+class ProfilingToggle(BaseModel):
+    enabled: bool
+
+
 class BaseChatResponse(BaseModel):
     """The base type to pass to ChatClient.chat as response_format.
 
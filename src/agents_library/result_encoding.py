@@ -0,0 +1,279 @@
+import csv
+import io
+import json
+import re
+import statistics
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Literal
+
+from src.agents_library.tool_results import TOOL_RESULT_INLINE_CHARS
+from src.api_client.scheduler import CHARS_PER_TOKEN
+from src.observability.metrics import metrics
+
+TABLE_SAMPLE_ROWS = 20
+
+Encoding = Literal["raw", "csv", "json", "text_tables"]
+
+_RULE_LINE = re.compile(r"^[\s|+:=\-]*[-=][\s|+:=\-]*$")
+_SIMPLE_RULE_LINE = re.compile(r"^\s*-+(\s+-+)+\s*$")
+
+
+@dataclass(frozen=True)
+class EncodedResult:
+    """A tool result re-encoded for the prompt.
+
+    text is the complete result. preview, set for tables too large to keep inline,
+    holds the header, an even sample of rows and per-column statistics.
+    """
+
+    text: str
+    encoding: Encoding
+    preview: str | None = None
+
+
+def encode_tool_result(tool_name: str, result: str) -> EncodedResult:
+    """Re-encode JSON and text tables in result with fewer tokens.
+
+    Lists of flat JSON records and padded ASCII, markdown or tabulate tables become
+    CSV; other JSON is minified, with lists of records sharing the same keys stored
+    as columns plus rows so keys are not repeated. Records only become CSV when
+    every cell reads back as its original value, so missing keys, nulls and strings
+    that look like numbers, booleans or empty cells keep them as JSON. The original
+    is kept when nothing gets shorter.
+    Token estimates before and after are counted per tool.
+    """
+    encoded = _encode(result)
+    if len(encoded.text) >= len(result):
+        encoded = EncodedResult(result, "raw")
+    before = len(result) // CHARS_PER_TOKEN
+    after = len(encoded.text) // CHARS_PER_TOKEN
+    metrics.inc(
+        "tool_result_encodings_total", tool=tool_name, encoding=encoded.encoding
+    )
+    metrics.inc("tool_result_tokens_total", before, tool=tool_name, stage="raw")
+    metrics.inc("tool_result_tokens_total", after, tool=tool_name, stage="encoded")
+    metrics.inc("tool_result_tokens_saved_total", before - after, tool=tool_name)
+    return encoded
+
+
+def _encode(result: str) -> EncodedResult:
+    stripped = result.strip()
+    if stripped[:1] in ("{", "["):
+        try:
+            value = json.loads(stripped)
+        except ValueError:
+            pass
+        else:
+            table = _records_table(value)
+            if table is not None:
+                return _table_result(*table)
+            compact = json.dumps(
+                _columnar(value), ensure_ascii=False, separators=(",", ":")
+            )
+            return EncodedResult(compact, "json")
+    tables = _text_tables(result.splitlines())
+    if not tables:
+        return EncodedResult(result, "raw")
+    lines = result.splitlines()
+    if len(tables) == 1 and not "".join(_outside(lines, tables)).strip():
+        _, _, header, rows = tables[0]
+        return _table_result(header, rows)
+    for start, stop, header, rows in reversed(tables):
+        lines[start:stop] = _csv([header, *rows]).splitlines()
+    return EncodedResult("\n".join(lines), "text_tables")
+
+
+def _table_result(header: list[str], rows: list[list[str]]) -> EncodedResult:
+    text = _csv([header, *rows])
+    preview = None
+    if len(text) > TOOL_RESULT_INLINE_CHARS and len(rows) > TABLE_SAMPLE_ROWS:
+        preview = _table_preview(header, rows)
+    return EncodedResult(text, "csv", preview)
+
+
+def _table_preview(header: list[str], rows: list[list[str]]) -> str:
+    last = len(rows) - 1
+    picks = sorted(
+        {round(i * last / (TABLE_SAMPLE_ROWS - 1)) for i in range(TABLE_SAMPLE_ROWS)}
+    )
+    summaries = "; ".join(
+        _column_summary(name, [row[i] for row in rows]) for i, name in enumerate(header)
+    )
+    return (
+        _csv([header, *(rows[i] for i in picks)])
+        + f"[{len(rows)} rows x {len(header)} columns, {len(picks)} rows sampled "
+        f"evenly. Columns: {summaries}.]"
+    )
+
+
+def _column_summary(name: str, values: list[str]) -> str:
+    present = [value for value in values if value != ""]
+    try:
+        numbers = [float(value) for value in present]
+    except ValueError:
+        numbers = []
+    if numbers:
+        return (
+            f"{name} min {min(numbers):g}, max {max(numbers):g}, "
+            f"mean {statistics.fmean(numbers):g}"
+        )
+    counts = Counter(present)
+    if not counts:
+        return f"{name} empty"
+    value, count = counts.most_common(1)[0]
+    return f"{name} {len(counts)} distinct, most common {value!r} x{count}"
+
+
+def _records_table(value: Any) -> tuple[list[str], list[list[str]]] | None:
+    """Header and rows of a JSON list of flat objects with the same keys.
+
+    None for any other shape, or when a cell would not read back unambiguously.
+    """
+    if not _same_keys(value):
+        return None
+    if not all(_csv_safe(v) for item in value for v in item.values()):
+        return None
+    columns = list(value[0])
+    return columns, [[_cell(item[key]) for key in columns] for item in value]
+
+
+def _same_keys(value: Any) -> bool:
+    """True for a list of two or more objects that all have the same keys."""
+    if not isinstance(value, list) or len(value) < 2:
+        return False
+    if not all(isinstance(item, dict) for item in value):
+        return False
+    return all(item.keys() == value[0].keys() for item in value)
+
+
+def _columnar(value: Any) -> Any:
+    """Store lists of objects as {"columns": [...], "rows": [[...]]}, recursively."""
+    if isinstance(value, dict):
+        return {key: _columnar(item) for key, item in value.items()}
+    if not isinstance(value, list):
+        return value
+    if _same_keys(value):
+        columns = list(value[0])
+        return {
+            "columns": columns,
+            "rows": [[_columnar(item[key]) for key in columns] for item in value],
+        }
+    return [_columnar(item) for item in value]
+
+
+def _csv_safe(value: Any) -> bool:
+    """True if _cell(value) can only be read back as value.
+
+    Numbers and booleans are written as in JSON, so strings that would read as one
+    of them, and empty strings, which look like a missing value, are not safe.
+    """
+    if isinstance(value, bool | int | float):
+        return True
+    if not isinstance(value, str) or value in ("", "true", "false", "null"):
+        return False
+    try:
+        float(value)
+    except ValueError:
+        return True
+    return False
+
+
+def _cell(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _text_tables(
+    lines: list[str],
+) -> list[tuple[int, int, list[str], list[list[str]]]]:
+    """(start, stop, header, rows) of each pipe, grid or tabulate table in lines."""
+    tables = []
+    i = 0
+    while i < len(lines):
+        table = _pipe_table(lines, i) or _simple_table(lines, i)
+        if table is None:
+            i += 1
+            continue
+        tables.append(table)
+        i = table[1]
+    return tables
+
+
+def _pipe_table(
+    lines: list[str], start: int
+) -> tuple[int, int, list[str], list[list[str]]] | None:
+    stop = start
+    while stop < len(lines) and lines[stop].strip()[:1] in ("|", "+"):
+        stop += 1
+    content = [line for line in lines[start:stop] if not _RULE_LINE.match(line)]
+    rows = [
+        [cell.strip() for cell in line.strip().strip("|").split("|")]
+        for line in content
+    ]
+    if len(rows) < 2 or len({len(row) for row in rows}) != 1:
+        return None
+    if not _lossless(content, rows):
+        return None
+    return start, stop, rows[0], rows[1:]
+
+
+def _simple_table(
+    lines: list[str], start: int
+) -> tuple[int, int, list[str], list[list[str]]] | None:
+    """A tabulate "simple" table: header, a rule of dashes per column, then rows.
+
+    Every line of it must keep its text inside the columns of the rule; the table
+    ends at the first line that does not.
+    """
+    if start + 2 >= len(lines) or not _SIMPLE_RULE_LINE.match(lines[start + 1]):
+        return None
+    spans = [m.span() for m in re.finditer(r"-+", lines[start + 1])]
+    if not _within(lines[start], spans):
+        return None
+    stop = start + 2
+    while stop < len(lines) and lines[stop].strip():
+        if _SIMPLE_RULE_LINE.match(lines[stop]):
+            stop += 1
+            break
+        if not _within(lines[stop], spans):
+            break
+        stop += 1
+    content = [lines[start]] + [
+        line for line in lines[start + 2 : stop] if not _SIMPLE_RULE_LINE.match(line)
+    ]
+    if len(content) < 2:
+        return None
+    rows = [[line[a:b].strip() for a, b in spans] for line in content]
+    if not _lossless(content, rows):
+        return None
+    return start, stop, rows[0], rows[1:]
+
+
+def _within(line: str, spans: list[tuple[int, int]]) -> bool:
+    """True if every non-space character of line lies inside one of spans."""
+    inside = bytearray(len(line))
+    for a, b in spans:
+        inside[a:b] = b"\x01" * len(inside[a:b])
+    return all(inside[i] or char.isspace() for i, char in enumerate(line))
+
+
+def _lossless(content: list[str], rows: list[list[str]]) -> bool:
+    """True if rows hold every character of the content lines but spaces and pipes."""
+    original = re.sub(r"[\s|]", "", "".join(content))
+    kept = re.sub(r"[\s|]", "", "".join(cell for row in rows for cell in row))
+    return original == kept
+
+
+def _outside(
+    lines: list[str], tables: list[tuple[int, int, list[str], list[list[str]]]]
+) -> list[str]:
+    inside = {i for start, stop, _, _ in tables for i in range(start, stop)}
+    return [line for i, line in enumerate(lines) if i not in inside]
+
+
+def _csv(rows: list[list[str]]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(rows)
+    return buffer.getvalue()
@@ -0,0 +1,77 @@
+import asyncio
+import importlib
+import time
+from collections.abc import Coroutine
+from logging import getLogger
+from typing import Any
+
+from src.agents_library.admission import admission_controller
+from src.agents_library.registry import AgentEntry, agent_registry
+from src.api_client.http_pool import llm_http_pool
+from src.config.settings import Settings
+from src.mcp_client.catalog import tool_catalog
+from src.observability.metrics import metrics
+
+logger = getLogger(__name__)
+
+HEAVY_MODULES = ("litellm",)
+
+
+async def start_agents(base_settings: Settings) -> list[AgentEntry]:
+    """Discover agents and import heavy dependencies off the event loop.
+
+    Meant to run as a background step of an application lifespan so health checks
+    are served while agents are still loading.
+    """
+    entries, _ = await asyncio.gather(
+        agent_registry.discover(base_settings),
+        import_in_background(*HEAVY_MODULES),
+    )
+    for entry in entries:
+        admission_controller.configure_agent(
+            entry.key, entry.settings.agent_config.max_in_flight
+        )
+    return entries
+
+
+async def import_in_background(*module_names: str) -> None:
+    """Import modules in worker threads so the first request does not pay for it."""
+    await asyncio.gather(
+        *(asyncio.to_thread(importlib.import_module, name) for name in module_names)
+    )
+
+
+async def warm_up_agents(entries: list[AgentEntry]) -> None:
+    """Pay cold paths before reporting ready: model metadata, connections, MCP tools.
+
+    Loads LiteLLM's model info for every configured model, opens one keep-alive
+    connection per LLM endpoint and, when any agent uses MCP tools, opens the first
+    MCP session and primes the shared tool catalog. Each step is best effort;
+    failures are logged and the request path retries them.
+    """
+    started = time.perf_counter()
+    models = sorted({entry.settings.agent_config.model for entry in entries})
+    steps: list[Coroutine[Any, Any, object]] = [
+        asyncio.to_thread(_load_model_info, model) for model in models
+    ]
+    if llm_http_pool.config.llm_http_preconnect:
+        steps.append(
+            llm_http_pool.preconnect([entry.settings.agent_config for entry in entries])
+        )
+    if any(entry.settings.agent_config.my_mcp_tools for entry in entries):
+        steps.append(tool_catalog.prime())
+    for result in await asyncio.gather(*steps, return_exceptions=True):
+        if isinstance(result, Exception):
+            logger.warning(f"Warm-up step failed: {result!r}")
+    elapsed = time.perf_counter() - started
+    metrics.set_gauge("agent_warmup_duration_seconds", elapsed)
+    logger.info(f"Warmed up {len(entries)} agents in {elapsed:.3f}s")
+
+
+def _load_model_info(model: str) -> None:
+    import litellm
+
+    try:
+        litellm.get_model_info(model)
+    except Exception:
+        logger.info(f"LiteLLM has no model info for '{model}'")
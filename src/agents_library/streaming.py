@@ -0,0 +1,212 @@
+import json
+from dataclasses import dataclass, field
+from typing import Any
+
+from src.agents_library.messages import ChatMessage, ToolCall
+from src.agents_library.response_types import BaseChatResponse
+
+_SIMPLE_ESCAPES = {
+    '"': '"',
+    "\\": "\\",
+    "/": "/",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+}
+
+
+class TextFieldStreamParser:
+    """Incremental JSON scanner that surfaces one top-level string field while it streams.
+
+    Every agent answers with a BaseChatResponse JSON object, so showing raw tokens would
+    leak JSON to the user. Feed the raw chunks to this parser: it tracks string and
+    nesting state, and returns the decoded characters of the field (text_response by
+    default) as soon as they arrive. finish() validates the complete body against the
+    response_format model.
+    """
+
+    def __init__(self, field_name: str = "text_response") -> None:
+        self.field_name = field_name
+        self._buffer: list[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._string_is_key = False
+        self._string_is_target = False
+        self._key_chars: list[str] = []
+        self._last_key: str | None = None
+        self._expect_key = False
+        self._escape: str | None = None
+        self._pending_high_surrogate: int | None = None
+
+    def feed(self, chunk: str) -> str:
+        """Consume a raw chunk and return newly decoded characters of the field."""
+        self._buffer.append(chunk)
+        emitted: list[str] = []
+        for char in chunk:
+            if self._in_string:
+                self._consume_string_char(char, emitted)
+            else:
+                self._consume_structural_char(char)
+        return "".join(emitted)
+
+    def finish(self, response_format: type[BaseChatResponse]) -> BaseChatResponse:
+        """Validate the complete JSON body against response_format."""
+        return response_format.model_validate_json(self.text())
+
+    def text(self) -> str:
+        return "".join(self._buffer)
+
+    def _consume_structural_char(self, char: str) -> None:
+        if char in "{[":
+            self._depth += 1
+            self._expect_key = char == "{" and self._depth == 1
+        elif char in "}]":
+            self._depth -= 1
+        elif char == "," and self._depth == 1:
+            self._expect_key = True
+        elif char == '"':
+            self._in_string = True
+            self._string_is_key = self._depth == 1 and self._expect_key
+            self._string_is_target = (
+                self._depth == 1
+                and not self._expect_key
+                and self._last_key == self.field_name
+            )
+            self._key_chars = []
+        elif char == ":" and self._depth == 1:
+            self._expect_key = False
+
+    def _consume_string_char(self, char: str, emitted: list[str]) -> None:
+        if self._escape is not None:
+            self._consume_escape_char(char, emitted)
+        elif char == "\\":
+            self._escape = ""
+        elif char == '"':
+            self._close_string()
+        else:
+            self._append_decoded(char, emitted)
+
+    def _consume_escape_char(self, char: str, emitted: list[str]) -> None:
+        assert self._escape is not None
+        if self._escape == "" and char != "u":
+            self._escape = None
+            self._append_decoded(_SIMPLE_ESCAPES.get(char, char), emitted)
+            return
+        self._escape += char
+        if len(self._escape) < 5:
+            return
+        code_point = int(self._escape[1:], 16)
+        self._escape = None
+        if 0xD800 <= code_point <= 0xDBFF:
+            self._pending_high_surrogate = code_point
+            return
+        if self._pending_high_surrogate is not None and 0xDC00 <= code_point <= 0xDFFF:
+            code_point = (
+                0x10000
+                + ((self._pending_high_surrogate - 0xD800) << 10)
+                + (code_point - 0xDC00)
+            )
+        self._pending_high_surrogate = None
+        self._append_decoded(chr(code_point), emitted)
+
+    def _append_decoded(self, char: str, emitted: list[str]) -> None:
+        if self._string_is_key:
+            self._key_chars.append(char)
+        elif self._string_is_target:
+            emitted.append(char)
+
+    def _close_string(self) -> None:
+        self._in_string = False
+        if self._string_is_key:
+            self._last_key = "".join(self._key_chars)
+        elif self._depth == 1:
+            self._last_key = None
+        self._string_is_key = False
+        self._string_is_target = False
+
+
+@dataclass
+class _PartialToolCall:
+    id: str = ""
+    name: str = ""
+    argument_parts: list[str] = field(default_factory=list)
+
+    def to_tool_call(self) -> ToolCall:
+        return ToolCall(
+            id=self.id, name=self.name, arguments="".join(self.argument_parts) or "{}"
+        )
+
+    def has_complete_arguments(self) -> bool:
+        """True once the arguments form a closed, valid JSON object."""
+        if not self.name or not self.argument_parts:
+            return False
+        if not self.argument_parts[-1].rstrip().endswith("}"):
+            return False
+        try:
+            json.loads("".join(self.argument_parts))
+        except json.JSONDecodeError:
+            return False
+        return True
+
+
+class StreamedMessageAssembler:
+    """Rebuild the assistant ChatMessage from LiteLLM streaming deltas.
+
+    Tool calls become ready as soon as their arguments are a complete JSON object, or
+    when the model moves on to the next tool call, so they can be started while the
+    rest of the response is still being generated.
+    """
+
+    def __init__(self) -> None:
+        self._content_parts: list[str] = []
+        self._tool_calls: dict[int, _PartialToolCall] = {}
+        self._ready: set[int] = set()
+
+    def add(self, chunk: Any) -> str:
+        """Merge one streamed chunk and return the content text it carried."""
+        if not chunk.choices:
+            return ""
+        delta = chunk.choices[0].delta
+        for tool_call_delta in getattr(delta, "tool_calls", None) or []:
+            self._merge_tool_call(tool_call_delta)
+        content: str = getattr(delta, "content", None) or ""
+        if content:
+            self._content_parts.append(content)
+        return content
+
+    def message(self) -> ChatMessage:
+        tool_calls = tuple(
+            partial.to_tool_call() for _, partial in sorted(self._tool_calls.items())
+        )
+        return ChatMessage(
+            role="assistant",
+            content="".join(self._content_parts) or None,
+            tool_calls=tool_calls or None,
+        )
+
+    def pop_ready_tool_calls(self) -> list[tuple[int, ToolCall]]:
+        """Return tool calls completed since the last call with their message position."""
+        newest_index = max(self._tool_calls, default=-1)
+        ready: list[tuple[int, ToolCall]] = []
+        for position, (index, partial) in enumerate(sorted(self._tool_calls.items())):
+            if index in self._ready:
+                continue
+            if index < newest_index or partial.has_complete_arguments():
+                self._ready.add(index)
+                ready.append((position, partial.to_tool_call()))
+        return ready
+
+    def _merge_tool_call(self, tool_call_delta: Any) -> None:
+        index: int = getattr(tool_call_delta, "index", None) or 0
+        partial = self._tool_calls.setdefault(index, _PartialToolCall())
+        if getattr(tool_call_delta, "id", None):
+            partial.id = tool_call_delta.id
+        function = getattr(tool_call_delta, "function", None)
+        if function is None:
+            return
+        if getattr(function, "name", None):
+            partial.name += function.name
+        if getattr(function, "arguments", None):
+            partial.argument_parts.append(function.arguments)
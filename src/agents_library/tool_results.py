@@ -0,0 +1,121 @@
+import hashlib
+import zlib
+from dataclasses import dataclass
+from typing import Any
+
+TOOL_RESULT_INLINE_CHARS = 1_500
+TOOL_RESULT_PAGE_CHARS = 4_000
+READ_TOOL_RESULT_TOOL_NAME = "read_tool_result"
+
+READ_TOOL_RESULT_TOOL: dict[str, Any] = {
+    "type": "function",
+    "function": {
+        "name": READ_TOOL_RESULT_TOOL_NAME,
+        "description": (
+            "Read more of a tool result that was shortened in the conversation.\n"
+            "Use the result_id shown in the shortened result and an offset in characters."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "result_id": {"type": "string"},
+                "offset": {"type": "integer", "minimum": 0},
+                "length": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "maximum": TOOL_RESULT_PAGE_CHARS,
+                },
+            },
+            "required": ["result_id"],
+        },
+    },
+}
+
+
+@dataclass(frozen=True)
+class StoredToolResult:
+    tool_name: str
+    compressed: bytes
+    total_chars: int
+    sha256: str
+
+    def text(self) -> str:
+        return zlib.decompress(self.compressed).decode("utf-8")
+
+
+class ToolResultStore:
+    """Per-session store that keeps large tool results compressed outside the prompt.
+
+    Results longer than TOOL_RESULT_INLINE_CHARS are replaced in the conversation by
+    their head and a short note; the full text stays here, keyed by tool call id,
+    and can be paged back in through the read_tool_result tool.
+    """
+
+    def __init__(self) -> None:
+        self._results: dict[str, StoredToolResult] = {}
+
+    def spill(
+        self, result_id: str, tool_name: str, result: str, preview: str | None = None
+    ) -> str:
+        """Return the message content to keep in memory for a tool result.
+
+        A preview, if given, replaces the head of a result that is too long to keep.
+        """
+        if len(result) <= TOOL_RESULT_INLINE_CHARS:
+            return result
+        encoded = result.encode("utf-8")
+        self._results[result_id] = StoredToolResult(
+            tool_name=tool_name,
+            compressed=zlib.compress(encoded),
+            total_chars=len(result),
+            sha256=hashlib.sha256(encoded).hexdigest(),
+        )
+        if preview is not None:
+            return (
+                f"{preview}\n\n[Full result: {len(result)} characters (sha256 "
+                f"{self._results[result_id].sha256[:12]}). Call "
+                f"{READ_TOOL_RESULT_TOOL_NAME} with result_id='{result_id}' and "
+                "offset=0 to read it.]"
+            )
+        head = _head(result, TOOL_RESULT_INLINE_CHARS)
+        return (
+            f"{head}\n\n[Result shortened: showing {len(head)} of {len(result)} "
+            f"characters (sha256 {self._results[result_id].sha256[:12]}). Call "
+            f"{READ_TOOL_RESULT_TOOL_NAME} with result_id='{result_id}' and "
+            f"offset={len(head)} to read more.]"
+        )
+
+    def read(self, result_id: str, offset: int, length: int) -> str:
+        """Return a page of a stored result, or an explanation if it is unknown."""
+        stored = self._results.get(result_id)
+        if stored is None:
+            return f"No stored tool result with result_id='{result_id}'."
+        length = max(1, min(length, TOOL_RESULT_PAGE_CHARS))
+        offset = max(0, offset)
+        page = stored.text()[offset : offset + length]
+        end = offset + len(page)
+        if end >= stored.total_chars:
+            return f"{page}\n\n[End of result {result_id}.]"
+        return (
+            f"{page}\n\n[Characters {offset}-{end} of {stored.total_chars}. "
+            f"Continue with offset={end}.]"
+        )
+
+    def discard(self, result_id: str) -> None:
+        self._results.pop(result_id, None)
+
+    def compressed_bytes(self) -> int:
+        return sum(len(stored.compressed) for stored in self._results.values())
+
+    def __contains__(self, result_id: str) -> bool:
+        return result_id in self._results
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+
+def _head(text: str, limit: int) -> str:
+    """Cut text at the last line break before limit, or at limit if there is none."""
+    head = text[:limit]
+    cut = head.rfind("\n")
+    return head[:cut] if cut > limit // 2 else head
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
+
+from src.agents_library.bm25 import BM25Index
+from src.agents_library.messages import ChatMessage
+
+if TYPE_CHECKING:
+    from litellm import ChatCompletionToolParam
+
+# Recent user messages that make up the retrieval query.
+TOOL_QUERY_USER_MESSAGES = 3
+CHARS_PER_TOKEN = 4
+
+
+def select_tools(
+    tools: list[ChatCompletionToolParam],
+    messages: list[ChatMessage],
+    top_k: int,
+    pinned: Iterable[str] = (),
+) -> tuple[list[ChatCompletionToolParam], int]:
+    """Keep pinned tools, tools used in the conversation and the top_k matches.
+
+    The query is built from the most recent user messages. Returns the selected
+    tools in their original order and the estimated prompt tokens saved by leaving
+    the others out. If the query matches no tool and none is pinned or called yet,
+    all tools are sent rather than none.
+    """
+    if len(tools) <= top_k:
+        return tools, 0
+    keep = set(pinned) | _called_tool_names(messages)
+    index = _tool_index(tuple((_name(tool), _tool_text(tool)) for tool in tools))
+    keep.update(
+        name for name, _ in index.search(_retrieval_query(messages), top_k=top_k)
+    )
+    if not keep:
+        return tools, 0
+    selected = [tool for tool in tools if _name(tool) in keep]
+    dropped_chars = sum(
+        len(json.dumps(tool)) for tool in tools if _name(tool) not in keep
+    )
+    return selected, dropped_chars // CHARS_PER_TOKEN
+
+
+@lru_cache(maxsize=32)
+def _tool_index(documents: tuple[tuple[str, str], ...]) -> BM25Index:
+    index = BM25Index()
+    for name, text in documents:
+        index.add(name, text)
+    return index
+
+
+def _retrieval_query(messages: list[ChatMessage]) -> str:
+    user_messages = [m.content or "" for m in messages if m.role == "user"]
+    return " ".join(user_messages[-TOOL_QUERY_USER_MESSAGES:])
+
+
+def _called_tool_names(messages: list[ChatMessage]) -> set[str]:
+    return {
+        tool_call.name for message in messages for tool_call in message.tool_calls or ()
+    }
+
+
+def _name(tool: ChatCompletionToolParam) -> str:
+    return str(tool["function"]["name"])
+
+
+def _tool_text(tool: ChatCompletionToolParam) -> str:
+    """Name, description and parameter names and docs of a tool schema."""
+    function = tool["function"]
+    parts = [function["name"], function.get("description") or ""]
+    parts.extend(_parameter_docs(function.get("parameters") or {}))
+    return " ".join(parts)
+
+
+def _parameter_docs(schema: dict[str, Any]) -> list[str]:
+    docs: list[str] = []
+    for name, prop in (schema.get("properties") or {}).items():
+        docs.append(name)
+        if isinstance(prop, dict):
+            docs.append(str(prop.get("description") or ""))
+            docs.extend(_parameter_docs(prop))
+            if isinstance(prop.get("items"), dict):
+                docs.extend(_parameter_docs(prop["items"]))
+    return docs
@@ -0,0 +1,148 @@
+import asyncio
+import gzip
+import hashlib
+import json
+import time
+from collections import defaultdict, deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from logging import getLogger
+from pathlib import Path
+from typing import IO, Any, TypeVar
+
+from src.config.settings import CassetteConfig, settings
+
+logger = getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class CassetteMissError(LookupError):
+    """Raised in replay mode when no recorded interaction is left for a request."""
+
+
+@dataclass(frozen=True)
+class Interaction:
+    kind: str
+    key: str
+    seq: int
+    elapsed_seconds: float
+    request: Any
+    response: Any
+
+
+def request_key(kind: str, request: Any) -> str:
+    """Stable hash of a request; the index key of recorded interactions."""
+    canonical = json.dumps(request, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(f"{kind}:{canonical}".encode()).hexdigest()[:32]
+
+
+class Cassette:
+    """Records LLM and MCP interactions to a gzip JSON-lines file and replays them.
+
+    In record mode every call is forwarded and written with its wall-clock duration.
+    In replay mode nothing leaves the process: interactions are looked up by the hash
+    of their request and served in recorded order. A request whose hash was never
+    recorded (a prompt containing the current date, for example) gets the next unused
+    interaction of the same kind, so replays stay deterministic. Playback is instant
+    unless cassette_playback is "realtime", which sleeps for the recorded duration.
+    """
+
+    def __init__(self, config: CassetteConfig) -> None:
+        self.config = config
+        self._writer: IO[str] | None = None
+        self._seq = 0
+        self._by_key: dict[str, deque[Interaction]] | None = None
+        self._by_kind: dict[str, deque[Interaction]] = defaultdict(deque)
+        self._played: set[int] = set()
+
+    @property
+    def replaying(self) -> bool:
+        return self.config.cassette_mode == "replay"
+
+    async def run(
+        self,
+        kind: str,
+        request: Any,
+        call: Callable[[], Awaitable[T]],
+        dump: Callable[[T], Any] = lambda value: value,
+        load: Callable[[Any], T] = lambda value: value,
+    ) -> T:
+        """Forward, record or replay one interaction depending on cassette_mode."""
+        if self.config.cassette_mode == "off":
+            return await call()
+        if self.replaying:
+            interaction = self._next(kind, request)
+            if self.config.cassette_playback == "realtime":
+                await asyncio.sleep(interaction.elapsed_seconds)
+            return load(interaction.response)
+        started = time.perf_counter()
+        result = await call()
+        self._write(kind, request, dump(result), time.perf_counter() - started)
+        return result
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def _write(
+        self, kind: str, request: Any, response: Any, elapsed_seconds: float
+    ) -> None:
+        if self._writer is None:
+            path = Path(self.config.cassette_path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._writer = gzip.open(path, "at", encoding="utf-8")
+        record = {
+            "kind": kind,
+            "key": request_key(kind, request),
+            "seq": self._seq,
+            "elapsed_seconds": round(elapsed_seconds, 6),
+            "request": request,
+            "response": response,
+        }
+        self._seq += 1
+        self._writer.write(json.dumps(record, default=str, separators=(",", ":")))
+        self._writer.write("\n")
+        self._writer.flush()
+
+    def _next(self, kind: str, request: Any) -> Interaction:
+        by_key = self._index()
+        key = request_key(kind, request)
+        for queue in (by_key.get(key), self._by_kind.get(kind)):
+            while queue:
+                interaction = queue.popleft()
+                if interaction.seq not in self._played:
+                    self._played.add(interaction.seq)
+                    if interaction.key != key:
+                        logger.warning(
+                            f"No recorded {kind} interaction matches {key}; "
+                            f"replaying #{interaction.seq} instead"
+                        )
+                    return interaction
+        raise CassetteMissError(f"Cassette has no {kind} interaction left for {key}")
+
+    def _index(self) -> dict[str, deque[Interaction]]:
+        if self._by_key is None:
+            self._by_key = defaultdict(deque)
+            with gzip.open(self.config.cassette_path, "rt", encoding="utf-8") as file:
+                try:
+                    for line_number, line in enumerate(file):
+                        # Line numbers stay unique when several runs appended to a file.
+                        interaction = Interaction(
+                            **{**json.loads(line), "seq": line_number}
+                        )
+                        self._by_key[interaction.key].append(interaction)
+                        self._by_kind[interaction.kind].append(interaction)
+                except EOFError:
+                    logger.warning(
+                        "Cassette was not closed; replaying what was flushed"
+                    )
+            logger.info(
+                f"Loaded {sum(len(q) for q in self._by_kind.values())} interactions "
+                f"from {self.config.cassette_path}"
+            )
+        return self._by_key
+
+
+cassette = Cassette(settings.cassette_config)
@@ -1,25 +1,56 @@
 from __future__ import annotations
 
-from typing import Any
+import asyncio
+import importlib
+from collections.abc import AsyncIterator
+from contextlib import AbstractAsyncContextManager
+from typing import TYPE_CHECKING, Any
 
-import litellm
-from litellm.types.llms.openai import OpenAIWebSearchOptions
 from pydantic import BaseModel
 
+from src.agents_library.deadline import timeout_for
+from src.agents_library.messages import ChatMessage, to_openai_messages
 from src.agents_library.response_types import BaseChatResponse
+from src.api_client.cassette import cassette
+from src.api_client.http_pool import llm_http_pool
+from src.api_client.scheduler import (
+    Priority,
+    Reservation,
+    estimate_prompt_tokens,
+    llm_scheduler,
+)
 from src.config.settings import Settings, settings
 
+if TYPE_CHECKING:
+    import litellm
+
 
 class ChatClient:
-    """Thin wrapper around LiteLLM to call chat completions using app settings."""
+    """Thin wrapper around LiteLLM to call chat completions using app settings.
+
+    Calls pass through the process-wide LLM scheduler; priority and fairness_key
+    decide their place in the queue when the model's rate limits are reached. HTTP
+    connections come from the shared keep-alive pool of the model's endpoint.
+    """
 
-    def __init__(self, settings: Settings) -> None:
+    def __init__(
+        self,
+        settings: Settings,
+        priority: Priority = "interactive",
+        fairness_key: str = "",
+    ) -> None:
         self._settings = settings
         self._config = settings.agent_config
+        self.priority: Priority = priority
+        self.fairness_key = fairness_key
 
-    def chat(
+    async def warm_up(self) -> None:
+        """Import LiteLLM in a worker thread so the first call does not block the loop."""
+        await asyncio.to_thread(importlib.import_module, "litellm")
+
+    async def chat(
         self,
-        messages: list[dict[str, Any]],
+        messages: list[ChatMessage],
         *,
         tools: list[Any] | None = None,
         tool_choice: Any | None = "auto",
@@ -28,7 +59,7 @@ class ChatClient:
         """Call the underlying model and return the raw LiteLLM response.
 
         Args:
-            messages: OpenAI-compatible chat message list.
+            messages: Chat messages; converted to the OpenAI format here.
             tools: Optional OpenAI-compatible tools list.
             tool_choice: Tool choice option (e.g., "auto", "none", or a specific tool spec).
             response_format: Pydantic model to parse the response into.
@@ -36,54 +67,145 @@ class ChatClient:
         Returns:
             The LiteLLM ModelResponse object (OpenAI-style).
         """
+        import litellm
+        from litellm import RateLimitError  # type: ignore[attr-defined]
+
+        kwargs = self._completion_kwargs(
+            messages,
+            tools=tools,
+            tool_choice=tool_choice,
+            response_format=response_format,
+            stream=self._config.stream,
+        )
+
+        async def complete() -> litellm.ModelResponse:
+            async with self._reserve(messages, tools) as reservation:
+                try:
+                    response = await litellm.acompletion(**kwargs)
+                except RateLimitError:
+                    llm_scheduler.throttle(self._config.model)
+                    raise
+                reservation.settle(response)
+            return response
+
+        return await cassette.run(
+            "chat",
+            _cassette_request(kwargs),
+            complete,
+            dump=lambda response: response.model_dump(mode="json"),
+            load=lambda data: litellm.ModelResponse(**data),
+        )
+
+    async def stream_chat(
+        self,
+        messages: list[ChatMessage],
+        *,
+        tools: list[Any] | None = None,
+        tool_choice: Any | None = "auto",
+        response_format: type[BaseModel] = BaseChatResponse,
+    ) -> AsyncIterator[Any]:
+        """Call the model with streaming enabled and yield the raw LiteLLM chunks.
+
+        Takes the same arguments as chat. The request is sent when the iterator is
+        first advanced, so request errors surface on the first iteration. Usage is
+        requested with the stream and settled from the last chunk that reports it.
+        """
+        import litellm
+        from litellm import RateLimitError  # type: ignore[attr-defined]
+
+        kwargs = self._completion_kwargs(
+            messages,
+            tools=tools,
+            tool_choice=tool_choice,
+            response_format=response_format,
+            stream=True,
+        )
+        kwargs["stream_options"] = {"include_usage": True}
+        async with self._reserve(messages, tools) as reservation:
+            try:
+                response = await litellm.acompletion(**kwargs)
+            except RateLimitError:
+                llm_scheduler.throttle(self._config.model)
+                raise
+        usage_chunk = None
+        try:
+            async for chunk in response:
+                if getattr(chunk, "usage", None) is not None:
+                    usage_chunk = chunk
+                yield chunk
+        finally:
+            if usage_chunk is not None:
+                reservation.settle(usage_chunk)
+
+    def _reserve(
+        self, messages: list[ChatMessage], tools: list[Any] | None
+    ) -> AbstractAsyncContextManager[Reservation]:
+        return llm_scheduler.reserve(
+            self._config.model,
+            estimate_prompt_tokens(messages, tools) + self._config.max_tokens,
+            priority=self.priority,
+            fairness_key=self.fairness_key,
+        )
+
+    def _completion_kwargs(
+        self,
+        messages: list[ChatMessage],
+        *,
+        tools: list[Any] | None,
+        tool_choice: Any | None,
+        response_format: type[BaseModel],
+        stream: bool,
+    ) -> dict[str, Any]:
+        from litellm.types.llms.openai import OpenAIWebSearchOptions
+
         if not isinstance(response_format, type(BaseChatResponse)):
             raise ValueError(
                 "response_format is supposed to be inherited from BaseChatResponse"
             )
         cfg = self._config
+        kwargs: dict[str, Any] = {
+            "model": cfg.model,
+            "messages": to_openai_messages(messages),
+            "api_key": cfg.api_key,
+            "max_tokens": cfg.max_tokens,
+            "stop": cfg.stop,
+            "stream": stream,
+            "timeout": timeout_for(cfg.timeout),
+            "api_base": cfg.endpoint or None,
+            "response_format": response_format,
+        }
+        if (client := llm_http_pool.client_for(cfg)) is not None:
+            kwargs["client"] = client
         if "search" in cfg.model.lower():
-            resp = litellm.completion(
-                model=cfg.model,
-                messages=messages,
-                api_key=cfg.api_key,
-                max_tokens=cfg.max_tokens,
-                stop=cfg.stop,
-                stream=cfg.stream,
-                timeout=cfg.timeout,
-                api_base=cfg.endpoint or None,
-                response_format=response_format,
-                web_search_options=OpenAIWebSearchOptions(
-                    search_context_size=cfg.search_context_size
-                )
+            kwargs["web_search_options"] = (
+                OpenAIWebSearchOptions(search_context_size=cfg.search_context_size)
                 if cfg.search_context_size
-                else None,
+                else None
             )
         else:
-            resp = litellm.completion(
-                model=cfg.model,
-                messages=messages,
-                api_key=cfg.api_key,
-                max_tokens=cfg.max_tokens,
-                temperature=cfg.temperature,
-                stop=cfg.stop,
-                stream=cfg.stream,
-                timeout=cfg.timeout,
-                tools=tools,
-                tool_choice=tool_choice if tools else None,
-                api_base=cfg.endpoint or None,
-                response_format=response_format,
-            )
+            kwargs["temperature"] = cfg.temperature
+            kwargs["tools"] = tools
+            kwargs["tool_choice"] = tool_choice if tools else None
+        return kwargs
+
 
-        return resp
+def _cassette_request(kwargs: dict[str, Any]) -> dict[str, Any]:
+    """The parts of a completion request that identify it; credentials are left out."""
+    request = {
+        key: kwargs.get(key)
+        for key in ("model", "messages", "tools", "tool_choice", "temperature")
+    }
+    request["response_format"] = kwargs["response_format"].__name__
+    return request
 
 
 if __name__ == "__main__":
     agent_config = settings.agent_config
     messages = [
-        {"role": "system", "content": "You are a helpful assistant."},
-        {"role": "user", "content": "List 5 important events in the XIX century"},
+        ChatMessage(role="system", content="You are a helpful assistant."),
+        ChatMessage(role="user", content="List 5 important events in the XIX century"),
     ]
     client = ChatClient(settings)
-    resp = client.chat(messages)
+    resp = asyncio.run(client.chat(messages))
 
     print(resp)
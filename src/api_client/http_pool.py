@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import os
+import time
+from dataclasses import dataclass
+from functools import partial
+from logging import getLogger
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlsplit
+
+from src.config.settings import AgentConfig, HttpPoolConfig, settings
+from src.observability.metrics import metrics
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = getLogger(__name__)
+
+# Providers LiteLLM calls through the OpenAI SDK, which accepts a prepared client.
+SDK_PROVIDERS = ("openai", "azure")
+DEFAULT_BASE_URLS = {"openai": "https://api.openai.com/v1"}
+# httpcore trace events that mark the first request bytes on a ready connection.
+_SEND_HEADERS_EVENTS = (
+    "http11.send_request_headers.started",
+    "http2.send_request_headers.started",
+)
+
+
+@dataclass
+class _Pool:
+    name: str
+    base_url: str
+    http_client: httpx.AsyncClient
+    transport: httpx.AsyncHTTPTransport
+    sdk_client: Any
+
+
+class LLMHttpPool:
+    """Long-lived keep-alive HTTP clients for LLM providers, one per (provider, endpoint).
+
+    ChatClient hands the pooled client to LiteLLM, so TCP connections and TLS sessions
+    are reused across calls instead of being set up on the hot path. Pool limits,
+    keep-alive expiry and HTTP/2 come from HttpPoolConfig. Providers LiteLLM does not
+    call through the OpenAI SDK keep LiteLLM's own clients.
+    """
+
+    def __init__(self, config: HttpPoolConfig) -> None:
+        self.config = config
+        self._pools: dict[tuple[str, str], _Pool] = {}
+
+    def client_for(self, agent_config: AgentConfig) -> Any | None:
+        """SDK client to pass to LiteLLM as client=, or None to let LiteLLM decide."""
+        pool = self._pool(agent_config)
+        return pool.sdk_client if pool is not None else None
+
+    async def preconnect(self, agent_configs: list[AgentConfig]) -> None:
+        """Open one keep-alive connection per pool so the first call skips TLS setup."""
+        import httpx
+
+        pools = {id(p): p for c in agent_configs if (p := self._pool(c)) is not None}
+        results = await asyncio.gather(
+            *(p.http_client.head(p.base_url) for p in pools.values()),
+            return_exceptions=True,
+        )
+        for pool, result in zip(pools.values(), results):
+            if isinstance(result, httpx.HTTPError):
+                logger.warning(f"Could not preconnect to {pool.name}: {result!r}")
+        self.publish_stats()
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Open and idle connections per pool."""
+        stats: dict[str, dict[str, int]] = {}
+        for pool in self._pools.values():
+            connections = getattr(
+                getattr(pool.transport, "_pool", None), "connections", []
+            )
+            idle = sum(1 for connection in connections if connection.is_idle())
+            stats[pool.name] = {"connections": len(connections), "idle": idle}
+        return stats
+
+    def publish_stats(self) -> None:
+        for name, pool_stats in self.stats().items():
+            for key, value in pool_stats.items():
+                metrics.set_gauge(f"llm_http_pool_{key}", value, pool=name)
+
+    async def aclose(self) -> None:
+        pools = list(self._pools.values())
+        self._pools.clear()
+        for pool in pools:
+            await pool.http_client.aclose()
+
+    def _pool(self, agent_config: AgentConfig) -> _Pool | None:
+        if not self.config.llm_http_pool_enabled:
+            return None
+        provider = agent_config.model.split("/", 1)[0]
+        key = (provider, agent_config.endpoint)
+        pool = self._pools.get(key)
+        if pool is None and provider in SDK_PROVIDERS:
+            pool = self._create(provider, agent_config)
+            if pool is not None:
+                self._pools[key] = pool
+        return pool
+
+    def _create(self, provider: str, agent_config: AgentConfig) -> _Pool | None:
+        import httpx
+        import openai
+
+        base_url = agent_config.endpoint or (
+            os.getenv("AZURE_API_BASE", "")
+            if provider == "azure"
+            else DEFAULT_BASE_URLS[provider]
+        )
+        api_key = agent_config.api_key
+        if not base_url or not api_key:
+            return None
+        cfg = self.config
+        transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(
+                max_connections=cfg.llm_http_max_connections,
+                max_keepalive_connections=cfg.llm_http_max_keepalive_connections,
+                keepalive_expiry=cfg.llm_http_keepalive_expiry_seconds,
+            ),
+            http2=self._http2(),
+        )
+        name = f"{provider}:{urlsplit(base_url).netloc}"
+        http_client = httpx.AsyncClient(
+            transport=transport,
+            timeout=httpx.Timeout(
+                float(agent_config.timeout),
+                connect=cfg.llm_http_connect_timeout_seconds,
+            ),
+            event_hooks={
+                "request": [_ConnectionTracer(name).on_request],
+                "response": [partial(self._on_response, name)],
+            },
+        )
+        if provider == "azure":
+            sdk_client: Any = openai.AsyncAzureOpenAI(
+                api_key=api_key,
+                azure_endpoint=base_url,
+                api_version=os.getenv("AZURE_API_VERSION") or _azure_api_version(),
+                http_client=http_client,
+            )
+        else:
+            sdk_client = openai.AsyncOpenAI(
+                api_key=api_key, base_url=base_url, http_client=http_client
+            )
+        logger.info(f"Created LLM HTTP pool {name}")
+        return _Pool(name, base_url, http_client, transport, sdk_client)
+
+    async def _on_response(self, name: str, response: httpx.Response) -> None:
+        metrics.inc("llm_http_requests_total", pool=name)
+        self.publish_stats()
+
+    def _http2(self) -> bool:
+        if self.config.llm_http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("llm_http2 is set but h2 is not installed; using HTTP/1.1")
+            return False
+        return self.config.llm_http2
+
+
+class _ConnectionTracer:
+    """Counts new connections of a pool and the time spent on TCP and TLS setup."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    async def on_request(self, request: httpx.Request) -> None:
+        connect_started: list[float] = []
+
+        async def trace(event_name: str, info: dict[str, Any]) -> None:
+            if event_name == "connection.connect_tcp.started":
+                connect_started.append(time.perf_counter())
+            elif event_name in _SEND_HEADERS_EVENTS and connect_started:
+                metrics.inc("llm_http_connections_opened_total", pool=self.name)
+                metrics.inc(
+                    "llm_http_connect_seconds_total",
+                    time.perf_counter() - connect_started.pop(),
+                    pool=self.name,
+                )
+
+        request.extensions["trace"] = trace
+
+
+def _azure_api_version() -> str:
+    import litellm
+
+    return str(litellm.AZURE_DEFAULT_API_VERSION)
+
+
+llm_http_pool = LLMHttpPool(settings.http_pool_config)
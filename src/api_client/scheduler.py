@@ -0,0 +1,244 @@
+import asyncio
+import json
+import time
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from logging import getLogger
+from typing import Any, Literal
+
+from src.agents_library.messages import ChatMessage
+from src.config.settings import RateLimitConfig, settings
+from src.observability.metrics import metrics
+
+logger = getLogger(__name__)
+
+Priority = Literal["interactive", "batch", "nested"]
+
+PRIORITY_ORDER: tuple[Priority, ...] = ("interactive", "batch", "nested")
+CHARS_PER_TOKEN = 4
+
+
+def estimate_prompt_tokens(
+    messages: list[ChatMessage], tools: list[Any] | None = None
+) -> int:
+    """Rough prompt size: about four characters per token, tool schemas included."""
+    chars = sum(len(message.content or "") for message in messages)
+    for message in messages:
+        for tool_call in message.tool_calls or ():
+            chars += len(tool_call.name) + len(tool_call.arguments)
+    if tools:
+        chars += len(json.dumps(tools))
+    return chars // CHARS_PER_TOKEN + 1
+
+
+@dataclass
+class _TokenBucket:
+    """Per-minute budget refilled continuously; level may go negative to record debt."""
+
+    per_minute: int
+    level: float = 0.0
+    updated_at: float = field(default_factory=time.monotonic)
+
+    def __post_init__(self) -> None:
+        self.level = float(self.per_minute)
+
+    def refill(self, now: float) -> None:
+        elapsed = now - self.updated_at
+        self.level = min(
+            float(self.per_minute), self.level + elapsed * self.per_minute / 60
+        )
+        self.updated_at = now
+
+    def seconds_until(self, amount: float) -> float:
+        missing = min(amount, self.per_minute) - self.level
+        return max(0.0, missing * 60 / self.per_minute)
+
+
+@dataclass
+class _Waiter:
+    tokens: int
+    future: asyncio.Future[None]
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class _ModelQueue:
+    requests: _TokenBucket | None
+    tokens: _TokenBucket | None
+    # priority -> fairness key -> waiters of that key, served round-robin
+    waiting: dict[Priority, OrderedDict[str, deque[_Waiter]]] = field(
+        default_factory=lambda: {priority: OrderedDict() for priority in PRIORITY_ORDER}
+    )
+    wake_up: asyncio.TimerHandle | None = None
+
+    def size(self) -> int:
+        return sum(
+            len(waiters)
+            for by_key in self.waiting.values()
+            for waiters in by_key.values()
+        )
+
+
+class LLMScheduler:
+    """Process-wide gate in front of provider calls that respects RPM and TPM limits.
+
+    Every model with a configured limit gets a request bucket and a token bucket.
+    A call reserves one request and its estimated tokens (prompt estimate plus
+    max_tokens) and waits until both buckets can pay. Waiting calls are served by
+    priority (interactive, then batch, then nested) and round-robin across fairness
+    keys, so one busy conversation cannot starve the others. After the call the
+    reservation is settled against the reported usage. Models without limits skip
+    the scheduler entirely.
+    """
+
+    def __init__(self, config: RateLimitConfig) -> None:
+        self.config = config
+        self._queues: dict[str, _ModelQueue] = {}
+
+    @asynccontextmanager
+    async def reserve(
+        self,
+        model: str,
+        estimated_tokens: int,
+        priority: Priority = "interactive",
+        fairness_key: str = "",
+    ) -> AsyncIterator["Reservation"]:
+        """Wait for capacity, then yield a reservation to settle with real usage."""
+        queue = self._queue(model)
+        reservation = Reservation(self, model, estimated_tokens)
+        if queue is None:
+            yield reservation
+            return
+        await self._wait_for_turn(
+            model, queue, estimated_tokens, priority, fairness_key
+        )
+        yield reservation
+
+    def settle(self, model: str, reserved_tokens: int, used_tokens: int) -> None:
+        """Refund or charge the difference between reserved and used tokens."""
+        queue = self._queues.get(model)
+        if queue is None or queue.tokens is None:
+            return
+        queue.tokens.refill(time.monotonic())
+        charged = min(reserved_tokens, queue.tokens.per_minute)
+        queue.tokens.level += charged - used_tokens
+        self._dispatch(model)
+
+    def throttle(self, model: str) -> None:
+        """Empty the request bucket after the provider answered 429 anyway."""
+        queue = self._queues.get(model)
+        if queue is None or queue.requests is None:
+            return
+        queue.requests.refill(time.monotonic())
+        queue.requests.level = min(queue.requests.level, 0.0)
+        metrics.inc("llm_scheduler_provider_throttled_total", model=model)
+
+    async def _wait_for_turn(
+        self,
+        model: str,
+        queue: _ModelQueue,
+        estimated_tokens: int,
+        priority: Priority,
+        fairness_key: str,
+    ) -> None:
+        waiter = _Waiter(estimated_tokens, asyncio.get_running_loop().create_future())
+        queue.waiting[priority].setdefault(fairness_key, deque()).append(waiter)
+        self._dispatch(model)
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            self._remove(queue, priority, fairness_key, waiter)
+            self._dispatch(model)
+            raise
+        waited = time.monotonic() - waiter.enqueued_at
+        metrics.inc("llm_scheduler_wait_seconds_total", waited, model=model)
+        metrics.inc("llm_scheduler_granted_total", model=model, priority=priority)
+
+    def _dispatch(self, model: str) -> None:
+        """Grant waiting calls in order while both buckets can pay for the next one."""
+        queue = self._queues[model]
+        if queue.wake_up is not None:
+            queue.wake_up.cancel()
+            queue.wake_up = None
+        now = time.monotonic()
+        for bucket in (queue.requests, queue.tokens):
+            if bucket is not None:
+                bucket.refill(now)
+        while (head := self._next_waiter(queue)) is not None:
+            by_key, fairness_key, waiter = head
+            wait = max(
+                queue.requests.seconds_until(1) if queue.requests else 0.0,
+                queue.tokens.seconds_until(waiter.tokens) if queue.tokens else 0.0,
+            )
+            if wait > 0:
+                loop = asyncio.get_running_loop()
+                queue.wake_up = loop.call_later(wait, self._dispatch, model)
+                break
+            by_key[fairness_key].popleft()
+            if by_key[fairness_key]:
+                by_key.move_to_end(fairness_key)
+            else:
+                del by_key[fairness_key]
+            if queue.requests is not None:
+                queue.requests.level -= 1
+            if queue.tokens is not None:
+                queue.tokens.level -= min(waiter.tokens, queue.tokens.per_minute)
+            waiter.future.set_result(None)
+        metrics.set_gauge("llm_scheduler_queue_depth", queue.size(), model=model)
+
+    @staticmethod
+    def _next_waiter(
+        queue: _ModelQueue,
+    ) -> tuple[OrderedDict[str, deque[_Waiter]], str, _Waiter] | None:
+        for priority in PRIORITY_ORDER:
+            by_key = queue.waiting[priority]
+            if by_key:
+                fairness_key, waiters = next(iter(by_key.items()))
+                return by_key, fairness_key, waiters[0]
+        return None
+
+    @staticmethod
+    def _remove(
+        queue: _ModelQueue, priority: Priority, fairness_key: str, waiter: _Waiter
+    ) -> None:
+        waiters = queue.waiting[priority].get(fairness_key)
+        if waiters is None or waiter not in waiters:
+            return
+        waiters.remove(waiter)
+        if not waiters:
+            del queue.waiting[priority][fairness_key]
+
+    def _queue(self, model: str) -> _ModelQueue | None:
+        if model in self._queues:
+            return self._queues[model]
+        rpm = self.config.model_requests_per_minute.get(model)
+        tpm = self.config.model_tokens_per_minute.get(model)
+        if rpm is None and tpm is None:
+            return None
+        self._queues[model] = _ModelQueue(
+            requests=_TokenBucket(rpm) if rpm else None,
+            tokens=_TokenBucket(tpm) if tpm else None,
+        )
+        return self._queues[model]
+
+
+@dataclass
+class Reservation:
+    scheduler: LLMScheduler
+    model: str
+    reserved_tokens: int
+    settled: bool = False
+
+    def settle(self, response: Any) -> None:
+        """Adjust the token bucket once with the usage reported on a response or chunk."""
+        usage = getattr(response, "usage", None)
+        total_tokens = getattr(usage, "total_tokens", None)
+        if self.settled or total_tokens is None:
+            return
+        self.settled = True
+        self.scheduler.settle(self.model, self.reserved_tokens, int(total_tokens))
+
+
+llm_scheduler = LLMScheduler(settings.rate_limit_config)
@@ -0,0 +1,77 @@
+import bisect
+import hashlib
+from collections.abc import Iterable, Iterator
+
+DEFAULT_VIRTUAL_NODES = 128
+
+
+def hash_key(key: str) -> int:
+    """Stable 64-bit position of a key on the ring, equal in every process."""
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent-hash ring mapping keys such as correlation ids to nodes.
+
+    Every node is placed at virtual_nodes positions, so keys spread evenly and adding
+    or removing a node only moves the keys of the ring segments it gains or loses,
+    about 1/N of them.
+    """
+
+    def __init__(
+        self, nodes: Iterable[str] = (), virtual_nodes: int = DEFAULT_VIRTUAL_NODES
+    ) -> None:
+        self.virtual_nodes = virtual_nodes
+        self._positions: list[int] = []
+        self._owners: list[str] = []
+        self._nodes: set[str] = set()
+        for node in nodes:
+            self.add(node)
+
+    def add(self, node: str) -> None:
+        if node in self._nodes:
+            return
+        self._nodes.add(node)
+        for replica in range(self.virtual_nodes):
+            position = hash_key(f"{node}#{replica}")
+            index = bisect.bisect(self._positions, position)
+            self._positions.insert(index, position)
+            self._owners.insert(index, node)
+
+    def remove(self, node: str) -> None:
+        if node not in self._nodes:
+            return
+        self._nodes.discard(node)
+        kept = [(p, o) for p, o in zip(self._positions, self._owners) if o != node]
+        self._positions = [position for position, _ in kept]
+        self._owners = [owner for _, owner in kept]
+
+    def owner(self, key: str) -> str:
+        """Node responsible for key; raises LookupError on an empty ring."""
+        for node in self.preference(key):
+            return node
+        raise LookupError("Hash ring has no nodes")
+
+    def preference(self, key: str) -> Iterator[str]:
+        """Distinct nodes in ring order starting at key's position, owner first."""
+        if not self._positions:
+            return
+        start = bisect.bisect(self._positions, hash_key(key))
+        seen: set[str] = set()
+        for offset in range(len(self._owners)):
+            node = self._owners[(start + offset) % len(self._owners)]
+            if node not in seen:
+                seen.add(node)
+                yield node
+                if len(seen) == len(self._nodes):
+                    return
+
+    @property
+    def nodes(self) -> frozenset[str]:
+        return frozenset(self._nodes)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, node: object) -> bool:
+        return node in self._nodes
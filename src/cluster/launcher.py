@@ -0,0 +1,158 @@
+"""Run several worker processes of an ASGI app behind the session-affine front router.
+
+Run from the repository root:
+
+    poetry run python -m src.cluster.launcher --workers 4 --port 8000
+
+Each worker is a separate uvicorn process on its own port. A worker joins the
+consistent-hash ring once its health check answers and leaves it when it stops
+answering or exits; exited workers are restarted.
+"""
+
+import argparse
+import asyncio
+import subprocess
+import sys
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from logging import getLogger
+
+import httpx
+
+from src.cluster.proxy import create_proxy_app
+from src.cluster.routing import SessionRouter
+from src.config.settings import ClusterConfig, settings
+
+logger = getLogger(__name__)
+
+WORKER_START_TIMEOUT_SECONDS = 120.0
+
+
+@dataclass
+class WorkerProcess:
+    app: str
+    port: int
+    factory: bool = False
+    process: subprocess.Popen[bytes] | None = field(default=None, repr=False)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self) -> None:
+        command = [sys.executable, "-m", "uvicorn", self.app, "--port", str(self.port)]
+        if self.factory:
+            command.append("--factory")
+        self.process = subprocess.Popen(command)
+        logger.info(f"Started worker {self.url} (pid {self.process.pid})")
+
+    def exited(self) -> bool:
+        return self.process is None or self.process.poll() is not None
+
+    def stop(self) -> None:
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+
+class Supervisor:
+    """Keeps worker processes running and the ring in sync with healthy workers."""
+
+    def __init__(
+        self,
+        workers: list[WorkerProcess],
+        router: SessionRouter,
+        config: ClusterConfig,
+        health_path: str = "/health",
+    ) -> None:
+        self.workers = workers
+        self.router = router
+        self.config = config
+        self.health_path = health_path
+
+    @asynccontextmanager
+    async def run(self) -> AsyncIterator[None]:
+        for worker in self.workers:
+            worker.start()
+        async with httpx.AsyncClient(timeout=2.0) as client:
+            await self._wait_for_first_worker(client)
+            task = asyncio.create_task(self._supervise(client))
+            try:
+                yield
+            finally:
+                task.cancel()
+                for worker in self.workers:
+                    worker.stop()
+
+    async def _wait_for_first_worker(self, client: httpx.AsyncClient) -> None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + WORKER_START_TIMEOUT_SECONDS
+        while not len(self.router.ring):
+            if loop.time() > deadline:
+                raise TimeoutError("No worker became healthy")
+            await self._check(client)
+            await asyncio.sleep(0.1)
+
+    async def _supervise(self, client: httpx.AsyncClient) -> None:
+        while True:
+            await asyncio.sleep(self.config.cluster_health_interval_seconds)
+            await self._check(client)
+
+    async def _check(self, client: httpx.AsyncClient) -> None:
+        healthy = await asyncio.gather(
+            *(self._healthy(client, worker) for worker in self.workers)
+        )
+        for worker, ok in zip(self.workers, healthy):
+            if ok and worker.url not in self.router.ring:
+                self.router.add_worker(worker.url)
+            elif not ok and worker.url in self.router.ring:
+                self.router.remove_worker(worker.url)
+            if worker.exited():
+                logger.warning(f"Worker {worker.url} exited; restarting it")
+                worker.start()
+
+    async def _healthy(self, client: httpx.AsyncClient, worker: WorkerProcess) -> bool:
+        if worker.exited():
+            return False
+        try:
+            response = await client.get(worker.url + self.health_path)
+        except httpx.HTTPError:
+            return False
+        return response.status_code == 200
+
+
+def main() -> None:
+    import uvicorn
+
+    args = _parse_args()
+    config = settings.cluster_config
+    workers = [
+        WorkerProcess(args.app, config.cluster_worker_base_port + i, args.factory)
+        for i in range(args.workers)
+    ]
+    router = SessionRouter([], config)
+    supervisor = Supervisor(workers, router, config, args.health_path)
+    app = create_proxy_app(
+        router, config.cluster_proxy_timeout_seconds, supervisor=supervisor.run
+    )
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+def _parse_args() -> argparse.Namespace:
+    config = settings.cluster_config
+    parser = argparse.ArgumentParser(description="Multi-worker launcher")
+    parser.add_argument("--workers", type=int, default=config.cluster_workers)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--app", default="main:app")
+    parser.add_argument("--factory", action="store_true")
+    parser.add_argument("--health-path", default="/health")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+"""Front router that forwards HTTP and WebSocket traffic to the worker of a session."""
+
+import asyncio
+import json
+import re
+from collections.abc import AsyncIterator, Callable
+from contextlib import (
+    AbstractAsyncContextManager,
+    AsyncExitStack,
+    ExitStack,
+    asynccontextmanager,
+)
+from dataclasses import dataclass
+from logging import getLogger
+from urllib.parse import urlencode
+
+import httpx
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import (
+    JSONResponse,
+    PlainTextResponse,
+    Response,
+    StreamingResponse,
+)
+from starlette.routing import Route, WebSocketRoute
+from starlette.websockets import WebSocket, WebSocketDisconnect
+from websockets.asyncio.client import connect
+from websockets.exceptions import ConnectionClosed
+
+from src.cluster.routing import SessionRouter
+from src.observability.metrics import metrics
+
+logger = getLogger(__name__)
+
+HOP_BY_HOP_HEADERS = frozenset(
+    {
+        "connection",
+        "keep-alive",
+        "proxy-authenticate",
+        "proxy-authorization",
+        "te",
+        "trailers",
+        "transfer-encoding",
+        "upgrade",
+        "host",
+        "content-length",
+    }
+)
+# Turn endpoints whose JSON body carries the correlation_id of a session.
+SESSION_POST_PATH = re.compile(r"^/api/(agents|jobs)/(?!fanout$)[^/]+$")
+MEMORY_PATH = re.compile(r"^/api/agents/memory/[^/]+/(?P<cid>[^/]+)$")
+JOB_PATH = re.compile(r"^/api/jobs/(?P<job_id>[^/]+)$")
+AGENT_SOCKET_PATH = re.compile(r"^/api/agents/ws/[^/]+$")
+STATELESS_PATHS = frozenset({"/api/agents/fanout"})
+
+
+@dataclass
+class Target:
+    worker: str
+    route: str
+    body: bytes = b""
+
+
+def create_proxy_app(
+    router: SessionRouter,
+    timeout_seconds: float,
+    supervisor: Callable[[], AbstractAsyncContextManager[None]] | None = None,
+) -> Starlette:
+    """Build the ASGI front router; supervisor runs for the app's lifetime."""
+    client = httpx.AsyncClient(
+        timeout=httpx.Timeout(timeout_seconds, connect=5.0),
+        limits=httpx.Limits(max_connections=None, max_keepalive_connections=256),
+    )
+
+    async def forward(request: Request) -> Response:
+        try:
+            target = await _http_target(router, request)
+        except LookupError as e:
+            return JSONResponse({"detail": str(e)}, status_code=503)
+        if target.route == "job_poll":
+            return await _poll_job(router, client, request)
+        # The request stays in flight until its response body is fully streamed.
+        with ExitStack() as in_flight:
+            in_flight.enter_context(router.track(target.worker, target.route))
+            try:
+                upstream = await _send(client, target.worker, request, target.body)
+            except httpx.HTTPError as e:
+                return _bad_gateway(target.worker, e)
+            if request.method == "POST" and request.url.path.startswith("/api/jobs/"):
+                try:
+                    await upstream.aread()
+                except httpx.HTTPError as e:
+                    await upstream.aclose()
+                    return _bad_gateway(target.worker, e)
+                _remember_job(router, upstream, target.worker)
+            return _streamed(upstream, in_flight.pop_all().close)
+
+    async def forward_socket(websocket: WebSocket) -> None:
+        try:
+            worker, query = _socket_target(router, websocket)
+        except LookupError:
+            await websocket.close(code=1013)
+            return
+        with router.track(worker, "socket"):
+            await _pump_socket(websocket, worker, query)
+
+    async def workers(request: Request) -> JSONResponse:
+        return JSONResponse(
+            {worker: router.in_flight.get(worker, 0) for worker in router.ring.nodes}
+        )
+
+    async def export_metrics(request: Request) -> PlainTextResponse:
+        return PlainTextResponse(metrics.render_prometheus())
+
+    @asynccontextmanager
+    async def lifespan(app: Starlette) -> AsyncIterator[None]:
+        async with AsyncExitStack() as stack:
+            stack.push_async_callback(client.aclose)
+            if supervisor is not None:
+                await stack.enter_async_context(supervisor())
+            yield
+
+    return Starlette(
+        routes=[
+            Route("/cluster/workers", workers),
+            Route("/cluster/metrics", export_metrics),
+            WebSocketRoute("/{path:path}", forward_socket),
+            Route(
+                "/{path:path}",
+                forward,
+                methods=["GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"],
+            ),
+        ],
+        lifespan=lifespan,
+    )
+
+
+async def _http_target(router: SessionRouter, request: Request) -> Target:
+    path = request.url.path
+    if match := MEMORY_PATH.match(path):
+        return Target(router.worker_for_session(match["cid"]), "session")
+    if request.method in ("GET", "DELETE") and JOB_PATH.match(path):
+        return Target("", "job_poll")
+    body = await request.body()
+    if path in STATELESS_PATHS:
+        return Target(router.least_loaded(), "stateless", body)
+    if request.method == "POST" and SESSION_POST_PATH.match(path):
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            payload = None
+        if isinstance(payload, dict):
+            if correlation_id := payload.get("correlation_id"):
+                return Target(
+                    router.worker_for_session(correlation_id), "session", body
+                )
+            worker, payload["correlation_id"] = router.new_session()
+            return Target(worker, "new_session", json.dumps(payload).encode())
+    return Target(router.worker_for_session(_client_key(request)), "client", body)
+
+
+def _socket_target(router: SessionRouter, websocket: WebSocket) -> tuple[str, str]:
+    params = dict(websocket.query_params)
+    if AGENT_SOCKET_PATH.match(websocket.url.path):
+        if correlation_id := params.get("correlation_id"):
+            return router.worker_for_session(correlation_id), urlencode(params)
+        worker, params["correlation_id"] = router.new_session()
+        return worker, urlencode(params)
+    # Other sockets (the chat UI) stick to one worker per client address.
+    return router.worker_for_session(_client_key(websocket)), urlencode(params)
+
+
+def _client_key(connection: Request | WebSocket) -> str:
+    forwarded = connection.headers.get("x-forwarded-for")
+    if forwarded:
+        return forwarded.split(",")[0].strip()
+    return connection.client.host if connection.client else ""
+
+
+async def _send(
+    client: httpx.AsyncClient, worker: str, request: Request, body: bytes
+) -> httpx.Response:
+    upstream_request = client.build_request(
+        request.method,
+        f"{worker}{request.url.path}",
+        params=request.url.query,
+        headers=_forward_headers(request),
+        content=body,
+    )
+    return await client.send(upstream_request, stream=True)
+
+
+async def _poll_job(
+    router: SessionRouter, client: httpx.AsyncClient, request: Request
+) -> Response:
+    """Send a job poll to the worker running the job, or ask each worker in turn.
+
+    Workers that cannot be reached are skipped; 502 only if none answered.
+    """
+    job_id = request.path_params["path"].rsplit("/", 1)[-1]
+    known = router.worker_for_job(job_id)
+    candidates = [known] if known else list(router.ring.nodes)
+    if not candidates:
+        return JSONResponse({"detail": "No worker is available"}, status_code=503)
+    upstream: httpx.Response | None = None
+    failure: JSONResponse | None = None
+    for worker in candidates:
+        try:
+            with router.track(worker, "job"):
+                response = await _send(client, worker, request, b"")
+        except httpx.HTTPError as e:
+            failure = _bad_gateway(worker, e)
+            continue
+        if upstream is not None:
+            await upstream.aclose()
+        upstream = response
+        if upstream.status_code != 404:
+            router.remember_job(job_id, worker)
+            break
+    if upstream is None:
+        assert failure is not None
+        return failure
+    return _streamed(upstream)
+
+
+def _bad_gateway(worker: str, error: httpx.HTTPError) -> JSONResponse:
+    logger.warning(f"Request to {worker} failed: {error!r}")
+    metrics.inc("cluster_upstream_errors_total", worker=worker)
+    return JSONResponse({"detail": f"Worker {worker} did not answer"}, status_code=502)
+
+
+def _remember_job(router: SessionRouter, upstream: httpx.Response, worker: str) -> None:
+    if upstream.status_code != 202:
+        return
+    try:
+        router.remember_job(upstream.json()["job_id"], worker)
+    except (ValueError, KeyError):
+        logger.warning("Job submission answered without a job id")
+
+
+def _streamed(
+    upstream: httpx.Response, on_close: Callable[[], None] | None = None
+) -> Response:
+    """Relay an upstream response; on_close runs once its body is done or abandoned."""
+    headers = {
+        key: value
+        for key, value in upstream.headers.items()
+        if key.lower() not in HOP_BY_HOP_HEADERS
+    }
+    if upstream.is_stream_consumed:
+        # Read by the router already; the body is decoded, so drop its encoding.
+        headers.pop("content-encoding", None)
+        if on_close is not None:
+            on_close()
+        return Response(upstream.content, upstream.status_code, headers)
+
+    async def body() -> AsyncIterator[bytes]:
+        try:
+            async for chunk in upstream.aiter_raw():
+                yield chunk
+        finally:
+            await upstream.aclose()
+            if on_close is not None:
+                on_close()
+
+    return StreamingResponse(body(), upstream.status_code, headers)
+
+
+def _forward_headers(connection: Request | WebSocket) -> dict[str, str]:
+    headers = {
+        key: value
+        for key, value in connection.headers.items()
+        if key.lower() not in HOP_BY_HOP_HEADERS
+        and not key.lower().startswith("sec-websocket")
+    }
+    if connection.client:
+        headers["x-forwarded-for"] = connection.client.host
+    return headers
+
+
+async def _pump_socket(websocket: WebSocket, worker: str, query: str) -> None:
+    url = "ws" + worker.removeprefix("http") + websocket.url.path
+    subprotocols = websocket.scope.get("subprotocols") or None
+    try:
+        upstream = await connect(
+            f"{url}?{query}" if query else url,
+            additional_headers=_forward_headers(websocket),
+            subprotocols=subprotocols,
+        )
+    except (OSError, ConnectionClosed) as e:
+        logger.warning(f"Could not open WebSocket to {worker}: {e!r}")
+        await websocket.close(code=1011)
+        return
+    await websocket.accept(subprotocol=upstream.subprotocol)
+
+    async def client_to_worker() -> None:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            await upstream.send(message.get("text") or message.get("bytes") or "")
+
+    async def worker_to_client() -> None:
+        async for message in upstream:
+            if isinstance(message, bytes):
+                await websocket.send_bytes(message)
+            else:
+                await websocket.send_text(message)
+
+    tasks = [
+        asyncio.create_task(client_to_worker()),
+        asyncio.create_task(worker_to_client()),
+    ]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await upstream.close()
+        try:
+            await websocket.close()
+        except (RuntimeError, WebSocketDisconnect):
+            pass
@@ -0,0 +1,87 @@
+import random
+import uuid
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from logging import getLogger
+
+from src.cluster.hash_ring import HashRing
+from src.config.settings import ClusterConfig
+from src.observability.metrics import metrics
+
+logger = getLogger(__name__)
+
+# Candidate ids tried per worker before a new session falls back to its hash owner.
+MINT_ATTEMPTS_PER_WORKER = 64
+
+
+class SessionRouter:
+    """Picks the worker process for each request of a multi-worker deployment.
+
+    Conversation memory lives in the worker that created it, so requests carrying a
+    correlation_id always go to the owner of that id on a consistent-hash ring; when
+    workers join or leave only the sessions of the changed ring segments move. New
+    sessions go to the worker with the fewest in-flight requests: the router mints a
+    correlation_id that hashes to that worker, so later turns find it without any
+    shared session table.
+    """
+
+    def __init__(self, workers: Iterable[str], config: ClusterConfig) -> None:
+        self.config = config
+        self.ring = HashRing(workers, virtual_nodes=config.cluster_virtual_nodes)
+        self.in_flight: dict[str, int] = dict.fromkeys(self.ring.nodes, 0)
+        self._job_owners: OrderedDict[str, str] = OrderedDict()
+
+    def add_worker(self, worker: str) -> None:
+        self.ring.add(worker)
+        self.in_flight.setdefault(worker, 0)
+        metrics.set_gauge("cluster_workers", len(self.ring))
+        logger.info(f"Worker {worker} joined the ring")
+
+    def remove_worker(self, worker: str) -> None:
+        self.ring.remove(worker)
+        metrics.set_gauge("cluster_workers", len(self.ring))
+        logger.warning(f"Worker {worker} left the ring")
+
+    def worker_for_session(self, correlation_id: str) -> str:
+        return self.ring.owner(correlation_id)
+
+    def new_session(self) -> tuple[str, str]:
+        """Return the least loaded worker and a fresh correlation_id it owns."""
+        worker = self.least_loaded()
+        for _ in range(MINT_ATTEMPTS_PER_WORKER * len(self.ring)):
+            correlation_id = str(uuid.uuid4())
+            if self.ring.owner(correlation_id) == worker:
+                return worker, correlation_id
+        return self.ring.owner(correlation_id), correlation_id
+
+    def least_loaded(self) -> str:
+        workers = list(self.ring.nodes)
+        if not workers:
+            raise LookupError("No worker is available")
+        random.shuffle(workers)
+        return min(workers, key=lambda worker: self.in_flight.get(worker, 0))
+
+    def remember_job(self, job_id: str, worker: str) -> None:
+        self._job_owners[job_id] = worker
+        self._job_owners.move_to_end(job_id)
+        while len(self._job_owners) > self.config.cluster_job_owner_cache_size:
+            self._job_owners.popitem(last=False)
+
+    def worker_for_job(self, job_id: str) -> str | None:
+        worker = self._job_owners.get(job_id)
+        return worker if worker in self.ring else None
+
+    @contextmanager
+    def track(self, worker: str, route: str) -> Iterator[None]:
+        """Count a request as in flight on worker while the block runs."""
+        self.in_flight[worker] = self.in_flight.get(worker, 0) + 1
+        metrics.inc("cluster_requests_total", worker=worker, route=route)
+        metrics.set_gauge("cluster_in_flight", self.in_flight[worker], worker=worker)
+        try:
+            yield
+        finally:
+            self.in_flight[worker] -= 1
+            metrics.set_gauge(
+                "cluster_in_flight", self.in_flight[worker], worker=worker
+            )
@@ -16,7 +16,215 @@ class ChatBotConfig(BaseSettings):
 
 
 class MCPClientConfig(ChatBotConfig):
+    """Connection to the MCP server.
+
+    - tool_catalog_ttl_seconds: How long the process-wide tool list is reused before it is fetched again.
+    - tool_catalog_min_refresh_seconds: Minimum age before a catalog missing a requested tool is refetched.
+    - tool_progress_interval_seconds: Minimum gap between progress notifications an agent tool sends while its nested agent streams.
+    - show_tool_progress_in_chainlit: Show running tools and their partial answers as steps in the Chainlit chat.
+    """
+
     mcp_server_url: str = "http://localhost:8001/mcp"
+    tool_catalog_ttl_seconds: float = 300.0
+    tool_catalog_min_refresh_seconds: float = 5.0
+    tool_progress_interval_seconds: float = 0.25
+    show_tool_progress_in_chainlit: bool = True
+
+
+class AdmissionConfig(ChatBotConfig):
+    """Limits applied before an agent turn is allowed to start.
+
+    - global_max_in_flight: Agent turns running at the same time across all agents.
+    - per_agent_max_in_flight: Default limit per agent; agent_config.yaml may override it with max_in_flight.
+    - max_queue_size: Requests allowed to wait for a free slot; beyond that they are rejected with 429.
+    - queue_timeout_seconds: Longest time a request may wait in the queue before it is rejected with 503.
+    - retry_after_seconds: Value sent back in the Retry-After header of rejected requests.
+    """
+
+    global_max_in_flight: int = 32
+    per_agent_max_in_flight: int = 8
+    max_queue_size: int = 64
+    queue_timeout_seconds: float = 10.0
+    retry_after_seconds: int = 5
+
+
+class ToolExecutorConfig(ChatBotConfig):
+    """Process pools of CPU-bound MCP tools (mcp_server/tool_executor.py).
+
+    - tool_default_max_workers: Worker processes of a CPU-bound tool that does not set its own limit.
+    - tool_default_timeout_seconds: Time limit of one call; the tool's processes are replaced when it passes.
+    - tool_shared_memory_threshold_bytes: bytes arguments and results at least this large go through shared memory instead of the pipe.
+    """
+
+    tool_default_max_workers: int = 2
+    tool_default_timeout_seconds: float = 60.0
+    tool_shared_memory_threshold_bytes: int = 1_048_576
+
+
+class PdfToolConfig(ChatBotConfig):
+    """The search_pdf MCP tool.
+
+    - pdf_document_root: Directory the tool reads PDFs from; paths resolve inside it.
+    - pdf_cache_dir: Extracted chunks are cached here, keyed by the file's SHA-256.
+    - pdf_pages_per_task: Pages extracted by one worker task.
+    - pdf_max_workers: Extraction processes. Default: None (one per CPU).
+    - pdf_chunk_words: Words per chunk.
+    - pdf_chunk_overlap_words: Words a chunk repeats from the end of the previous one.
+    - pdf_top_k: Chunks returned per query.
+    """
+
+    pdf_document_root: str = "documents"
+    pdf_cache_dir: str = "cache/pdf"
+    pdf_pages_per_task: int = 16
+    pdf_max_workers: int | None = None
+    pdf_chunk_words: int = 200
+    pdf_chunk_overlap_words: int = 40
+    pdf_top_k: int = 5
+
+
+class SqlToolConfig(ChatBotConfig):
+    """The query_sql MCP tool; it is only registered when sql_url is set.
+
+    - sql_url: SQLAlchemy URL of the database, e.g. databricks://... or sqlite:///local.db.
+    - sql_pool_size: Connections kept open in the pool.
+    - sql_max_overflow: Extra connections opened under load and closed when returned.
+    - sql_pool_pre_ping: Test a pooled connection before use and replace it if it died.
+    - sql_pool_recycle_seconds: Replace pooled connections older than this.
+    - sql_statement_cache_size: Compiled statements kept per engine, so repeated queries skip compilation.
+    - sql_fetch_batch_rows: Rows fetched from the server-side cursor at a time.
+    - sql_max_rows: Most rows one call returns; the rest is never fetched.
+    - sql_max_bytes: Most bytes of CSV one call returns.
+    - sql_timeout_seconds: Statement timeout of one query, capped by the request deadline.
+    """
+
+    sql_url: str | None = None
+    sql_pool_size: int = 5
+    sql_max_overflow: int = 5
+    sql_pool_pre_ping: bool = True
+    sql_pool_recycle_seconds: int = 1800
+    sql_statement_cache_size: int = 500
+    sql_fetch_batch_rows: int = 500
+    sql_max_rows: int = 1000
+    sql_max_bytes: int = 262_144
+    sql_timeout_seconds: float = 60.0
+
+
+class DeadlineConfig(ChatBotConfig):
+    """Deadlines and cancellation of agent turns.
+
+    - request_deadline_seconds: Longest a turn may run, including nested agent tools; requests may ask for less.
+    - disconnect_poll_interval_seconds: How often a running REST turn checks whether its client is still connected.
+    """
+
+    request_deadline_seconds: float = 300.0
+    disconnect_poll_interval_seconds: float = 0.5
+
+
+class JobConfig(ChatBotConfig):
+    """Background job execution for long-running agent queries.
+
+    - job_workers: Jobs executed at the same time.
+    - job_max_pending: Jobs allowed to wait for a worker; more submissions are rejected with 429.
+    - job_result_ttl_seconds: How long finished jobs and their results are kept.
+    - job_callback_timeout_seconds: Timeout of the optional completion callback request.
+    - job_max_wait_seconds: Upper bound for long-polling a job status.
+    - job_callback_allowed_hosts: Hosts a callback_url may point to; jobs with other callback hosts are rejected with 422. Empty disables callbacks.
+    - job_admission_max_attempts: Admission attempts per job before it fails instead of waiting for capacity again.
+    """
+
+    job_workers: int = 4
+    job_max_pending: int = 100
+    job_result_ttl_seconds: int = 3600
+    job_callback_timeout_seconds: float = 10.0
+    job_max_wait_seconds: float = 30.0
+    job_callback_allowed_hosts: list[str] = []
+    job_admission_max_attempts: int = 30
+
+
+class CassetteConfig(ChatBotConfig):
+    """Record/replay of LLM and MCP interactions for offline profiling.
+
+    - cassette_mode: "off", "record" (forward calls and append them to the cassette) or "replay" (serve them from it).
+    - cassette_path: Gzip JSON-lines file holding the interactions.
+    - cassette_playback: "instant" returns recorded responses at once, "realtime" waits for the recorded duration.
+    """
+
+    cassette_mode: Literal["off", "record", "replay"] = "off"
+    cassette_path: str = "cassettes/interactions.jsonl.gz"
+    cassette_playback: Literal["instant", "realtime"] = "instant"
+
+
+class ProfilingConfig(ChatBotConfig):
+    """On-demand profiling of agent turns.
+
+    - profiling_enabled: Profile every turn (admin toggle); otherwise only requests sending the X-Profile header.
+    - profiling_sample_interval_seconds: Interval of the stack sampler and the event-loop heartbeat.
+    - profiling_block_threshold_seconds: Heartbeat lag above which the event loop counts as blocked.
+    - profiling_dir: Directory for profile artifacts.
+    - profiling_max_artifacts: Artifacts kept before the oldest are deleted.
+    - profiling_allow_header: Honour the X-Profile request header; off by default so clients cannot start profiling.
+    - profiling_admin_token: Token expected in X-Admin-Token by the /api/profiles endpoints; unset disables them.
+    """
+
+    profiling_enabled: bool = False
+    profiling_sample_interval_seconds: float = 0.005
+    profiling_block_threshold_seconds: float = 0.1
+    profiling_dir: str = "profiles"
+    profiling_max_artifacts: int = 100
+    profiling_allow_header: bool = False
+    profiling_admin_token: str | None = None
+
+
+class RateLimitConfig(ChatBotConfig):
+    """Provider rate limits enforced by the LLM scheduler, keyed by LiteLLM model ID.
+
+    - model_requests_per_minute: Requests per minute allowed per model, e.g. {"openai/gpt-4o": 500}.
+    - model_tokens_per_minute: Prompt plus completion tokens per minute allowed per model.
+    Models missing from both maps are not scheduled.
+    """
+
+    model_requests_per_minute: dict[str, int] = field(default_factory=dict)
+    model_tokens_per_minute: dict[str, int] = field(default_factory=dict)
+
+
+class HttpPoolConfig(ChatBotConfig):
+    """Long-lived HTTP clients for LLM provider calls, one per (provider, endpoint).
+
+    - llm_http_pool_enabled: Pass pooled clients to LiteLLM; when off LiteLLM manages its own clients.
+    - llm_http_max_connections: Open connections allowed per pool.
+    - llm_http_max_keepalive_connections: Idle connections kept alive per pool.
+    - llm_http_keepalive_expiry_seconds: How long an idle connection is kept before it is closed.
+    - llm_http2: Negotiate HTTP/2 (needs the h2 package; falls back to HTTP/1.1 without it).
+    - llm_http_connect_timeout_seconds: Timeout for TCP connect and TLS handshake.
+    - llm_http_preconnect: Open one connection per pool during warm-up.
+    """
+
+    llm_http_pool_enabled: bool = True
+    llm_http_max_connections: int = 100
+    llm_http_max_keepalive_connections: int = 20
+    llm_http_keepalive_expiry_seconds: float = 60.0
+    llm_http2: bool = False
+    llm_http_connect_timeout_seconds: float = 10.0
+    llm_http_preconnect: bool = True
+
+
+class ClusterConfig(ChatBotConfig):
+    """Multi-process launcher and the session-affine front router (src/cluster).
+
+    - cluster_workers: Worker processes started by the launcher.
+    - cluster_worker_base_port: Port of the first worker; the others use the following ports.
+    - cluster_virtual_nodes: Positions of each worker on the consistent-hash ring.
+    - cluster_health_interval_seconds: How often the launcher checks and restarts workers.
+    - cluster_proxy_timeout_seconds: Read timeout of proxied requests.
+    - cluster_job_owner_cache_size: Job ids remembered to route job polls to the worker running them.
+    """
+
+    cluster_workers: int = 2
+    cluster_worker_base_port: int = 8100
+    cluster_virtual_nodes: int = 128
+    cluster_health_interval_seconds: float = 2.0
+    cluster_proxy_timeout_seconds: float = 300.0
+    cluster_job_owner_cache_size: int = 10000
 
 
 class AgentConfig(ChatBotConfig):
@@ -37,6 +245,10 @@ class AgentConfig(ChatBotConfig):
     - stop: Stop sequence string. Default: None.
     - stream: Enable streaming. Default: False.
     - timeout: Request timeout in seconds. Default: 60.
+    - max_in_flight: Concurrent turns allowed for this agent. Default: None (use AdmissionConfig).
+    - tool_selection_top_k: Send only the k MCP tools most relevant to the recent user messages (BM25 over
+       tool names, descriptions and parameter docs). Default: None (send every allowed tool).
+    - pinned_mcp_tools: Tools always sent when tool selection is active.
 
     Tools and collaboration
     - my_mcp_tools: List of MCP tool names this agent is allowed to use from the mcp server provided in the same repo.
@@ -72,6 +284,9 @@ class AgentConfig(ChatBotConfig):
     stop: str | None = None
     stream: bool = False
     timeout: int = 60
+    max_in_flight: int | None = None
+    tool_selection_top_k: int | None = None
+    pinned_mcp_tools: list[str] | None = None
     my_mcp_tools: list[str] | None = None
     search_context_size: Literal["low", "medium", "high"] | None = None
     open_mcp_tools: list[str] | None = None
@@ -92,6 +307,17 @@ class AgentConfig(ChatBotConfig):
 class Settings(ChatBotConfig):
     MAX_CACHE_SIZE: int = 128
     mcp_server_config: MCPClientConfig = field(default_factory=MCPClientConfig)
+    admission_config: AdmissionConfig = field(default_factory=AdmissionConfig)
+    job_config: JobConfig = field(default_factory=JobConfig)
+    deadline_config: DeadlineConfig = field(default_factory=DeadlineConfig)
+    tool_executor_config: ToolExecutorConfig = field(default_factory=ToolExecutorConfig)
+    pdf_tool_config: PdfToolConfig = field(default_factory=PdfToolConfig)
+    sql_tool_config: SqlToolConfig = field(default_factory=SqlToolConfig)
+    rate_limit_config: RateLimitConfig = field(default_factory=RateLimitConfig)
+    cassette_config: CassetteConfig = field(default_factory=CassetteConfig)
+    profiling_config: ProfilingConfig = field(default_factory=ProfilingConfig)
+    http_pool_config: HttpPoolConfig = field(default_factory=HttpPoolConfig)
+    cluster_config: ClusterConfig = field(default_factory=ClusterConfig)
     agent_config: AgentConfig = field(default_factory=AgentConfig)
 
 
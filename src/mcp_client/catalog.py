@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Iterable
+from logging import getLogger
+from typing import TYPE_CHECKING
+
+from src.config.settings import MCPClientConfig, settings
+from src.mcp_client.client import MCPClient
+
+if TYPE_CHECKING:
+    from litellm import ChatCompletionToolParam
+
+logger = getLogger(__name__)
+
+
+class ToolCatalog:
+    """Process-wide cache of the MCP server's tools in OpenAI format.
+
+    Agents are created per request, so caching per agent instance still listed the
+    tools on every turn. The catalog is shared, expires after tool_catalog_ttl_seconds,
+    and concurrent callers wait for a single fetch. A cached list that lacks a
+    requested tool is refetched once it is older than tool_catalog_min_refresh_seconds,
+    which covers agent tools the MCP server registers after the catalog was primed.
+    """
+
+    def __init__(self, config: MCPClientConfig) -> None:
+        self.config = config
+        self._tools: list[ChatCompletionToolParam] | None = None
+        self._fetched_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def get(self, required: Iterable[str] = ()) -> list[ChatCompletionToolParam]:
+        """Return the cached tools, fetching them when stale or missing a required name."""
+        required_names = set(required)
+        if self._is_fresh(required_names):
+            assert self._tools is not None
+            return self._tools
+        async with self._lock:
+            if not self._is_fresh(required_names):
+                await self._fetch()
+            assert self._tools is not None
+            return self._tools
+
+    async def prime(self) -> int:
+        """Fetch the catalog now; returns the number of tools."""
+        async with self._lock:
+            await self._fetch()
+            assert self._tools is not None
+            return len(self._tools)
+
+    def invalidate(self) -> None:
+        self._tools = None
+
+    def _is_fresh(self, required_names: set[str]) -> bool:
+        if self._tools is None:
+            return False
+        age = time.monotonic() - self._fetched_at
+        if age > self.config.tool_catalog_ttl_seconds:
+            return False
+        if age < self.config.tool_catalog_min_refresh_seconds:
+            return True
+        names = {tool["function"]["name"] for tool in self._tools}
+        return required_names <= names
+
+    async def _fetch(self) -> None:
+        async with MCPClient(self.config) as mcp_client:
+            self._tools = await mcp_client.get_openai_tools()
+        self._fetched_at = time.monotonic()
+        logger.info(f"Tool catalog holds {len(self._tools)} MCP tools")
+
+
+tool_catalog = ToolCatalog(settings.mcp_server_config)
@@ -1,14 +1,24 @@
-from logging import getLogger
-from typing import Any
+from __future__ import annotations
 
-from litellm import ChatCompletionToolParam, ChatCompletionToolParamFunctionChunk
-from mcp import Tool
-from mcp.client.session import ClientSession
-from mcp.client.streamable_http import streamable_http_client
-from mcp.types import ResourceLink, TextContent
+from datetime import timedelta
+from functools import partial
+from logging import getLogger
+from typing import TYPE_CHECKING, Any
 
+from src.agents_library.deadline import (
+    DEADLINE_META_KEY,
+    current_deadline,
+    remaining_seconds,
+)
+from src.api_client.cassette import cassette
 from src.config.settings import MCPClientConfig, settings
 
+if TYPE_CHECKING:
+    from litellm import ChatCompletionToolParam
+    from mcp import Tool
+    from mcp.client.session import ClientSession
+    from mcp.shared.session import ProgressFnT
+
 logger = getLogger(__name__)
 
 
@@ -23,16 +33,63 @@ class MCPClient:
         self._connected: bool = False
 
     async def list_tools(self) -> list[Tool]:
+        from mcp import Tool
+
+        return await cassette.run(
+            "mcp_list_tools",
+            {"server": self.config.mcp_server_url},
+            self._list_tools,
+            dump=lambda tools: [tool.model_dump(mode="json") for tool in tools],
+            load=lambda data: [Tool.model_validate(tool) for tool in data],
+        )
+
+    async def call(
+        self,
+        tool_name: str,
+        args: dict[str, Any],
+        progress_callback: ProgressFnT | None = None,
+    ) -> str:
+        """Call a tool and return its text result.
+
+        progress_callback receives the tool's progress notifications (progress, total
+        and message, which agent tools use for partial answer text) while it runs.
+        The current request deadline bounds the wait and is sent in the request
+        metadata, so agent tools stop their nested run when it passes.
+        """
+        return await cassette.run(
+            "mcp_call",
+            {"tool": tool_name, "args": args},
+            partial(self._call, tool_name, args, progress_callback),
+        )
+
+    async def _list_tools(self) -> list[Tool]:
         session = self._require_session()
         logger.info("listing tools from MCP server")
         lt = await session.list_tools()
         logger.debug(f"tools: {lt.tools}")
         return lt.tools
 
-    async def call(self, tool_name: str, args: dict[str, Any]) -> str:
+    async def _call(
+        self,
+        tool_name: str,
+        args: dict[str, Any],
+        progress_callback: ProgressFnT | None,
+    ) -> str:
+        from mcp.types import ResourceLink, TextContent
+
         session = self._require_session()
         logger.info(f"calling MCP tool {tool_name} with args {args}")
-        resp = await session.call_tool(tool_name, args or {})
+        deadline = current_deadline()
+        remaining = remaining_seconds()
+        resp = await session.call_tool(
+            tool_name,
+            args or {},
+            read_timeout_seconds=None
+            if remaining is None
+            else timedelta(seconds=remaining),
+            progress_callback=progress_callback,
+            meta=None if deadline is None else {DEADLINE_META_KEY: deadline},
+        )
         for part in resp.content:
             if isinstance(part, TextContent):
                 return part.text
@@ -47,7 +104,14 @@ class MCPClient:
         mcp_tools = await self.list_tools()
         return tools_as_openai_tools(mcp_tools)
 
-    async def __aenter__(self) -> "MCPClient":
+    async def __aenter__(self) -> MCPClient:
+        from mcp.client.session import ClientSession
+        from mcp.client.streamable_http import streamable_http_client
+
+        if cassette.replaying:
+            # Replayed calls never reach the server, so do not connect to it.
+            self._connected = True
+            return self
         self._conn_ctx = streamable_http_client(self.config.mcp_server_url)
         self._read, self._write, _ = await self._conn_ctx.__aenter__()
         self._session_ctx = ClientSession(self._read, self._write)
@@ -78,6 +142,8 @@ class MCPClient:
 
 def tools_as_openai_tools(mcp_tools: list[Tool]) -> list[ChatCompletionToolParam]:
     """Map MCP tool schemas to OpenAI function-tools."""
+    from litellm import ChatCompletionToolParam, ChatCompletionToolParamFunctionChunk
+
     out = []
     for tool in mcp_tools:
         schema = tool.inputSchema or {"type": "object", "properties": {}}
@@ -0,0 +1,3 @@
+from src.observability.metrics import MetricsRegistry, metrics
+
+__all__ = ["MetricsRegistry", "metrics"]
@@ -0,0 +1,227 @@
+import asyncio
+import json
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass, field
+from logging import getLogger
+from pathlib import Path
+from types import FrameType
+from typing import Any
+
+from src.config.settings import ProfilingConfig, settings
+from src.observability.metrics import metrics
+
+logger = getLogger(__name__)
+
+PROFILE_ID_HEADER = "X-Profile-Id"
+TRUE_HEADER_VALUES = frozenset({"1", "true", "yes", "on"})
+TOP_STACKS = 50
+# Innermost Python frame of an event loop waiting for I/O, e.g. EpollSelector.select.
+IDLE_FRAME_SUFFIX = "Selector.select"
+
+
+@dataclass
+class LoopBlock:
+    offset_seconds: float
+    duration_seconds: float
+    stack: list[str]
+
+
+@dataclass
+class ProfileArtifact:
+    profile_id: str
+    label: str
+    started_at: float
+    duration_seconds: float = 0.0
+    sample_interval_seconds: float = 0.0
+    samples: int = 0
+    idle_samples: int = 0
+    stacks: dict[str, int] = field(default_factory=dict)
+    functions: dict[str, int] = field(default_factory=dict)
+    tasks: dict[str, int] = field(default_factory=dict)
+    loop_blocks: list[LoopBlock] = field(default_factory=list)
+
+    @property
+    def busy_seconds(self) -> float:
+        return (self.samples - self.idle_samples) * self.sample_interval_seconds
+
+
+class _Sampler(threading.Thread):
+    """Samples the event-loop thread's stack and detects blocked loop iterations.
+
+    A heartbeat coroutine on the loop records when the loop last ran. Each sample
+    whose heartbeat is older than the block threshold belongs to a loop block; the
+    stack at the first such sample is kept as the block's trace.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        loop_thread_id: int,
+        config: ProfilingConfig,
+    ) -> None:
+        super().__init__(name="request-profiler", daemon=True)
+        self._loop = loop
+        self._loop_thread_id = loop_thread_id
+        self._config = config
+        self._stopped = threading.Event()
+        self.started = time.monotonic()
+        self.heartbeat = self.started
+        self.stacks: Counter[str] = Counter()
+        self.functions: Counter[str] = Counter()
+        self.tasks: Counter[str] = Counter()
+        self.samples = 0
+        self.idle_samples = 0
+        self.loop_blocks: list[LoopBlock] = []
+        self._block: LoopBlock | None = None
+
+    def run(self) -> None:
+        interval = self._config.profiling_sample_interval_seconds
+        while not self._stopped.wait(interval):
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is not None:
+                self._sample(frame)
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self.join()
+        self._end_block()
+
+    def _sample(self, frame: FrameType) -> None:
+        now = time.monotonic()
+        stack = _stack(frame)
+        self.samples += 1
+        if stack and stack[-1].endswith(IDLE_FRAME_SUFFIX):
+            self.idle_samples += 1
+        else:
+            self.stacks[";".join(stack)] += 1
+            for function in set(stack):
+                self.functions[function] += 1
+            current_tasks = getattr(asyncio.tasks, "_current_tasks", {})
+            task = current_tasks.get(self._loop)
+            self.tasks[task.get_name() if task else "<callbacks>"] += 1
+
+        lag = now - self.heartbeat
+        if lag <= self._config.profiling_block_threshold_seconds:
+            self._end_block()
+            return
+        if self._block is None:
+            self._block = LoopBlock(
+                offset_seconds=round(self.heartbeat - self.started, 6),
+                duration_seconds=0.0,
+                stack=stack,
+            )
+        self._block.duration_seconds = round(lag, 6)
+
+    def _end_block(self) -> None:
+        if self._block is not None:
+            self.loop_blocks.append(self._block)
+            self._block = None
+
+
+class RequestProfiler:
+    """Opt-in profiling of single agent turns.
+
+    A turn is profiled when the admin toggle is on or, if profiling_allow_header is
+    set, when the request sends X-Profile with a true value ("1", "true", "yes",
+    "on"). Profiled turns get a sampling thread and a loop heartbeat;
+    the resulting artifact is written to profiling_dir and listed by id. Turns that
+    are not profiled never touch this class beyond wanted().
+    """
+
+    def __init__(self, config: ProfilingConfig) -> None:
+        self.config = config
+        self.enabled = config.profiling_enabled
+        self._artifacts: dict[str, Path] = {}
+
+    def wanted(self, header_value: str | None) -> bool:
+        if self.enabled:
+            return True
+        if not self.config.profiling_allow_header or header_value is None:
+            return False
+        return header_value.strip().lower() in TRUE_HEADER_VALUES
+
+    @asynccontextmanager
+    async def profile(self, label: str) -> AsyncIterator[ProfileArtifact]:
+        """Profile the enclosed block and save the artifact when it exits."""
+        loop = asyncio.get_running_loop()
+        artifact = ProfileArtifact(
+            profile_id=uuid.uuid4().hex,
+            label=label,
+            started_at=time.time(),
+            sample_interval_seconds=self.config.profiling_sample_interval_seconds,
+        )
+        sampler = _Sampler(loop, threading.get_ident(), self.config)
+        heartbeat = asyncio.create_task(self._beat(sampler), name="profiler-heartbeat")
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            yield artifact
+        finally:
+            sampler.stop()
+            heartbeat.cancel()
+            artifact.duration_seconds = round(time.perf_counter() - started, 6)
+            self._fill(artifact, sampler)
+            await asyncio.to_thread(self._save, artifact)
+
+    def get(self, profile_id: str) -> dict[str, Any] | None:
+        path = self._artifacts.get(profile_id)
+        if path is None or not path.exists():
+            return None
+        result: dict[str, Any] = json.loads(path.read_text(encoding="utf-8"))
+        return result
+
+    def profile_ids(self) -> list[str]:
+        return list(self._artifacts)
+
+    async def _beat(self, sampler: _Sampler) -> None:
+        interval = self.config.profiling_sample_interval_seconds
+        while True:
+            sampler.heartbeat = time.monotonic()
+            await asyncio.sleep(interval)
+
+    @staticmethod
+    def _fill(artifact: ProfileArtifact, sampler: _Sampler) -> None:
+        artifact.samples = sampler.samples
+        artifact.idle_samples = sampler.idle_samples
+        artifact.stacks = dict(sampler.stacks.most_common(TOP_STACKS))
+        artifact.functions = dict(sampler.functions.most_common(TOP_STACKS))
+        artifact.tasks = dict(sampler.tasks.most_common())
+        artifact.loop_blocks = sampler.loop_blocks
+
+    def _save(self, artifact: ProfileArtifact) -> None:
+        directory = Path(self.config.profiling_dir)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{artifact.profile_id}.json"
+        body = {**asdict(artifact), "busy_seconds": artifact.busy_seconds}
+        path.write_text(json.dumps(body, indent=2), encoding="utf-8")
+        self._artifacts[artifact.profile_id] = path
+        while len(self._artifacts) > self.config.profiling_max_artifacts:
+            oldest = next(iter(self._artifacts))
+            self._artifacts.pop(oldest).unlink(missing_ok=True)
+        metrics.inc("request_profiles_total")
+        for block in artifact.loop_blocks:
+            logger.warning(
+                f"Event loop blocked {block.duration_seconds:.3f}s during "
+                f"'{artifact.label}' at {block.stack[-1] if block.stack else '?'}"
+            )
+
+
+def _stack(frame: FrameType) -> list[str]:
+    """Stack as 'module:qualname' entries from the outermost to the innermost frame."""
+    stack: list[str] = []
+    current: FrameType | None = frame
+    while current is not None:
+        module = current.f_globals.get("__name__", "?")
+        stack.append(f"{module}:{current.f_code.co_qualname}")
+        current = current.f_back
+    stack.reverse()
+    return stack
+
+
+request_profiler = RequestProfiler(settings.profiling_config)
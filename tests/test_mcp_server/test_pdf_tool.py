@@ -0,0 +1,136 @@
+import asyncio
+from pathlib import Path
+from typing import Any
+
+import pytest
+from fastmcp.exceptions import ToolError
+
+from mcp_server.tool_executor import ToolExecutor
+from mcp_server.tools import pdf
+from mcp_server.tools.pdf import PdfSearch
+from mcp_server.tools.pdf_pages import chunk_text
+from src.config.settings import PdfToolConfig, ToolExecutorConfig
+from src.observability.metrics import metrics
+
+TOPICS = ["volcano eruption", "glacier retreat", "coral reef", "desert dunes"]
+
+
+def _write_pdf(path: Path, pages: int) -> None:
+    import pymupdf
+
+    document = pymupdf.open()
+    for number in range(pages):
+        page = document.new_page()
+        topic = TOPICS[number % len(TOPICS)]
+        page.insert_text((72, 72), f"Page {number + 1} is about {topic}.")
+    document.save(path)
+    document.close()
+
+
+def _search(tmp_path: Path, **overrides: object) -> PdfSearch:
+    config = PdfToolConfig(
+        pdf_document_root=str(tmp_path / "documents"),
+        pdf_cache_dir=str(tmp_path / "cache"),
+        pdf_pages_per_task=3,
+        pdf_max_workers=2,
+    )
+    executor = ToolExecutor(ToolExecutorConfig())
+    return PdfSearch(config.model_copy(update=overrides), executor)
+
+
+def test_chunks_overlap_and_keep_their_page() -> None:
+    text = " ".join(f"w{i}" for i in range(10))
+
+    chunks = chunk_text(text, page=4, chunk_words=4, overlap_words=1)
+
+    assert [c["text"] for c in chunks] == ["w0 w1 w2 w3", "w3 w4 w5 w6", "w6 w7 w8 w9"]
+    assert {c["page"] for c in chunks} == {4}
+    assert chunk_text("  ", page=1, chunk_words=4, overlap_words=1) == []
+
+
+def test_paths_outside_the_document_folder_are_refused(tmp_path: Path) -> None:
+    (tmp_path / "documents").mkdir()
+    (tmp_path / "secret.pdf").write_bytes(b"%PDF-1.7")
+    search = _search(tmp_path)
+
+    with pytest.raises(ToolError):
+        search.resolve("../secret.pdf")
+    with pytest.raises(ToolError):
+        search.resolve("missing.pdf")
+
+
+@pytest.mark.asyncio
+async def test_search_returns_relevant_pages_and_reuses_the_cache(
+    tmp_path: Path,
+) -> None:
+    (tmp_path / "documents").mkdir()
+    _write_pdf(tmp_path / "documents" / "atlas.pdf", pages=10)
+    search = _search(tmp_path)
+    try:
+        result = await search.search("atlas.pdf", "glacier", top_k=2)
+    finally:
+        search.executor.shutdown()
+
+    assert result.splitlines()[0].startswith("[page 2] Page 2 is about glacier")
+    assert "[page 6]" in result
+    assert "volcano" not in result
+    assert len(list((tmp_path / "cache").glob("*.jsonl.gz"))) == 1
+
+    misses = metrics.get("pdf_cache_requests_total", result="miss")
+    fresh = _search(tmp_path)
+    again = await fresh.search("atlas.pdf", "glacier", top_k=2)
+
+    assert again == result
+    assert metrics.get("pdf_cache_requests_total", result="miss") == misses
+    assert not fresh.executor._pools
+
+
+def test_file_hash_is_reused_until_the_file_changes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    hashed: list[Path] = []
+
+    def file_digest(path: Path) -> str:
+        hashed.append(path)
+        return "h"
+
+    monkeypatch.setattr(pdf, "file_digest", file_digest)
+    document = tmp_path / "atlas.pdf"
+    document.write_bytes(b"%PDF-1.7 one")
+
+    pdf.cached_file_digest(document)
+    pdf.cached_file_digest(document)
+    document.write_bytes(b"%PDF-1.7 two!")
+    pdf.cached_file_digest(document)
+
+    assert hashed == [document, document]
+
+
+@pytest.mark.asyncio
+async def test_a_failed_page_range_cancels_the_others(tmp_path: Path) -> None:
+    cancelled: list[int] = []
+
+    class FailingExecutor:
+        def declare(self, name: str, max_workers: int | None = None) -> None:
+            pass
+
+        async def run(self, name: str, fn: Any, path: str, *args: Any) -> Any:
+            if not args:
+                return 9
+            start = args[0]
+            if start == 3:
+                raise ToolError("Tool 'search_pdf' did not finish in time")
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(start)
+                raise
+
+    search = PdfSearch(
+        PdfToolConfig(pdf_pages_per_task=3),
+        FailingExecutor(),  # type: ignore[arg-type]
+    )
+
+    with pytest.raises(ToolError):
+        await search.extract(tmp_path / "atlas.pdf")
+    assert sorted(cancelled) == [0, 6]
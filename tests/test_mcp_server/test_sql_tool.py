@@ -0,0 +1,159 @@
+from pathlib import Path
+from typing import Any
+
+import pytest
+from fastmcp.exceptions import ToolError
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+
+from mcp_server.tools.sql import (
+    READ_ONLY_SESSION,
+    SqlQuery,
+    _set_read_only,
+    prepare,
+)
+from src.config.settings import SqlToolConfig
+
+
+def _sql(tmp_path: Path, rows: int = 50, **overrides: Any) -> SqlQuery:
+    url = f"sqlite:///{tmp_path / 'warehouse.db'}"
+    engine = create_engine(url)
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE sales (id INTEGER, region TEXT)"))
+        connection.execute(
+            text("INSERT INTO sales VALUES (:id, :region)"),
+            [{"id": i, "region": "north" if i % 2 else "south"} for i in range(rows)],
+        )
+    engine.dispose()
+    config = SqlToolConfig(sql_url=url, sql_fetch_batch_rows=7)
+    return SqlQuery(config.model_copy(update=overrides))
+
+
+@pytest.mark.asyncio
+async def test_query_returns_csv_and_reuses_pooled_connections(
+    tmp_path: Path,
+) -> None:
+    sql = _sql(tmp_path)
+    try:
+        first = await sql.query(
+            "SELECT id, region FROM sales WHERE region = :region ORDER BY id LIMIT 2",
+            {"region": "north"},
+        )
+        engine = sql.engine
+        second = await sql.query("select count(*) AS n from sales -- all rows")
+    finally:
+        sql.dispose()
+
+    assert first == "id,region\n1,north\n3,north\n"
+    assert second == "n\n50\n"
+    assert sql.engine is not engine
+    assert isinstance(engine.pool, QueuePool)
+    assert engine.pool.checkedout() == 0
+
+
+@pytest.mark.asyncio
+async def test_results_stop_at_the_row_and_byte_limits(tmp_path: Path) -> None:
+    sql = _sql(tmp_path, sql_max_rows=20, sql_max_bytes=60)
+    try:
+        by_rows = await sql.query("SELECT id FROM sales ORDER BY id", max_rows=10)
+        by_bytes = await sql.query("SELECT id, region FROM sales ORDER BY id")
+    finally:
+        sql.dispose()
+
+    assert by_rows.splitlines()[1:11] == [str(i) for i in range(10)]
+    assert "Stopped after 10 rows at the rows limit" in by_rows
+    data, note = by_bytes.rsplit("(", 1)
+    assert len(data.encode()) <= 60
+    assert note.startswith("Stopped after 6 rows at the bytes limit")
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "DELETE FROM sales",
+        "SELECT 1; DROP TABLE sales",
+        "WITH gone AS (DELETE FROM sales RETURNING id) SELECT * FROM gone",
+        "/* SELECT */ UPDATE sales SET region = 'east'",
+        "PRAGMA writable_schema = 1",
+        "",
+    ],
+)
+def test_only_read_only_statements_are_accepted(statement: str) -> None:
+    with pytest.raises(ToolError):
+        prepare(statement)
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "SELECT id FROM sales WHERE region = 'delete'",
+        "SELECT 'a;b' AS x -- DROP",
+        'SELECT "update" FROM sales',
+        "SELECT '--' || region FROM sales",
+    ],
+)
+def test_keywords_inside_quotes_are_ignored(statement: str) -> None:
+    assert prepare(statement).text == statement.split(" -- ")[0]
+
+
+@pytest.mark.asyncio
+async def test_connections_refuse_writes_and_slow_queries_stop(
+    tmp_path: Path,
+) -> None:
+    sql = _sql(tmp_path, sql_timeout_seconds=0.2)
+    endless = (
+        "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n) "
+        "SELECT count(*) FROM n"
+    )
+    try:
+        with pytest.raises(ToolError, match="readonly"):
+            sql._run(text("DELETE FROM sales"), {}, max_rows=10, timeout=5)
+        with pytest.raises(ToolError, match="interrupted"):
+            sql._run(text(endless), {}, max_rows=10, timeout=0.2)
+        with pytest.raises(ToolError):
+            await sql.query(endless)
+        remaining = await sql.query("SELECT count(*) AS n FROM sales")
+    finally:
+        sql.dispose()
+
+    assert remaining == "n\n50\n"
+
+
+def test_postgres_read_only_is_set_outside_the_implicit_transaction() -> None:
+    executed: list[tuple[str, bool]] = []
+
+    class Cursor:
+        def execute(self, statement: str) -> None:
+            executed.append((statement, connection.autocommit))
+
+        def close(self) -> None:
+            pass
+
+    class Psycopg2Connection:
+        autocommit = False
+
+        def cursor(self) -> Cursor:
+            return Cursor()
+
+    connection = Psycopg2Connection()
+
+    _set_read_only(connection, READ_ONLY_SESSION["postgresql"])
+
+    assert executed == [("SET SESSION CHARACTERISTICS AS TRANSACTION READ ONLY", True)]
+    assert connection.autocommit is False
+
+
+@pytest.mark.asyncio
+async def test_in_memory_and_invalid_urls() -> None:
+    memory = SqlQuery(SqlToolConfig(sql_url="sqlite://"))
+    try:
+        assert await memory.query("SELECT 1 AS x") == "x\n1\n"
+    finally:
+        memory.dispose()
+
+    with pytest.raises(ToolError, match="not a usable database URL"):
+        await SqlQuery(SqlToolConfig(sql_url="nosuchdb://h/db")).query("SELECT 1")
+
+
+def test_prepared_statements_are_cached() -> None:
+    assert prepare("SELECT 1;") is prepare("SELECT 1;")
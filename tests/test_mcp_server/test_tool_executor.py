@@ -0,0 +1,129 @@
+import asyncio
+import time
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+from fastmcp.exceptions import ToolError
+
+from mcp_server.tool_executor import SharedBytes, ToolExecutor, _invoke
+from src.config.settings import ToolExecutorConfig
+from src.observability.metrics import metrics
+
+
+def reverse(data: bytes, repeat: int = 1) -> bytes:
+    return data[::-1] * repeat
+
+
+def spin(seconds: float) -> float:
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        pass
+    return seconds
+
+
+def _executor(**overrides: Any) -> ToolExecutor:
+    config = ToolExecutorConfig(tool_shared_memory_threshold_bytes=16)
+    return ToolExecutor(config.model_copy(update=overrides))
+
+
+def test_large_arguments_and_results_travel_through_shared_memory() -> None:
+    block = SharedBytes.put(b"0123456789abcdefXYZ")
+
+    result = _invoke(reverse, 16, (block,), {"repeat": 2})
+
+    assert isinstance(result, SharedBytes)
+    assert result.read() == b"ZYXfedcba9876543210" * 2
+    block.unlink()
+    result.unlink()
+
+
+@pytest.mark.asyncio
+async def test_run_returns_results_from_a_worker_process() -> None:
+    executor = _executor()
+    executor.declare("reverse", max_workers=1)
+    try:
+        small = await executor.run("reverse", reverse, b"abc")
+        large = await executor.run("reverse", reverse, b"x" * 20 + b"y", repeat=2)
+    finally:
+        executor.shutdown()
+
+    assert small == b"cba"
+    assert large == (b"y" + b"x" * 20) * 2
+    assert metrics.get("mcp_tool_executor_calls_total", tool="reverse", status="ok")
+
+
+@pytest.mark.asyncio
+async def test_timed_out_call_fails_and_replaces_the_pool() -> None:
+    executor = _executor()
+    executor.declare("spin", max_workers=1, timeout_seconds=0.5)
+    try:
+        await executor.warm_up()
+        with pytest.raises(ToolError):
+            await executor.run("spin", spin, 30)
+        await executor.warm_up()
+        assert await executor.run("spin", spin, 0) == 0
+    finally:
+        executor.shutdown()
+
+    assert metrics.get("mcp_tool_executor_pool_restarts_total", tool="spin") == 1
+
+
+@pytest.mark.asyncio
+async def test_cpu_bound_tool_registers_a_handler_with_the_function_signature(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    import inspect
+
+    from mcp_server import tool_executor as module
+
+    executor = _executor()
+    monkeypatch.setattr(module, "tool_executor", executor)
+    registered: dict[str, Callable[..., Any]] = {}
+
+    class FakeServer:
+        def tool(self, name: str, description: str | None) -> Callable[..., Any]:
+            def register(handler: Callable[..., Any]) -> Callable[..., Any]:
+                registered[name] = handler
+                return handler
+
+            return register
+
+    returned = module.cpu_bound_tool(FakeServer(), name="reverse_bytes")(reverse)  # type: ignore[arg-type]
+    try:
+        assert returned is reverse
+        handler = registered["reverse_bytes"]
+        assert inspect.signature(handler) == inspect.signature(reverse)
+        assert await handler(b"abc") == b"cba"
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_time_waiting_for_a_worker_does_not_count_against_the_timeout() -> None:
+    executor = _executor()
+    executor.declare("spin", max_workers=1, timeout_seconds=1.0)
+    try:
+        await executor.warm_up()
+        await asyncio.gather(
+            executor.run("spin", spin, 0.7), executor.run("spin", spin, 0.7)
+        )
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_calls_on_a_broken_pool_fail_with_a_tool_error() -> None:
+    executor = _executor()
+    executor.declare("spin", max_workers=1, timeout_seconds=30)
+    try:
+        await executor.warm_up()
+        call = asyncio.ensure_future(executor.run("spin", spin, 10))
+        await asyncio.sleep(0.3)
+        for process in executor._pools["spin"]._processes.values():
+            process.kill()
+        with pytest.raises(ToolError):
+            await call
+        assert await executor.run("spin", spin, 0) == 0
+    finally:
+        executor.shutdown()
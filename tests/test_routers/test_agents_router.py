@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI, WebSocket
+from starlette.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from routers import agents_router
+from src.agents_library.registry import AgentRegistry
+from src.agents_library.response_types import AgentSocketRequest
+
+
+def test_socket_is_closed_as_retryable_while_agents_load(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(agents_router, "agent_registry", AgentRegistry())
+    app = FastAPI()
+    app.include_router(agents_router.router)
+
+    with pytest.raises(WebSocketDisconnect) as closed:
+        with TestClient(app).websocket_connect("/ws/demo") as websocket:
+            websocket.receive_json()
+
+    assert closed.value.code == 1013
+    assert closed.value.reason == "Agents are still loading"
+
+
+def test_malformed_frames_are_reported_without_ending_the_session() -> None:
+    app = FastAPI()
+
+    @app.websocket("/turns")
+    async def turns_socket(websocket: WebSocket) -> None:
+        await websocket.accept()
+        turns: asyncio.Queue[AgentSocketRequest] = asyncio.Queue()
+        receiver = asyncio.create_task(
+            agents_router._receive_socket_turns(websocket, turns)
+        )
+        turn = await turns.get()
+        await websocket.send_json({"type": "turn", "query": turn.query})
+        receiver.cancel()
+
+    with TestClient(app).websocket_connect("/turns") as websocket:
+        websocket.send_text("not json")
+        error = websocket.receive_json()
+        websocket.send_json({"query": "hi"})
+        turn = websocket.receive_json()
+
+    assert error["type"] == "error"
+    assert "Invalid JSON" in error["detail"]
+    assert turn == {"type": "turn", "query": "hi"}
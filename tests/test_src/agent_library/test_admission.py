@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from src.agents_library.admission import AdmissionController, AdmissionRejectedError
+from src.config.settings import AdmissionConfig
+
+
+def _controller(**overrides: float) -> AdmissionController:
+    config = AdmissionConfig(
+        global_max_in_flight=10,
+        per_agent_max_in_flight=1,
+        max_queue_size=1,
+        queue_timeout_seconds=0.05,
+        retry_after_seconds=7,
+    )
+    return AdmissionController(config.model_copy(update=overrides))
+
+
+@pytest.mark.asyncio
+async def test_admit_rejects_with_429_when_queue_is_full() -> None:
+    controller = _controller(queue_timeout_seconds=1.0)
+    release = asyncio.Event()
+
+    async def hold_slot() -> None:
+        async with controller.admit("demo"):
+            await release.wait()
+
+    holder = asyncio.create_task(hold_slot())
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(hold_slot())
+    await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionRejectedError) as exc_info:
+        async with controller.admit("demo"):
+            pass
+
+    assert exc_info.value.status_code == 429
+    assert exc_info.value.retry_after_seconds == 7
+    release.set()
+    await asyncio.gather(holder, waiter)
+    assert controller.stats()["demo"] == {"in_flight": 0, "queued": 0, "limit": 1}
+
+
+@pytest.mark.asyncio
+async def test_admit_rejects_with_503_after_queue_timeout() -> None:
+    controller = _controller()
+    release = asyncio.Event()
+
+    async def hold_slot() -> None:
+        async with controller.admit("demo"):
+            await release.wait()
+
+    holder = asyncio.create_task(hold_slot())
+    await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionRejectedError) as exc_info:
+        async with controller.admit("demo"):
+            pass
+
+    assert exc_info.value.status_code == 503
+    release.set()
+    await holder
+    async with controller.admit("demo"):
+        assert controller.stats()["demo"]["in_flight"] == 1
@@ -0,0 +1,37 @@
+from src.agents_library.archive import ConversationArchive
+from src.agents_library.memory import ConversationMemory
+from src.agents_library.messages import ChatMessage
+
+
+def _turn(memory: ConversationMemory, question: str, answer: str) -> None:
+    memory.add_user(question)
+    memory.add_assistant(ChatMessage(role="assistant", content=answer))
+
+
+def test_evicted_turns_are_recalled_when_relevant() -> None:
+    memory = ConversationMemory(hard_limit_tokens=30, recall_token_budget=50)
+    _turn(memory, "my flight to Lisbon leaves at 7am", "Noted, Lisbon at 7am.")
+    _turn(memory, "book a table for four " * 3, "Table for four is booked.")
+    _turn(memory, "what about the weather " * 3, "It will be sunny.")
+
+    assert all("Lisbon" not in (m.content or "") for m in memory.messages)
+    assert len(memory.archive) > 0
+
+    memory.add_user("when does my Lisbon flight leave?")
+    built = memory.build_messages("system")
+
+    recalled = [m.content or "" for m in built if "(recalled" in (m.content or "")]
+    assert len(recalled) == 1
+    assert "[user] my flight to Lisbon leaves at 7am" in recalled[0]
+    assert built[-1].content == "when does my Lisbon flight leave?"
+
+
+def test_recall_respects_token_budget_and_archive_size() -> None:
+    archive = ConversationArchive(max_snippets=2)
+    archive.add("user", "alpha beta gamma")
+    archive.add("user", "alpha delta")
+    archive.add("assistant", "alpha epsilon zeta eta theta")
+
+    assert len(archive) == 2
+    assert archive.recall("alpha", token_budget=3) == ["[user] alpha delta"]
+    assert archive.recall("nothing matches", token_budget=100) == []
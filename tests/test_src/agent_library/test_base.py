@@ -4,8 +4,9 @@ from unittest.mock import patch
 
 import pytest
 
-from src.agents_library.base import BaseAgent, ChatSessionConfig
+from src.agents_library.base import BaseAgent, ChatSessionConfig, ToolEvent
 from src.agents_library.memory import ConversationMemory
+from src.agents_library.messages import ToolCall
 from src.config.settings import settings
 
 
@@ -291,3 +292,111 @@ model: openai/gpt-4o
 
     sections = await agent.get_initial_action_prompts()
     assert sections == {}
+
+
+@pytest.mark.asyncio
+async def test_prompt_files_are_loaded_once_but_dynamic_values_refresh(
+    tmp_path: Path,
+) -> None:
+    agent_dir: Path = tmp_path / "agents" / "cached_agent"
+    agent_dir.mkdir(parents=True)
+    (agent_dir / "agent_config.yaml").write_text(
+        """
+name: Cached Agent
+description: Demo cached
+model: openai/gpt-4o
+replace_variables:
+  bot_user_name: "..."
+""",
+        encoding="utf-8",
+    )
+    (agent_dir / "system_prompt.md").write_text("User: {bot_user_name}\n")
+    (agent_dir / "replacement_method.py").write_text(
+        """
+def variables_to_replace_in_prompt(self):
+    return {"bot_user_name": self.session_config.bot_user_name}
+""",
+        encoding="utf-8",
+    )
+    agent = BaseAgent(
+        settings=settings,
+        session_config=ChatSessionConfig(
+            bot_user_name="Alice", session_id="s", topic_id="t"
+        ),
+        memory=ConversationMemory(),
+        agent_folder_path=agent_dir,
+    )
+
+    assert await agent.get_system_prompt() == "User: Alice\n"
+    (agent_dir / "system_prompt.md").unlink()
+    (agent_dir / "replacement_method.py").unlink()
+    agent.session_config.bot_user_name = "Bob"
+
+    assert await agent.get_system_prompt() == "User: Bob\n"
+
+
+@pytest.mark.asyncio
+async def test_mcp_progress_is_forwarded_as_tool_events(tmp_path: Path) -> None:
+    agent_dir: Path = tmp_path / "agents" / "progress_agent"
+    agent_dir.mkdir(parents=True)
+    (agent_dir / "agent_config.yaml").write_text(
+        "name: Progress Agent\ndescription: Demo progress\nmodel: openai/gpt-4o\n",
+        encoding="utf-8",
+    )
+    agent = BaseAgent(
+        settings=settings,
+        session_config=ChatSessionConfig(
+            bot_user_name="Alice", session_id="s", topic_id="t"
+        ),
+        memory=ConversationMemory(),
+        agent_folder_path=agent_dir,
+    )
+    tool_call = ToolCall(id="call_1", name="research_agent", arguments="{}")
+    assert agent._progress_callback(tool_call) is None
+
+    events: list[ToolEvent] = []
+
+    async def collect(event: ToolEvent) -> None:
+        events.append(event)
+
+    agent.on_tool_event = collect
+    forward = agent._progress_callback(tool_call)
+    assert forward is not None
+    await forward(1, None, "Partial ")
+    await forward(2, None, None)
+
+    assert [(e.tool_call_id, e.status, e.message) for e in events] == [
+        ("call_1", "progress", "Partial "),
+        ("call_1", "progress", None),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_reading_a_stored_result_with_bad_arguments_explains_them(
+    tmp_path: Path,
+) -> None:
+    (tmp_path / "agent_config.yaml").write_text(
+        "name: Reader\ndescription: Demo\nmodel: openai/gpt-4o\n", encoding="utf-8"
+    )
+    agent = BaseAgent(
+        settings=settings,
+        session_config=ChatSessionConfig(
+            bot_user_name="Alice", session_id="s", topic_id="t"
+        ),
+        memory=ConversationMemory(),
+        agent_folder_path=tmp_path,
+    )
+    result_id = "call_1"
+    agent.memory.tool_results.spill(result_id, "search", "x" * 5_000)
+
+    page = await agent._read_stored_tool_result(
+        {"result_id": result_id, "offset": None, "length": "10"}
+    )
+    refused = await agent._read_stored_tool_result(
+        {"result_id": result_id, "offset": "ten", "length": None}
+    )
+
+    assert page == "x" * 10 + "\n\n[Characters 0-10 of 5000. Continue with offset=10.]"
+    assert refused == (
+        "offset and length must be whole numbers, got offset='ten', length=None."
+    )
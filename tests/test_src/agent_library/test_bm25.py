@@ -0,0 +1,32 @@
+from src.agents_library.bm25 import BM25Index, tokenize
+
+
+def test_tokenize_splits_identifiers() -> None:
+    assert tokenize("search_engine getWeatherForecast v2") == [
+        "search",
+        "engine",
+        "get",
+        "weather",
+        "forecast",
+        "v2",
+    ]
+
+
+def test_search_ranks_by_relevance_and_supports_updates() -> None:
+    index = BM25Index()
+    index.add("weather", "weather forecast for a city")
+    index.add("stocks", "stock price quote for a ticker symbol")
+    index.add("news", "latest news headlines, weather and sports")
+
+    assert [doc for doc, _ in index.search("weather forecast", top_k=2)] == [
+        "weather",
+        "news",
+    ]
+    assert index.search("unknown words", top_k=3) == []
+
+    index.remove("weather")
+    index.add("stocks", "weather forecast")
+
+    assert "weather" not in index
+    assert len(index) == 2
+    assert index.search("forecast", top_k=1)[0][0] == "stocks"
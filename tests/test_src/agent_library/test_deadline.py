@@ -0,0 +1,74 @@
+import asyncio
+import time
+
+import pytest
+
+from src.agents_library.deadline import (
+    ClientDisconnectedError,
+    DeadlineExceededError,
+    cancel_on_disconnect,
+    current_deadline,
+    request_deadline,
+    timeout_for,
+)
+from src.observability.metrics import metrics
+
+
+@pytest.mark.asyncio
+async def test_nested_deadlines_never_extend_the_outer_one() -> None:
+    assert current_deadline() is None
+    assert timeout_for(60) == 60
+
+    async with request_deadline("rest", seconds=5):
+        outer = current_deadline()
+        assert outer is not None
+        async with request_deadline("mcp_tool", seconds=300, at=time.time() + 600):
+            assert current_deadline() == outer
+        async with request_deadline("mcp_tool", seconds=1):
+            inner = current_deadline()
+            assert inner is not None and inner < outer
+            assert timeout_for(60) <= 1
+
+    assert current_deadline() is None
+
+
+@pytest.mark.asyncio
+async def test_work_past_the_deadline_is_cancelled_and_counted() -> None:
+    before = metrics.get("request_cancellations_total", reason="deadline", source="t")
+
+    with pytest.raises(DeadlineExceededError):
+        async with request_deadline("t", seconds=0.01):
+            await asyncio.sleep(10)
+
+    after = metrics.get("request_cancellations_total", reason="deadline", source="t")
+    assert after == before + 1
+
+
+@pytest.mark.asyncio
+async def test_unrelated_timeouts_are_not_reported_as_deadlines() -> None:
+    with pytest.raises(TimeoutError) as info:
+        async with request_deadline("t", seconds=10):
+            async with asyncio.timeout(0.01):
+                await asyncio.sleep(10)
+
+    assert not isinstance(info.value, DeadlineExceededError)
+
+
+@pytest.mark.asyncio
+async def test_disconnect_cancels_the_turn() -> None:
+    disconnected = asyncio.Event()
+
+    async def is_disconnected() -> bool:
+        return disconnected.is_set()
+
+    async def turn() -> None:
+        async with cancel_on_disconnect(is_disconnected, "t", 0.01):
+            await asyncio.sleep(10)
+
+    task = asyncio.create_task(turn())
+    await asyncio.sleep(0.02)
+    disconnected.set()
+
+    with pytest.raises(ClientDisconnectedError):
+        await asyncio.wait_for(task, 1)
+    assert metrics.get("request_cancellations_total", reason="disconnect", source="t")
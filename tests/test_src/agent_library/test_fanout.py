@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+
+from src.agents_library.fanout import AgentRunner, build_merge_query, run_fanout
+
+
+def _runner(delay: float, answer: str) -> AgentRunner:
+    async def run() -> str:
+        await asyncio.sleep(delay)
+        return answer
+
+    return run
+
+
+@pytest.mark.asyncio
+async def test_run_fanout_yields_in_completion_order_and_applies_deadline() -> None:
+    runners = {
+        "slow": _runner(0.05, "slow answer"),
+        "fast": _runner(0.0, "fast answer"),
+        "stuck": _runner(10, "never"),
+    }
+
+    results = [result async for result in run_fanout(runners, 0.2, None)]
+
+    assert [result.agent_key for result in results] == ["fast", "slow", "stuck"]
+    assert [result.status for result in results] == ["ok", "ok", "timeout"]
+    assert results[0].response == "fast answer"
+
+
+@pytest.mark.asyncio
+async def test_run_fanout_stops_after_first_n_successes() -> None:
+    async def failing() -> str:
+        raise RuntimeError("boom")
+
+    runners = {
+        "broken": failing,
+        "fast": _runner(0.01, "fast answer"),
+        "slow": _runner(10, "never"),
+    }
+
+    results = [result async for result in run_fanout(runners, 5, first_n=1)]
+
+    assert {result.agent_key: result.status for result in results} == {
+        "broken": "error",
+        "fast": "ok",
+    }
+    assert "fast answer" in build_merge_query("question", results)
+    assert "boom" not in build_merge_query("question", results)
@@ -0,0 +1,152 @@
+import asyncio
+
+import pytest
+
+from src.agents_library.admission import AdmissionRejectedError
+from src.agents_library.jobs import (
+    JobCallbackNotAllowedError,
+    JobManager,
+    JobQueueFullError,
+)
+from src.config.settings import JobConfig
+
+
+def _manager(
+    job_result_ttl_seconds: int = 3600, job_admission_max_attempts: int = 30
+) -> JobManager:
+    return JobManager(
+        JobConfig(
+            job_workers=1,
+            job_max_pending=2,
+            job_result_ttl_seconds=job_result_ttl_seconds,
+            job_admission_max_attempts=job_admission_max_attempts,
+        )
+    )
+
+
+@pytest.mark.asyncio
+async def test_job_runs_in_background_and_long_poll_returns_result() -> None:
+    manager = _manager()
+    manager.start()
+
+    async def run() -> str:
+        await asyncio.sleep(0.01)
+        return "done"
+
+    job = manager.submit("agent", run)
+    assert job.state == "queued"
+
+    finished = await manager.wait(job.job_id, timeout_seconds=1)
+
+    assert finished is not None
+    assert finished.status().status == "succeeded"
+    assert finished.response == "done"
+    await manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_submit_rejects_when_pending_queue_is_full() -> None:
+    manager = _manager()
+
+    async def run() -> str:
+        return "done"
+
+    manager.submit("agent", run)
+    manager.submit("agent", run)
+    with pytest.raises(JobQueueFullError):
+        manager.submit("agent", run)
+
+
+@pytest.mark.asyncio
+async def test_failed_and_cancelled_jobs_report_their_state() -> None:
+    manager = _manager()
+    manager.start()
+
+    async def failing() -> str:
+        raise RuntimeError("boom")
+
+    async def stuck() -> str:
+        await asyncio.sleep(10)
+        return "never"
+
+    failed = await manager.wait(manager.submit("agent", failing).job_id, 1)
+    running = manager.submit("agent", stuck)
+    await asyncio.sleep(0.01)
+    manager.cancel(running.job_id)
+    cancelled = await manager.wait(running.job_id, 1)
+
+    assert failed is not None and failed.state == "failed"
+    assert failed.error == "boom"
+    assert cancelled is not None and cancelled.state == "cancelled"
+    await manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_admission_rejection_is_retried() -> None:
+    manager = _manager()
+    manager.start()
+    attempts = 0
+
+    async def saturated_once() -> str:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise AdmissionRejectedError("agent", "queue_timeout", 0)
+        return "done"
+
+    job = await manager.wait(manager.submit("agent", saturated_once).job_id, 1)
+
+    assert job is not None and job.response == "done"
+    assert attempts == 2
+    await manager.stop()
+
+
+def test_finished_jobs_expire_after_ttl() -> None:
+    manager = _manager(job_result_ttl_seconds=0)
+
+    async def run() -> str:
+        return "done"
+
+    job = manager.submit("agent", run)
+    manager.cancel(job.job_id)
+    assert job.finished_at is not None
+    job.finished_at -= 1
+
+    assert manager.get(job.job_id) is None
+
+
+@pytest.mark.asyncio
+async def test_admission_retries_stop_after_max_attempts() -> None:
+    manager = _manager(job_admission_max_attempts=3)
+    manager.start()
+    attempts = 0
+
+    async def saturated() -> str:
+        nonlocal attempts
+        attempts += 1
+        raise AdmissionRejectedError("agent", "queue_full", 0)
+
+    job = await manager.wait(manager.submit("agent", saturated).job_id, 1)
+
+    assert job is not None and job.state == "failed"
+    assert attempts == 3
+    await manager.stop()
+
+
+def test_callbacks_are_limited_to_allowed_hosts() -> None:
+    manager = JobManager(JobConfig(job_callback_allowed_hosts=["hooks.example.com"]))
+
+    async def run() -> str:
+        return "done"
+
+    job = manager.submit("agent", run, callback_url="https://hooks.example.com/done")
+
+    assert job.callback_url == "https://hooks.example.com/done"
+    for url in (
+        "http://169.254.169.254/latest/meta-data",
+        "http://localhost:8000/api/jobs",
+        "file:///etc/passwd",
+        "https://hooks.example.com.evil.test/",
+    ):
+        with pytest.raises(JobCallbackNotAllowedError):
+            manager.submit("agent", run, callback_url=url)
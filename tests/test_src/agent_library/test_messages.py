@@ -0,0 +1,38 @@
+from src.agents_library.memory import ConversationMemory
+from src.agents_library.messages import ChatMessage, ToolCall, to_openai_messages
+
+
+def test_chat_message_serializes_to_openai_format() -> None:
+    assistant = ChatMessage(
+        role="assistant",
+        content=None,
+        tool_calls=(ToolCall(id="call_1", name="search", arguments='{"q": "x"}'),),
+    )
+    tool = ChatMessage(role="tool", content="found it", tool_call_id="call_1")
+
+    assert to_openai_messages([assistant, tool]) == [
+        {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [
+                {
+                    "id": "call_1",
+                    "type": "function",
+                    "function": {"name": "search", "arguments": '{"q": "x"}'},
+                }
+            ],
+        },
+        {"role": "tool", "content": "found it", "tool_call_id": "call_1"},
+    ]
+    assert not hasattr(tool, "__dict__")
+
+
+def test_build_messages_prepends_system_prompt_and_counts_cached_tokens() -> None:
+    memory = ConversationMemory()
+    memory.add_user("one two three")
+
+    messages = memory.build_messages("system text")
+
+    assert [message.role for message in messages] == ["system", "user"]
+    assert messages[1].token_count == 3
+    assert memory._count_tokens() == 3
@@ -0,0 +1,29 @@
+from pathlib import Path
+
+import pytest
+
+from src.agents_library.registry import AgentRegistry
+from src.config.settings import settings
+
+
+@pytest.mark.asyncio
+async def test_discover_loads_every_agent_folder(tmp_path: Path) -> None:
+    for folder, name in (("alpha", "Alpha Agent"), ("beta", "Beta Agent")):
+        agent_dir = tmp_path / folder
+        agent_dir.mkdir()
+        (agent_dir / "agent_config.yaml").write_text(
+            f"name: {name}\ndescription: {folder}\nmodel: openai/gpt-4o\n",
+            encoding="utf-8",
+        )
+
+    registry = AgentRegistry()
+    assert not registry.ready
+
+    await registry.discover(settings, tmp_path)
+
+    assert registry.ready
+    assert [entry.key for entry in registry.entries()] == ["alpha", "beta"]
+    beta = registry.get("beta")
+    assert beta is not None
+    assert beta.settings.agent_config.name == "Beta Agent"
+    assert registry.get("missing") is None
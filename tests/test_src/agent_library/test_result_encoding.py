@@ -0,0 +1,128 @@
+import json
+
+from src.agents_library.result_encoding import TABLE_SAMPLE_ROWS, encode_tool_result
+from src.observability.metrics import metrics
+
+MARKDOWN_TABLE = """\
+| region      |   sales | active   |
+|:------------|--------:|:---------|
+| north       |     120 | True     |
+| south       |      80 | False    |
+"""
+
+GRID_TABLE = """\
++----------+---------+
+| region   |   sales |
++==========+=========+
+| north    |     120 |
++----------+---------+
+| south    |      80 |
++----------+---------+
+"""
+
+SIMPLE_TABLE = """\
+region      sales
+--------  -------
+north         120
+south          80
+"""
+
+
+def test_text_tables_become_csv() -> None:
+    for table in (GRID_TABLE, SIMPLE_TABLE):
+        encoded = encode_tool_result("report", table)
+        assert encoded.encoding == "csv"
+        assert encoded.text == "region,sales\nnorth,120\nsouth,80\n"
+
+    encoded = encode_tool_result("report", MARKDOWN_TABLE)
+    assert encoded.text == "region,sales,active\nnorth,120,True\nsouth,80,False\n"
+
+
+def test_tables_inside_text_are_replaced_in_place() -> None:
+    result = f"Sales by region:\n{MARKDOWN_TABLE}\nNorth leads."
+
+    encoded = encode_tool_result("report", result)
+
+    assert encoded.encoding == "text_tables"
+    assert encoded.text.startswith("Sales by region:\nregion,sales,active\n")
+    assert encoded.text.endswith("south,80,False\n\nNorth leads.")
+
+
+def test_text_after_a_simple_table_is_kept_intact() -> None:
+    note = "Total sales were strong this quarter, north leads by a wide margin."
+
+    encoded = encode_tool_result("report", SIMPLE_TABLE + note)
+
+    assert encoded.text == "region,sales\nnorth,120\nsouth,80\n" + note
+
+
+def test_lines_that_do_not_fit_the_rule_columns_are_not_a_table() -> None:
+    result = "hello\n  --  --\nfoo bar baz qux\n"
+
+    encoded = encode_tool_result("x", result)
+
+    assert encoded.encoding == "raw"
+    assert encoded.text == result
+
+
+def test_json_records_become_csv_and_nested_json_columnar() -> None:
+    records = [
+        {"id": 1, "name": "a", "ok": True},
+        {"id": 2, "name": "b, c", "ok": False},
+    ]
+    nested = {"query": "x", "hits": [{"id": 1, "tags": ["a"]}, {"id": 2, "tags": []}]}
+
+    flat = encode_tool_result("search", json.dumps(records, indent=2))
+    columnar = encode_tool_result("search", json.dumps(nested, indent=2))
+
+    assert flat.text == 'id,name,ok\n1,a,true\n2,"b, c",false\n'
+    assert columnar.encoding == "json"
+    assert json.loads(columnar.text) == {
+        "query": "x",
+        "hits": {"columns": ["id", "tags"], "rows": [[1, ["a"]], [2, []]]},
+    }
+
+
+def test_records_that_csv_would_blur_stay_json() -> None:
+    ambiguous = [
+        [{"id": 1, "name": "a"}, {"id": 2}],
+        [{"id": 1, "name": "a"}, {"id": 2, "name": None}],
+        [{"id": 1, "name": "a"}, {"id": 2, "name": ""}],
+        [{"id": 1, "code": 7}, {"id": 2, "code": "7"}],
+    ]
+
+    for records in ambiguous:
+        encoded = encode_tool_result("search", json.dumps(records, indent=2))
+
+        assert encoded.encoding == "json"
+        decoded = json.loads(encoded.text)
+        if isinstance(decoded, dict):
+            rows = decoded["rows"]
+            decoded = [dict(zip(decoded["columns"], row)) for row in rows]
+        assert decoded == records
+
+
+def test_large_tables_get_a_sampled_preview_with_statistics() -> None:
+    rows = [{"id": i, "region": "north" if i % 3 else "south"} for i in range(500)]
+
+    encoded = encode_tool_result("warehouse", json.dumps(rows))
+
+    assert encoded.text.count("\n") == 501
+    assert encoded.preview is not None
+    lines = encoded.preview.splitlines()
+    assert lines[1:3] == ["0,south", "26,north"]
+    assert lines[TABLE_SAMPLE_ROWS] == "499,north"
+    assert "500 rows x 2 columns" in lines[-1]
+    assert "id min 0, max 499, mean 249.5" in lines[-1]
+    assert "region 2 distinct, most common 'north' x333" in lines[-1]
+
+
+def test_other_results_are_kept_and_savings_are_counted() -> None:
+    saved = metrics.get("tool_result_tokens_saved_total", tool="report")
+
+    assert encode_tool_result("echo", "plain answer").text == "plain answer"
+    assert encode_tool_result("echo", "[1, 2").encoding == "raw"
+    encode_tool_result("report", GRID_TABLE)
+
+    assert metrics.get("tool_result_tokens_saved_total", tool="report") > saved
+    assert metrics.get("tool_result_encodings_total", tool="echo", encoding="raw")
@@ -0,0 +1,85 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from src.agents_library.response_types import BaseChatResponse
+from src.agents_library.streaming import (
+    StreamedMessageAssembler,
+    TextFieldStreamParser,
+)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7])
+def test_parser_emits_only_decoded_text_response(chunk_size: int) -> None:
+    text = 'Line "one"\nLine two é \U0001f600'
+    body = json.dumps(
+        {"nested": {"text_response": "ignored"}, "text_response": text},
+        ensure_ascii=True,
+    )
+    parser = TextFieldStreamParser()
+
+    emitted = "".join(
+        parser.feed(body[i : i + chunk_size]) for i in range(0, len(body), chunk_size)
+    )
+
+    assert emitted == text
+    assert parser.finish(BaseChatResponse).text_response == text
+
+
+def test_parser_emits_text_before_body_is_complete() -> None:
+    parser = TextFieldStreamParser()
+
+    assert parser.feed('{"text_response": "Hel') == "Hel"
+    assert parser.feed('lo", "extra": "x"}') == "lo"
+
+
+def test_assembler_rebuilds_content_and_tool_calls() -> None:
+    def chunk(
+        content: str | None = None, tool_calls: list[object] | None = None
+    ) -> object:
+        delta = SimpleNamespace(content=content, tool_calls=tool_calls)
+        return SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+    def tool_delta(index: int, **fields: str) -> object:
+        function = SimpleNamespace(
+            name=fields.get("name"), arguments=fields.get("arguments")
+        )
+        return SimpleNamespace(index=index, id=fields.get("id"), function=function)
+
+    assembler = StreamedMessageAssembler()
+    assembler.add(chunk(tool_calls=[tool_delta(0, id="c1", name="search")]))
+    assembler.add(chunk(tool_calls=[tool_delta(0, arguments='{"q": ')]))
+    assembler.add(chunk(tool_calls=[tool_delta(0, arguments='"x"}')]))
+
+    message = assembler.message()
+
+    assert message.content is None
+    assert message.tool_calls is not None
+    assert message.tool_calls[0].id == "c1"
+    assert message.tool_calls[0].name == "search"
+    assert json.loads(message.tool_calls[0].arguments) == {"q": "x"}
+
+
+def test_assembler_marks_tool_calls_ready_as_soon_as_arguments_close() -> None:
+    def chunk(index: int, **fields: str) -> object:
+        function = SimpleNamespace(
+            name=fields.get("name"), arguments=fields.get("arguments")
+        )
+        tool_call = SimpleNamespace(index=index, id=fields.get("id"), function=function)
+        delta = SimpleNamespace(content=None, tool_calls=[tool_call])
+        return SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+    assembler = StreamedMessageAssembler()
+    assembler.add(chunk(0, id="c1", name="search", arguments='{"q": "a'))
+    assert assembler.pop_ready_tool_calls() == []
+
+    assembler.add(chunk(0, arguments='"}'))
+    ready = assembler.pop_ready_tool_calls()
+    assert [(position, call.id) for position, call in ready] == [(0, "c1")]
+
+    assembler.add(chunk(1, id="c2", name="calc", arguments="{"))
+    assert assembler.pop_ready_tool_calls() == []
+    assembler.add(chunk(2, id="c3", name="calc", arguments="{}"))
+    ready = assembler.pop_ready_tool_calls()
+    assert [(position, call.id) for position, call in ready] == [(1, "c2"), (2, "c3")]
@@ -0,0 +1,56 @@
+from src.agents_library.memory import ConversationMemory
+from src.agents_library.messages import ChatMessage
+from src.agents_library.tool_results import (
+    READ_TOOL_RESULT_TOOL_NAME,
+    TOOL_RESULT_INLINE_CHARS,
+    ToolResultStore,
+)
+
+
+def test_spill_keeps_short_results_inline() -> None:
+    store = ToolResultStore()
+
+    assert store.spill("call_1", "search", "short result") == "short result"
+    assert len(store) == 0
+
+
+def test_spill_stores_large_result_and_read_pages_it_back() -> None:
+    store = ToolResultStore()
+    result = "\n".join(f"row {i}" for i in range(2_000))
+
+    content = store.spill("call_1", "search", result)
+
+    assert len(content) < TOOL_RESULT_INLINE_CHARS + 300
+    assert READ_TOOL_RESULT_TOOL_NAME in content
+    assert "call_1" in store
+    assert store.compressed_bytes() < len(result)
+
+    page = store.read("call_1", offset=0, length=len(result))
+    assert page.startswith(result[:100])
+    assert store.read("call_1", offset=len(result) - 5, length=50).endswith(
+        "[End of result call_1.]"
+    )
+    assert "No stored tool result" in store.read("unknown", offset=0, length=10)
+
+
+def test_shrinking_memory_discards_spilled_payload() -> None:
+    memory = ConversationMemory(hard_limit_tokens=5)
+    memory.add_user("question")
+    content = memory.tool_results.spill("call_1", "search", "word " * 2_000)
+    memory.add_tool_result("call_1", result=content)
+    memory.add_assistant(ChatMessage(role="assistant", content="answer"))
+    memory.add_user("follow up")
+
+    assert "call_1" not in memory.tool_results
+    assert all(msg.role != "tool" for msg in memory.messages)
+
+
+def test_spill_shows_a_preview_in_place_of_the_head() -> None:
+    store = ToolResultStore()
+    result = "\n".join(f"row {i}" for i in range(2_000))
+
+    content = store.spill("call_1", "search", result, preview="row 0\nrow 1999")
+
+    assert content.startswith("row 0\nrow 1999\n\n[Full result:")
+    assert "offset=0" in content
+    assert store.read("call_1", offset=0, length=5).startswith("row 0")
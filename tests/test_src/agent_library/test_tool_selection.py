@@ -0,0 +1,71 @@
+from typing import TYPE_CHECKING, Any, cast
+
+from src.agents_library.messages import ChatMessage, ToolCall
+from src.agents_library.tool_selection import select_tools
+
+if TYPE_CHECKING:
+    from litellm import ChatCompletionToolParam
+
+
+def _tool(name: str, description: str, **params: str) -> "ChatCompletionToolParam":
+    tool: dict[str, Any] = {
+        "type": "function",
+        "function": {
+            "name": name,
+            "description": description,
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    param: {"type": "string", "description": doc}
+                    for param, doc in params.items()
+                },
+            },
+        },
+    }
+    return cast("ChatCompletionToolParam", tool)
+
+
+TOOLS: list["ChatCompletionToolParam"] = [
+    _tool("get_weather", "Current weather", city="City name"),
+    _tool("stock_quote", "Latest stock price", ticker="Ticker symbol"),
+    _tool("search_engine", "Search the web"),
+    _tool("translate", "Translate text", target_language="Language code"),
+]
+
+
+def _names(tools: list[Any]) -> list[str]:
+    return [tool["function"]["name"] for tool in tools]
+
+
+def test_select_tools_keeps_top_k_pinned_and_recently_called_tools() -> None:
+    messages = [
+        ChatMessage(role="user", content="What does the AAPL ticker trade at?"),
+        ChatMessage(
+            role="assistant",
+            content=None,
+            tool_calls=(ToolCall(id="1", name="translate", arguments="{}"),),
+        ),
+    ]
+
+    selected, tokens_saved = select_tools(
+        TOOLS, messages, top_k=1, pinned=["search_engine"]
+    )
+
+    assert _names(selected) == ["stock_quote", "search_engine", "translate"]
+    assert tokens_saved > 0
+
+
+def test_select_tools_sends_everything_when_below_top_k() -> None:
+    selected, tokens_saved = select_tools(TOOLS, [], top_k=10)
+
+    assert selected == TOOLS
+    assert tokens_saved == 0
+
+
+def test_select_tools_sends_everything_when_nothing_matches() -> None:
+    messages = [ChatMessage(role="user", content="Hello there!")]
+
+    selected, tokens_saved = select_tools(TOOLS, messages, top_k=1)
+
+    assert selected == TOOLS
+    assert tokens_saved == 0
@@ -0,0 +1,64 @@
+import time
+from pathlib import Path
+
+import pytest
+
+from src.api_client.cassette import Cassette, CassetteMissError
+from src.config.settings import CassetteConfig
+
+
+async def _record(path: Path) -> None:
+    recorder = Cassette(CassetteConfig(cassette_mode="record", cassette_path=str(path)))
+
+    async def answer(text: str) -> str:
+        return text
+
+    await recorder.run("mcp_call", {"tool": "a"}, lambda: answer("first"))
+    await recorder.run("mcp_call", {"tool": "b"}, lambda: answer("second"))
+    await recorder.run("chat", {"model": "m"}, lambda: answer("reply"))
+    recorder.close()
+
+
+@pytest.mark.asyncio
+async def test_replay_serves_recorded_interactions_without_calling_out(
+    tmp_path: Path,
+) -> None:
+    path = tmp_path / "cassette.jsonl.gz"
+    await _record(path)
+    player = Cassette(CassetteConfig(cassette_mode="replay", cassette_path=str(path)))
+
+    async def must_not_run() -> str:
+        raise AssertionError("replay must not forward calls")
+
+    assert await player.run("mcp_call", {"tool": "b"}, must_not_run) == "second"
+    # Unknown request: next unused interaction of the same kind, in recorded order.
+    assert await player.run("mcp_call", {"tool": "zzz"}, must_not_run) == "first"
+    assert await player.run("chat", {"model": "m"}, must_not_run) == "reply"
+    with pytest.raises(CassetteMissError):
+        await player.run("mcp_call", {"tool": "a"}, must_not_run)
+
+
+@pytest.mark.asyncio
+async def test_realtime_playback_keeps_recorded_latency(tmp_path: Path) -> None:
+    path = tmp_path / "cassette.jsonl.gz"
+    recorder = Cassette(CassetteConfig(cassette_mode="record", cassette_path=str(path)))
+
+    async def slow() -> dict[str, str]:
+        time.sleep(0.05)
+        return {"text": "done"}
+
+    await recorder.run("chat", {"model": "m"}, slow)
+    recorder.close()
+    player = Cassette(
+        CassetteConfig(
+            cassette_mode="replay",
+            cassette_path=str(path),
+            cassette_playback="realtime",
+        )
+    )
+
+    started = time.perf_counter()
+    response = await player.run("chat", {"model": "m"}, slow)
+
+    assert response == {"text": "done"}
+    assert time.perf_counter() - started >= 0.05
@@ -0,0 +1,48 @@
+from collections.abc import AsyncIterator
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from src.agents_library.messages import ChatMessage
+from src.api_client import chat_client
+from src.api_client.chat_client import ChatClient
+from src.api_client.scheduler import LLMScheduler
+from src.config.settings import RateLimitConfig, settings
+
+
+@pytest.mark.asyncio
+async def test_streamed_calls_request_usage_and_settle_from_the_last_chunk(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    import litellm
+
+    model = settings.agent_config.model
+    scheduler = LLMScheduler(RateLimitConfig(model_tokens_per_minute={model: 10**6}))
+    monkeypatch.setattr(chat_client, "llm_scheduler", scheduler)
+    settled: list[int] = []
+    monkeypatch.setattr(
+        scheduler, "settle", lambda model, reserved, used: settled.append(used)
+    )
+    requests: list[dict[str, Any]] = []
+
+    async def acompletion(**kwargs: Any) -> AsyncIterator[Any]:
+        requests.append(kwargs)
+
+        async def chunks() -> AsyncIterator[Any]:
+            yield SimpleNamespace(choices=["Hi"], usage=None)
+            yield SimpleNamespace(choices=[], usage=SimpleNamespace(total_tokens=30))
+
+        return chunks()
+
+    monkeypatch.setattr(litellm, "acompletion", acompletion)
+    client = ChatClient(settings)
+
+    chunks = [
+        chunk
+        async for chunk in client.stream_chat([ChatMessage(role="user", content="Hi")])
+    ]
+
+    assert len(chunks) == 2
+    assert requests[0]["stream_options"] == {"include_usage": True}
+    assert settled == [30]
@@ -0,0 +1,43 @@
+import pytest
+
+from src.api_client.http_pool import LLMHttpPool
+from src.config.settings import AgentConfig, HttpPoolConfig
+
+
+@pytest.mark.asyncio
+async def test_clients_are_shared_per_provider_and_endpoint(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("OPEN_API_KEY", "sk-test")
+    pool = LLMHttpPool(HttpPoolConfig())
+
+    default = pool.client_for(AgentConfig(model="openai/gpt-4o"))
+    same_endpoint = pool.client_for(AgentConfig(model="openai/gpt-4o-mini"))
+    proxy = pool.client_for(
+        AgentConfig(model="openai/gpt-4o", endpoint="http://proxy.local/v1")
+    )
+
+    assert default is not None
+    assert default is same_endpoint
+    assert proxy is not None and proxy is not default
+    assert str(proxy.base_url).startswith("http://proxy.local/v1")
+    assert pool.stats() == {
+        "openai:api.openai.com": {"connections": 0, "idle": 0},
+        "openai:proxy.local": {"connections": 0, "idle": 0},
+    }
+
+    await pool.aclose()
+    assert pool.stats() == {}
+
+
+def test_unsupported_providers_and_disabled_pool_leave_clients_to_litellm(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("OPEN_API_KEY", "sk-test")
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-test")
+
+    pool = LLMHttpPool(HttpPoolConfig())
+    assert pool.client_for(AgentConfig(model="anthropic/claude-3-5-sonnet")) is None
+
+    disabled = LLMHttpPool(HttpPoolConfig(llm_http_pool_enabled=False))
+    assert disabled.client_for(AgentConfig(model="openai/gpt-4o")) is None
@@ -0,0 +1,62 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.agents_library.messages import ChatMessage
+from src.api_client.scheduler import LLMScheduler, Priority, estimate_prompt_tokens
+from src.config.settings import RateLimitConfig
+
+
+@pytest.mark.asyncio
+async def test_waiting_calls_are_served_by_priority_then_round_robin() -> None:
+    scheduler = LLMScheduler(
+        RateLimitConfig(model_requests_per_minute={"openai/gpt-4o": 6000})
+    )
+    granted: list[str] = []
+
+    async def call(name: str, priority: Priority, fairness_key: str) -> None:
+        async with scheduler.reserve("openai/gpt-4o", 10, priority, fairness_key):
+            granted.append(name)
+
+    # Exhaust the bucket so every call below has to queue.
+    async with scheduler.reserve("openai/gpt-4o", 10):
+        pass
+    scheduler._queues["openai/gpt-4o"].requests.level = 0  # type: ignore[union-attr]
+
+    await asyncio.gather(
+        call("nested", "nested", "c"),
+        call("batch-a1", "batch", "a"),
+        call("a1", "interactive", "a"),
+        call("a2", "interactive", "a"),
+        call("a3", "interactive", "a"),
+        call("b1", "interactive", "b"),
+    )
+
+    assert granted == ["a1", "b1", "a2", "a3", "batch-a1", "nested"]
+
+
+@pytest.mark.asyncio
+async def test_unlimited_models_skip_the_queue_and_usage_is_settled() -> None:
+    scheduler = LLMScheduler(
+        RateLimitConfig(model_tokens_per_minute={"openai/gpt-4o": 1000})
+    )
+    async with scheduler.reserve("other/model", 10**9):
+        pass
+    assert "other/model" not in scheduler._queues
+
+    async with scheduler.reserve("openai/gpt-4o", 600) as reservation:
+        reservation.settle(SimpleNamespace(usage=SimpleNamespace(total_tokens=100)))
+        reservation.settle(SimpleNamespace(usage=SimpleNamespace(total_tokens=100)))
+
+    level = scheduler._queues["openai/gpt-4o"].tokens.level  # type: ignore[union-attr]
+    assert level == pytest.approx(900, abs=1)
+
+
+def test_estimate_prompt_tokens_counts_content_and_tools() -> None:
+    messages = [ChatMessage(role="user", content="x" * 400)]
+    without_tools = estimate_prompt_tokens(messages)
+    with_tools = estimate_prompt_tokens(messages, [{"name": "y" * 400}])
+
+    assert without_tools == 101
+    assert with_tools > without_tools + 100
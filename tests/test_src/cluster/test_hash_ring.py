@@ -0,0 +1,54 @@
+from collections import Counter
+
+import pytest
+
+from src.cluster.hash_ring import HashRing
+
+KEYS = [f"session-{i}" for i in range(20000)]
+
+
+def test_keys_spread_evenly_over_nodes() -> None:
+    ring = HashRing([f"worker-{i}" for i in range(4)])
+
+    counts = Counter(ring.owner(key) for key in KEYS)
+
+    assert set(counts) == ring.nodes
+    assert max(counts.values()) < 1.25 * len(KEYS) / 4
+
+
+def test_adding_a_node_moves_only_its_share_of_keys() -> None:
+    ring = HashRing([f"worker-{i}" for i in range(4)])
+    before = {key: ring.owner(key) for key in KEYS}
+
+    ring.add("worker-4")
+    moved = [key for key in KEYS if ring.owner(key) != before[key]]
+
+    assert all(ring.owner(key) == "worker-4" for key in moved)
+    assert len(moved) < 1.5 * len(KEYS) / 5
+
+
+def test_removing_a_node_moves_only_its_keys() -> None:
+    ring = HashRing([f"worker-{i}" for i in range(4)])
+    before = {key: ring.owner(key) for key in KEYS}
+
+    ring.remove("worker-2")
+
+    for key in KEYS:
+        if before[key] != "worker-2":
+            assert ring.owner(key) == before[key]
+        else:
+            assert ring.owner(key) != "worker-2"
+
+
+def test_preference_lists_each_node_once_starting_with_the_owner() -> None:
+    ring = HashRing(["a", "b", "c"])
+
+    preference = list(ring.preference("session-1"))
+
+    assert preference[0] == ring.owner("session-1")
+    assert sorted(preference) == ["a", "b", "c"]
+
+
+def test_empty_ring_has_no_owner() -> None:
+    with pytest.raises(LookupError):
+        HashRing().owner("session-1")
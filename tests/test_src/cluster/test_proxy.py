@@ -0,0 +1,48 @@
+import httpx
+import pytest
+from starlette.requests import Request
+from starlette.testclient import TestClient
+
+from src.cluster import proxy
+from src.cluster.routing import SessionRouter
+from src.config.settings import ClusterConfig
+
+WORKERS = ["http://127.0.0.1:8100", "http://127.0.0.1:8101"]
+
+
+@pytest.fixture
+def down_worker(monkeypatch: pytest.MonkeyPatch) -> None:
+    """WORKERS[0] refuses connections; WORKERS[1] knows job-1."""
+
+    async def send(
+        client: httpx.AsyncClient, worker: str, request: Request, body: bytes
+    ) -> httpx.Response:
+        if worker == WORKERS[0]:
+            raise httpx.ConnectError("Connection refused")
+        if request.url.path.endswith("/job-1"):
+            return httpx.Response(200, json={"job_id": "job-1"})
+        return httpx.Response(404, json={"detail": "Job not found or expired"})
+
+    monkeypatch.setattr(proxy, "_send", send)
+
+
+def test_unreachable_worker_answers_bad_gateway(down_worker: None) -> None:
+    router = SessionRouter(WORKERS[:1], ClusterConfig())
+    client = TestClient(proxy.create_proxy_app(router, timeout_seconds=1))
+
+    response = client.post("/api/agents/demo", json={"query": "hi"})
+
+    assert response.status_code == 502
+    assert router.in_flight[WORKERS[0]] == 0
+
+
+def test_job_polls_skip_unreachable_workers(down_worker: None) -> None:
+    router = SessionRouter(WORKERS, ClusterConfig())
+    client = TestClient(proxy.create_proxy_app(router, timeout_seconds=1))
+
+    found = client.get("/api/jobs/job-1")
+    missing = client.get("/api/jobs/job-2")
+
+    assert found.status_code == 200
+    assert router.worker_for_job("job-1") == WORKERS[1]
+    assert missing.status_code == 404
@@ -0,0 +1,38 @@
+from src.cluster.routing import SessionRouter
+from src.config.settings import ClusterConfig
+
+WORKERS = ["http://127.0.0.1:8100", "http://127.0.0.1:8101", "http://127.0.0.1:8102"]
+
+
+def test_new_sessions_go_to_the_least_loaded_worker_and_stay_there() -> None:
+    router = SessionRouter(WORKERS, ClusterConfig())
+    router.in_flight.update({WORKERS[0]: 5, WORKERS[1]: 0, WORKERS[2]: 3})
+
+    worker, correlation_id = router.new_session()
+
+    assert worker == WORKERS[1]
+    assert router.worker_for_session(correlation_id) == WORKERS[1]
+
+
+def test_in_flight_counts_follow_tracked_requests() -> None:
+    router = SessionRouter(WORKERS, ClusterConfig())
+
+    with router.track(WORKERS[0], "session"):
+        assert router.in_flight[WORKERS[0]] == 1
+        assert router.least_loaded() != WORKERS[0]
+
+    assert router.in_flight[WORKERS[0]] == 0
+
+
+def test_job_owners_are_forgotten_when_the_worker_leaves_or_cache_is_full() -> None:
+    router = SessionRouter(WORKERS, ClusterConfig(cluster_job_owner_cache_size=2))
+    router.remember_job("job-1", WORKERS[0])
+    router.remember_job("job-2", WORKERS[1])
+    router.remember_job("job-3", WORKERS[2])
+
+    assert router.worker_for_job("job-1") is None
+    assert router.worker_for_job("job-2") == WORKERS[1]
+
+    router.remove_worker(WORKERS[1])
+    assert router.worker_for_job("job-2") is None
+    assert router.worker_for_job("job-3") == WORKERS[2]
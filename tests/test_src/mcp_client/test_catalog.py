@@ -0,0 +1,37 @@
+import asyncio
+import time
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from src.config.settings import MCPClientConfig
+from src.mcp_client.catalog import ToolCatalog
+
+
+def _tool(name: str) -> dict[str, Any]:
+    return {"type": "function", "function": {"name": name, "description": ""}}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_fetch_and_missing_tools_refetch() -> None:
+    catalog = ToolCatalog(MCPClientConfig(tool_catalog_min_refresh_seconds=0))
+    listings = [[_tool("search")], [_tool("search"), _tool("late_agent")]]
+    fetches = 0
+
+    async def fake_fetch() -> None:
+        nonlocal fetches
+        await asyncio.sleep(0.01)
+        catalog._tools = listings[fetches]  # type: ignore[assignment]
+        catalog._fetched_at = time.monotonic()
+        fetches += 1
+
+    with patch.object(catalog, "_fetch", new=fake_fetch):
+        first = await asyncio.gather(*(catalog.get(["search"]) for _ in range(5)))
+        assert fetches == 1
+        assert all(tools == first[0] for tools in first)
+
+        tools = await catalog.get(["late_agent"])
+
+    assert fetches == 2
+    assert [tool["function"]["name"] for tool in tools] == ["search", "late_agent"]
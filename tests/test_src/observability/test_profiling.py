@@ -0,0 +1,59 @@
+import asyncio
+import time
+from pathlib import Path
+
+import pytest
+
+from src.config.settings import ProfilingConfig
+from src.observability.profiling import RequestProfiler
+
+
+def _block_the_loop() -> None:
+    time.sleep(0.2)
+
+
+@pytest.mark.asyncio
+async def test_profile_records_loop_blocks_with_stack_and_saves_artifact(
+    tmp_path: Path,
+) -> None:
+    profiler = RequestProfiler(
+        ProfilingConfig(
+            profiling_dir=str(tmp_path),
+            profiling_sample_interval_seconds=0.005,
+            profiling_block_threshold_seconds=0.05,
+        )
+    )
+
+    async with profiler.profile("demo") as profile:
+        await asyncio.sleep(0.05)
+        _block_the_loop()
+        await asyncio.sleep(0.05)
+
+    artifact = profiler.get(profile.profile_id)
+    assert artifact is not None
+    assert artifact["label"] == "demo"
+    assert artifact["samples"] > artifact["idle_samples"] > 0
+    blocks = artifact["loop_blocks"]
+    assert len(blocks) == 1
+    assert blocks[0]["duration_seconds"] >= 0.1
+    assert any("_block_the_loop" in frame for frame in blocks[0]["stack"])
+    assert profiler.profile_ids() == [profile.profile_id]
+
+
+def test_profiling_is_opt_in() -> None:
+    profiler = RequestProfiler(ProfilingConfig(profiling_allow_header=True))
+
+    assert not profiler.wanted(None)
+    assert profiler.wanted("1")
+    assert profiler.wanted(" True ")
+    assert not profiler.wanted("0")
+    assert not profiler.wanted("false")
+    assert not profiler.wanted("")
+    profiler.enabled = True
+    assert profiler.wanted(None)
+
+
+def test_profile_header_is_ignored_unless_allowed() -> None:
+    profiler = RequestProfiler(ProfilingConfig())
+
+    assert not profiler.wanted("1")